@@ -1,107 +1,312 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Request
 from pydantic import BaseModel, Field
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import hashlib
 import json
 import os
-from schemas import CreditRequest, CreditResponse
-from rules import score_and_decision, RULE_VERSION
-from db import log_decision, fetch_base_decision, existing_override
-from auth import require_role, TOKENS
 import time
-from starlette.responses import PlainTextResponse
+from schemas import CreditRequest, CreditResponse, CreditBatchRequest, CreditBatchResponse
+from rules import score_and_decision, score_and_decision_batch, compile_rules, RULE_VERSION, THRESHOLDS
+from db import log_decision_async, log_decisions_async, fetch_base_decision_async, existing_override_async, merkle_proof, search_decisions, review_sla_snapshot
+from db import fetch_appended_async, log_tail_id_async, get_decision, list_decisions, log_version, start_rollup_worker
+from decision_reads import LIST_LIMIT, MAX_LIST_LIMIT, CursorError, select_fields
+from audit_stream import emit as emit_audit_event
+from canonical import request_json_and_id
+from metrics import REGISTRY, HTTP_REQUEST_SECONDS, DECISION_STAGE_SECONDS, REJECTIONS, OVERRIDE_CONFLICTS
+from replay_cache import DecisionReplayCache
+from search import SEARCH_LIMIT, MAX_SEARCH_LIMIT
+from change_feed import parse_last_event_id, stream_events
+from ratelimit import ROLE_QUOTAS, create_limiter
+from auth import require_role, TOKENS
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
 SERVICE_VERSION = "svc1.0.0"
 
-app = FastAPI(title="Credit Decision Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # KPI rollups follow the decision log while the service runs (see rollup_worker.py)
+    start_rollup_worker()
+    yield
+
+app = FastAPI(title="Credit Decision Service", lifespan=lifespan)
 
-# Simple content-length limit and token-bucket rate limiting
+# Idempotent replay of logged decisions (ERP retries)
+_replay_cache = DecisionReplayCache()
+
+# Simple content-length limit and GCRA rate limiting (see ratelimit.py)
 MAX_BODY_BYTES = int(os.getenv("MAX_BODY_BYTES", "65536"))  # 64KB default
-RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "5"))  # tokens per second
-RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))
-_buckets = {}
+MAX_BATCH_BODY_BYTES = int(os.getenv("MAX_BATCH_BODY_BYTES", str(8 * 1024 * 1024)))  # 8MB for wave release
+MAX_BATCH_ITEMS = int(os.getenv("MAX_BATCH_ITEMS", "5000"))
+BATCH_PATH = "/v1/credit/decisions:batch"
+STREAM_PATH = "/v1/credit/decisions/stream"
+THRESHOLDS_JSON = json.dumps(THRESHOLDS, separators=(",", ":"))  # logged as-is (insertion order)
+NEAR_THRESHOLD_BAND = 5  # score points around review/block boundaries (audit stream flag)
+METRICS_PATH = "/metrics"
+_UNLIMITED_PATHS = ("/health", METRICS_PATH)
+_STAGE = {
+    stage: DECISION_STAGE_SECONDS.labels(stage)
+    for stage in ("validation", "canonical", "replay_lookup", "score", "append_wait",
+                  "batch_canonical", "batch_score")
+}
+_limiter = create_limiter()
 
-def _key_for_request(request: Request):
+def _limit_key_and_role(request: Request) -> tuple[str, str]:
+    # Known tokens are limited per token and role; anything else per client IP,
+    # so random tokens neither bypass the limit nor grow the key table.
     token = request.headers.get("X-Auth-Token")
-    return token or request.client.host if request.client else "anon"
+    role = TOKENS.get(token) if token else None
+    if role:
+        return f"tok:{token}", role
+    host = request.client.host if request.client else "anon"
+    return f"ip:{host}", "anon"
 
 @app.middleware("http")
 async def security_limits(request: Request, call_next):
-    # Skip health
-    if request.url.path == "/health":
+    # Skip health and metrics scrapes
+    if request.url.path in _UNLIMITED_PATHS:
         return await call_next(request)
+    t0 = time.perf_counter()
+    request.state.t0 = t0  # start of the validation stage
     # Content-Length check
     cl = request.headers.get("content-length")
+    body_limit = MAX_BATCH_BODY_BYTES if request.url.path == BATCH_PATH else MAX_BODY_BYTES
     try:
-        if cl is not None and int(cl) > MAX_BODY_BYTES:
+        if cl is not None and int(cl) > body_limit:
+            REJECTIONS.labels(413).inc()
             return PlainTextResponse("Payload too large", status_code=413)
     except Exception:
         pass
     # Rate limiting
-    now = time.monotonic()
-    key = _key_for_request(request)
-    bucket = _buckets.get(key, {"tokens": RATE_LIMIT_BURST, "ts": now})
-    # refill
-    elapsed = max(0.0, now - bucket["ts"])
-    bucket["tokens"] = min(RATE_LIMIT_BURST, bucket["tokens"] + elapsed * RATE_LIMIT_RATE)
-    bucket["ts"] = now
-    if bucket["tokens"] < 1.0:
-        _buckets[key] = bucket
+    key, role = _limit_key_and_role(request)
+    rate, burst = ROLE_QUOTAS.get(role, ROLE_QUOTAS["anon"])
+    if not await _limiter.allow_async(key, rate, burst):
+        REJECTIONS.labels(429).inc()
         return PlainTextResponse("Too Many Requests", status_code=429)
-    bucket["tokens"] -= 1.0
-    _buckets[key] = bucket
-    return await call_next(request)
+    response = await call_next(request)
+    # Route template (not the raw path) keeps label cardinality bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    HTTP_REQUEST_SECONDS.labels(request.method, route, response.status_code).observe(time.perf_counter() - t0)
+    return response
+
+class _GZipExceptStream(GZipMiddleware):
+    # compressing the SSE feed would hold events back in the gzip buffer
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == STREAM_PATH:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(_GZipExceptStream, minimum_size=1024)
+
+@app.get(METRICS_PATH, response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/health")
 def health():
     auth_state = "configured" if TOKENS else "misconfigured"
     return {"status": "ok", "service_version": SERVICE_VERSION, "rules_version": RULE_VERSION, "auth": auth_state}
 
+def _utc_now_iso() -> str:
+    # ISO8601 with trailing Z
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _elapsed_ms(request: Request, fallback_t0: float) -> float:
+    t0 = getattr(request.state, "t0", None) or fallback_t0
+    return round((time.perf_counter() - t0) * 1000.0, 3)
+
+
+def _near_threshold(score: int, thresholds: dict) -> bool:
+    bounds = ((thresholds.get("review_range") or [None])[0], thresholds.get("block_min"))
+    return any(b is not None and abs(score - b) <= NEAR_THRESHOLD_BAND for b in bounds)
+
+
+def _emit_decision(req: CreditRequest, response: CreditResponse, duration_ms: float, replayed: bool, **extra):
+    # Event shape as consumed by tools/compute_metrics.py
+    emit_audit_event({
+        "event": "credit.decision",
+        "decision_id": response.decision_id,
+        "score": response.score,
+        "thresholds": response.thresholds,
+        "decision": response.decision,
+        "near_threshold": _near_threshold(response.score, response.thresholds),
+        "request": req.model_dump(),
+        "response": response.model_dump(),
+        "rule_version": response.rule_version,
+        "data_version": response.data_version,
+        "service_version": SERVICE_VERSION,
+        "actor_sys": "credit_decision_api",
+        "actor_ux": None,
+        "overridden": 0,
+        "override_reason": None,
+        "second_approval": None,
+        "replayed": replayed,
+        "duration_ms": duration_ms,
+        "timestamp_utc": response.timestamp_utc,
+        **extra,
+    })
+
+
+def _observe(stage: str, t: float) -> float:
+    now = time.perf_counter()
+    _STAGE[stage].observe(now - t)
+    return now
+
+
+def _canonical_request(req: CreditRequest) -> tuple[str, str]:
+    # Deterministic decision_id from canonical JSON (sorted keys); encoded once, hashed as bytes
+    return request_json_and_id(req.model_dump())
+
+
+def _base_log_row(req: CreditRequest, decision_id: str, canonical_json: str, score: int, decision: str,
+                  thresholds_json: str, ts_utc: str) -> dict:
+    return {
+        "decision_id": decision_id,
+        "ts_utc": ts_utc,
+        "order_id": req.order_id,
+        "customer_id": req.customer_id,
+        "input_json": canonical_json,
+        "score": score,
+        "thresholds_json": thresholds_json,
+        "decision": decision,
+        "rule_version": RULE_VERSION,
+        "data_version": req.data_version,
+        "actor_sys": "credit_decision_api",
+        "actor_ux": None,
+        "overridden": 0,
+        "override_reason": None,
+        "second_approval": 0,
+    }
+
+
+def _decision_response(decision_id: str, score: int, decision: str, rationale: str, data_version: str,
+                       ts_utc: str, thresholds: dict | None = None) -> CreditResponse:
+    return CreditResponse(
+        decision_id=decision_id,
+        score=score,
+        thresholds=dict(thresholds or THRESHOLDS),
+        decision=decision,
+        rule_version=RULE_VERSION,
+        data_version=data_version,
+        policy_rationale=rationale,
+        timestamp_utc=ts_utc,
+        service_version=SERVICE_VERSION
+    )
+
+
+def _response_from_row(row) -> CreditResponse | None:
+    """Rebuild the originally logged response from a stored base row.
+
+    Score, decision, thresholds and timestamp come from the row; the rationale
+    is not persisted and is looked up in the compiled rule table.
+    """
+    m = dict(row._mapping)
+    if m.get("rule_version") != RULE_VERSION:
+        return None
+    stored_req = CreditRequest.model_validate_json(m["input_json"])
+    rationale = compile_rules(RULE_VERSION).evaluate(stored_req)[2]
+    return _decision_response(
+        m["decision_id"], m["score"], m["decision"], rationale, m["data_version"], m["ts_utc"],
+        json.loads(m["thresholds_json"]),
+    )
+
+
 @app.post("/v1/credit/decision", response_model=CreditResponse)
-def decide(req: CreditRequest):
+async def decide(req: CreditRequest, request: Request):
+    t = t_start = time.perf_counter()
+    t0 = getattr(request.state, "t0", None)
+    if t0 is not None:
+        _STAGE["validation"].observe(t - t0)  # body read + pydantic validation
     try:
+        canonical_json, decision_id = _canonical_request(req)
+        t = _observe("canonical", t)
+
+        # Retries: answer from memory, else rebuild from the logged row
+        cached = _replay_cache.get(decision_id, RULE_VERSION)
+        if cached is not None:
+            _emit_decision(req, cached, _elapsed_ms(request, t_start), replayed=True)
+            return cached
+        base = await fetch_base_decision_async(decision_id)
+        t = _observe("replay_lookup", t)
+        if base is not None:
+            replay = _response_from_row(base)
+            if replay is not None:
+                _replay_cache.put(decision_id, RULE_VERSION, replay)
+                _emit_decision(req, replay, _elapsed_ms(request, t_start), replayed=True)
+                return replay
+
         # Deterministic scoring / decision
         score, decision, rationale = score_and_decision(req)
-        thresholds = {"allow_max": 59, "review_range": [60, 79], "block_min": 80}
-
-        # Deterministic decision_id from canonical JSON (sorted keys)
-        canonical_dict = req.model_dump()
-        canonical_json = json.dumps(canonical_dict, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-        decision_hash = hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
-        decision_id = f"dec-{decision_hash}"
-
-        # ISO8601 with trailing Z
-        ts_utc = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
-
-        # Append-only log insert (idempotent on same decision_id)
-        log_decision({
-            "decision_id": decision_id,
-            "ts_utc": ts_utc,
-            "order_id": req.order_id,
-            "customer_id": req.customer_id,
-            "input_json": canonical_json,
-            "score": score,
-            "thresholds_json": json.dumps(thresholds, separators=(",", ":")),
-            "decision": decision,
-            "rule_version": RULE_VERSION,
-            "data_version": req.data_version,
-            "actor_sys": "credit_decision_api",
-            "actor_ux": None,
-            "overridden": 0,
-            "override_reason": None
-        })
-
-        return CreditResponse(
-            decision_id=decision_id,
-            score=score,
-            thresholds=thresholds,
-            decision=decision,
-            rule_version=RULE_VERSION,
-            data_version=req.data_version,
-            policy_rationale=rationale,
-            timestamp_utc=ts_utc,
-            service_version=SERVICE_VERSION
-        )
+        t = _observe("score", t)
+        thresholds = dict(THRESHOLDS)
+        ts_utc = _utc_now_iso()
+
+        # Append-only log insert (idempotent on same decision_id; returns the persisted timestamp)
+        [(stored_ts, written)] = await log_decisions_async([_base_log_row(
+            req, decision_id, canonical_json, score, decision,
+            THRESHOLDS_JSON, ts_utc,
+        )], with_status=True)
+        _observe("append_wait", t)  # queue + exists check + hash + insert + commit
+
+        response = _decision_response(decision_id, score, decision, rationale, req.data_version, stored_ts, thresholds)
+        _replay_cache.put(decision_id, RULE_VERSION, response)
+        _emit_decision(req, response, _elapsed_ms(request, t_start), replayed=not written)
+        return response
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
+
+
+@app.post(BATCH_PATH, response_model=CreditBatchResponse)
+async def decide_batch(batch: CreditBatchRequest, request: Request):
+    """Score a wave of orders in one pass and log all rows in one transaction.
+
+    Responses are returned in request order. Cached retries are answered from
+    memory; duplicates of already logged decisions are not logged again and
+    carry the original timestamp (same as the single endpoint).
+    """
+    if len(batch.requests) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_ITEMS} requests")
+    try:
+        t = t_start = time.perf_counter()
+        decisions = [None] * len(batch.requests)
+        pending = []
+        for i, req in enumerate(batch.requests):
+            canonical_json, decision_id = _canonical_request(req)
+            cached = _replay_cache.get(decision_id, RULE_VERSION)
+            if cached is not None:
+                decisions[i] = cached
+            else:
+                pending.append((i, req, canonical_json, decision_id))
+        t = _observe("batch_canonical", t)
+
+        results = score_and_decision_batch([p[1] for p in pending])
+        t = _observe("batch_score", t)
+        ts_utc = _utc_now_iso()
+        rows = [
+            _base_log_row(req, decision_id, canonical_json, score, decision, THRESHOLDS_JSON, ts_utc)
+            for (_, req, canonical_json, decision_id), (score, decision, _) in zip(pending, results)
+        ]
+        stored = await log_decisions_async(rows, with_status=True)
+        _observe("append_wait", t)
+
+        for (i, req, _, decision_id), (score, decision, rationale), (ts, _) in zip(pending, results, stored):
+            response = _decision_response(decision_id, score, decision, rationale, req.data_version, ts)
+            _replay_cache.put(decision_id, RULE_VERSION, response)
+            decisions[i] = response
+
+        # One event per item; duration_ms is the batch latency amortized per decision
+        batch_ms = _elapsed_ms(request, t_start)
+        n = len(decisions)
+        # Replayed: already logged before, or a repeat of an earlier item in this batch
+        replayed = {i: not written for (i, _, _, _), (_, written) in zip(pending, stored)}
+        for i, (req, response) in enumerate(zip(batch.requests, decisions)):
+            _emit_decision(req, response, round(batch_ms / n, 3), replayed=replayed.get(i, True),
+                           batch_size=n, batch_duration_ms=batch_ms)
+        return CreditBatchResponse(decisions=decisions)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid input: {e}")
 
@@ -125,16 +330,18 @@ class OverrideResponse(BaseModel):
     service_version: str = SERVICE_VERSION
 
 @app.post("/v1/credit/override", response_model=OverrideResponse)
-def override_decision(payload: OverridePayload, auth=Depends(require_role("reviewer"))):
+async def override_decision(payload: OverridePayload, request: Request, auth=Depends(require_role("reviewer"))):
+    t_start = time.perf_counter()
     # Validate reason length
     if len(payload.override_reason.strip()) < 15:
         raise HTTPException(status_code=400, detail="override_reason must be at least 15 characters")
     # Fetch base (non-overridden) decision
-    base = fetch_base_decision(payload.decision_id)
+    base = await fetch_base_decision_async(payload.decision_id)
     if not base:
         raise HTTPException(status_code=404, detail="decision_id not found or already overridden base missing")
     # Idempotence guard (optional 409)
-    if existing_override(payload.decision_id, payload.new_decision, payload.override_reason.strip()):
+    if await existing_override_async(payload.decision_id, payload.new_decision, payload.override_reason.strip()):
+        OVERRIDE_CONFLICTS.inc()
         raise HTTPException(status_code=409, detail="Identical override already exists")
     # Extract fields from base row (row is a Row object)
     base_map = dict(base._mapping)
@@ -153,10 +360,10 @@ def override_decision(payload: OverridePayload, auth=Depends(require_role("revie
     # Enforce admin for second approval cases
     if second_approval == 1 and auth.get("role") != "admin":
         raise HTTPException(status_code=403, detail="Admin required for second approval")
-    ts_utc = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    ts_utc = _utc_now_iso()
 
     # Insert override log row (append-only)
-    log_decision({
+    await log_decision_async({
         "decision_id": payload.decision_id,
         "ts_utc": ts_utc,
         "order_id": base_map.get("order_id"),
@@ -174,7 +381,7 @@ def override_decision(payload: OverridePayload, auth=Depends(require_role("revie
         "second_approval": second_approval
     })
 
-    return OverrideResponse(
+    response = OverrideResponse(
         decision_id=payload.decision_id,
         original_decision=original_decision,
         new_decision=payload.new_decision,
@@ -186,6 +393,151 @@ def override_decision(payload: OverridePayload, auth=Depends(require_role("revie
         data_version=data_version,
         service_version=SERVICE_VERSION
     )
+    try:
+        thresholds = json.loads(base_map.get("thresholds_json") or "{}")
+    except Exception:
+        thresholds = {}
+    emit_audit_event({
+        "event": "override.apply",
+        "decision_id": payload.decision_id,
+        "score": score,
+        "thresholds": thresholds,
+        "decision": payload.new_decision,
+        "original_decision": original_decision,
+        "near_threshold": _near_threshold(score, thresholds),
+        "request": parsed,
+        "response": response.model_dump(),
+        "rule_version": rule_version,
+        "data_version": data_version,
+        "service_version": SERVICE_VERSION,
+        "actor_sys": "oversight_ui",
+        "actor_ux": auth.get("user"),
+        "overridden": 1,
+        "override_reason": payload.override_reason.strip(),
+        "second_approval": bool(second_approval),
+        "duration_ms": _elapsed_ms(request, t_start),
+        "timestamp_utc": ts_utc,
+    })
+    return response
+
+
+@app.get(STREAM_PATH)
+async def decision_stream(
+    request: Request,
+    decision: list[str] | None = Query(None),
+    after: int | None = Query(None, ge=0),
+    last_event_id: str | None = Header(None),
+    auth=Depends(require_role("reviewer")),
+):
+    """Server-sent events with newly appended decision_logs rows (resume via Last-Event-ID).
+
+    Starts after ``Last-Event-ID``, else after ``after``, else at the current end of the log.
+    """
+    cursor = parse_last_event_id(last_event_id)
+    if cursor is None:
+        cursor = after if after is not None else await log_tail_id_async()
+
+    async def fetch(after_id: int):
+        return await fetch_appended_async(after_id, decision)
+
+    return StreamingResponse(
+        stream_events(fetch, cursor, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _etag(*parts) -> str:
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    return bool(header) and (header.strip() == "*" or etag in [t.strip() for t in header.split(",")])
+
+
+def _cached_json(request: Request, etag: str, load) -> Response:
+    # the log is append-only: an unchanged newest row means an unchanged answer
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(load(), headers=headers)
+
+
+@app.get("/v1/credit/decisions")
+def list_decisions_route(
+    request: Request,
+    decision: list[str] | None = Query(None),
+    ts_from: str | None = Query(None, alias="from", description="ISO timestamp/date, inclusive"),
+    ts_to: str | None = Query(None, alias="to", description="ISO timestamp/date, exclusive"),
+    overridden: int | None = Query(None, ge=0, le=1),
+    order_prefix: str | None = Query(None, max_length=100),
+    customer_prefix: str | None = Query(None, max_length=100),
+    fields: str | None = Query(None, description="comma-separated column names"),
+    limit: int = Query(LIST_LIMIT, ge=1, le=MAX_LIST_LIMIT),
+    cursor: str | None = Query(None),
+    auth=Depends(require_role("reviewer")),
+):
+    """Log rows newest first with keyset pagination (``next_cursor``), filters and field selection."""
+    try:
+        selected = select_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    query = {
+        "decisions": decision, "ts_from": ts_from, "ts_to": ts_to, "overridden": overridden,
+        "order_prefix": order_prefix, "customer_prefix": customer_prefix,
+    }
+    etag = _etag(log_version(), query, selected, limit, cursor)
+
+    def load():
+        try:
+            return list_decisions(fields=selected, limit=limit, cursor=cursor, **query)
+        except CursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    return _cached_json(request, etag, load)
+
+
+@app.get("/v1/credit/decisions/{decision_id}/proof")
+def decision_proof(decision_id: str, overridden: int = Query(0, ge=0, le=1), auth=Depends(require_role("reviewer"))):
+    """Merkle inclusion proof (row -> segment root -> log root) for audit spot checks."""
+    proof = merkle_proof(decision_id, overridden)
+    if proof is None:
+        raise HTTPException(status_code=404, detail="decision_id not found")
+    if proof.get("pending"):
+        raise HTTPException(status_code=404, detail="decision not yet covered by a Merkle checkpoint")
+    return proof
+
+
+@app.get("/v1/credit/search")
+def search_decisions_route(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    auth=Depends(require_role("reviewer")),
+):
+    """Ranked decision_ids whose order_id, customer_id or override_reason contain ``q`` (substring/prefix)."""
+    return {"q": q, "decision_ids": search_decisions(q, limit)}
+
+
+@app.get("/v1/credit/review/sla")
+def review_sla_route(auth=Depends(require_role("reviewer"))):
+    """REVIEW queue time (mean/p95 in minutes), open cases and the oldest open case, for polling/alerting."""
+    return review_sla_snapshot()
+
+
+@app.get("/v1/credit/decisions/{decision_id}")
+def get_decision_route(decision_id: str, request: Request, auth=Depends(require_role("reviewer"))):
+    """Base decision with request, thresholds and all overrides of the case."""
+    etag = _etag(log_version(), decision_id)
+
+    def load():
+        case = get_decision(decision_id)
+        if case is None:
+            raise HTTPException(status_code=404, detail="decision_id not found")
+        return case
+
+    return _cached_json(request, etag, load)
 
 
 class LoginPayload(BaseModel):
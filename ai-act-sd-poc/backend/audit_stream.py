@@ -0,0 +1,187 @@
+"""JSONL audit event stream (credit.decision / override.apply) for tools/compute_metrics.py.
+
+Handlers call ``emit(event)``, which only enqueues the dict; a daemon thread
+encodes events, appends them to the current segment and flushes at least
+every ``AUDIT_LOG_FLUSH_MS``. Segments rotate on size (``AUDIT_LOG_MAX_BYTES``)
+or age (``AUDIT_LOG_ROTATE_S``); a rotated segment is closed, fsynced and
+made read-only, and is never written again. If the queue is full (disk
+stalled), events are dropped and counted in ``credit_audit_events_dropped_total``
+instead of blocking the request path; the hash-chained decision_logs table
+stays the system of record.
+
+The stream is off unless ``AUDIT_LOG_DIR`` is set. Segment names carry the
+opening time and the pid, so several worker processes can share one
+directory: ``audit-20251112T103000Z-4711-000001.jsonl``.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+
+from canonical import dumps_bytes
+from metrics import REGISTRY, Counter
+
+AUDIT_LOG_DIR = os.getenv("AUDIT_LOG_DIR", "")  # opt-in: set a directory to enable the stream
+AUDIT_LOG_MAX_BYTES = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(64 * 1024 * 1024)))
+AUDIT_LOG_ROTATE_S = float(os.getenv("AUDIT_LOG_ROTATE_S", "3600"))
+AUDIT_LOG_FLUSH_MS = float(os.getenv("AUDIT_LOG_FLUSH_MS", "500"))
+AUDIT_LOG_QUEUE_MAX = int(os.getenv("AUDIT_LOG_QUEUE_MAX", "100000"))
+
+EVENTS_DROPPED = REGISTRY.register(Counter(
+    "credit_audit_events_dropped_total", "Audit stream events dropped because the writer queue was full",
+))
+
+_STOP = object()
+
+
+class AuditStreamWriter:
+    def __init__(self, directory: str = AUDIT_LOG_DIR, max_bytes: int = AUDIT_LOG_MAX_BYTES,
+                 rotate_s: float = AUDIT_LOG_ROTATE_S, flush_s: float = AUDIT_LOG_FLUSH_MS / 1000.0,
+                 queue_max: int = AUDIT_LOG_QUEUE_MAX):
+        self.directory = directory
+        self.max_bytes = max(1, max_bytes)
+        self.rotate_s = max(1.0, rotate_s)
+        self.flush_s = max(0.01, flush_s)
+        self._queue = queue.Queue(maxsize=max(1, queue_max))
+        self._file = None
+        self._path = None
+        self._opened = 0.0
+        self._size = 0
+        self._seq = 0
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def emit(self, event: dict) -> None:
+        """Queue one event (never blocks); the dict must not be mutated afterwards."""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            EVENTS_DROPPED.inc()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain the queue and seal the current segment."""
+        if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._file = None  # a forked child must not share the parent's segment
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="audit-stream-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_s)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._seal()
+                return
+            try:
+                if item is not None:
+                    self._write(item)
+                    # drain what is already queued before flushing
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is _STOP:
+                            self._seal()
+                            return
+                        self._write(item)
+                now = time.monotonic()
+                if self._file is not None and (now - last_flush >= self.flush_s or self._queue.empty()):
+                    self._file.flush()
+                    last_flush = now
+                if self._file is not None and now - self._opened >= self.rotate_s:
+                    self._seal()
+            except OSError:
+                # disk trouble: give up the segment and retry with a new one on the next event
+                EVENTS_DROPPED.inc()
+                self._abandon()
+
+    def _write(self, event: dict) -> None:
+        line = dumps_bytes(event) + b"\n"
+        if self._file is not None and self._size + len(line) > self.max_bytes and self._size > 0:
+            self._seal()
+        if self._file is None:
+            self._open()
+        self._file.write(line)
+        self._size += len(line)
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        while True:
+            self._seq += 1
+            path = os.path.join(self.directory, f"audit-{stamp}-{self._pid}-{self._seq:06d}.jsonl")
+            try:
+                # "x": never append to (or truncate) an existing segment
+                self._file = open(path, "xb", buffering=1 << 16)
+                break
+            except FileExistsError:
+                continue
+        self._path = path
+        self._opened = time.monotonic()
+        self._size = 0
+
+    def _seal(self) -> None:
+        if self._file is None:
+            return
+        f, path = self._file, self._path
+        self._file = None
+        try:
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        try:
+            os.chmod(path, 0o444)
+        except OSError:
+            pass
+
+    def _abandon(self) -> None:
+        """Close and seal the current segment after a write error, ignoring further errors."""
+        if self._file is None:
+            return
+        f, path = self._file, self._path
+        self._file = None
+        try:
+            f.close()
+        except OSError:
+            pass
+        try:
+            os.chmod(path, 0o444)
+        except OSError:
+            pass
+
+
+_writer = AuditStreamWriter()
+atexit.register(_writer.close)
+
+
+def emit(event: dict) -> None:
+    _writer.emit(event)
@@ -0,0 +1,79 @@
+"""Canonical JSON for decision ids and the audit hash chain.
+
+One encoder shared by the API (``canonical``), the hash chain in ``db`` and the
+tools (``backend.canonical``). Output is byte-identical to
+``json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)``,
+which every existing decision_id and row_hash was computed with.
+
+orjson (optional) is used as a fast path only for values it renders
+identically: it writes floats outside [1e-4, 1e16) without Python's exponent
+form ("1e16" vs "1e+16"), turns NaN/inf into null and rejects ints beyond 64
+bit, so such values (and anything but plain str/int/float/bool/None/list/dict
+with str keys) go through the stdlib encoder. tests/test_canonical.py pins
+the output with golden strings.
+"""
+import hashlib
+import json
+
+try:  # optional fast path
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+HASH_EXCLUDED = ("prev_hash", "row_hash")
+
+
+def _orjson_safe(obj) -> bool:
+    t = type(obj)
+    if t is str or t is bool or obj is None:
+        return True
+    if t is int:
+        return -(1 << 63) <= obj < (1 << 64)
+    if t is float:
+        a = abs(obj)
+        # NaN fails both comparisons, inf the upper bound
+        return a == 0.0 or 1e-4 <= a < 1e16
+    if t is dict:
+        return all(type(k) is str and _orjson_safe(v) for k, v in obj.items())
+    if t is list or t is tuple:
+        return all(_orjson_safe(v) for v in obj)
+    return False
+
+
+def _stdlib_dumps(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_bytes(obj) -> bytes:
+    """Canonical JSON as UTF-8 bytes."""
+    if orjson is not None and _orjson_safe(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:  # e.g. lone surrogates; let the stdlib path decide
+            pass
+    return _stdlib_dumps(obj).encode("utf-8")
+
+
+def dumps(obj) -> str:
+    """Canonical JSON as str."""
+    if orjson is not None and _orjson_safe(obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except orjson.JSONEncodeError:
+            pass
+    return _stdlib_dumps(obj)
+
+
+def request_json_and_id(fields: dict) -> tuple[str, str]:
+    """Canonical request JSON and its deterministic ``dec-<sha256>`` id from one encoding pass."""
+    encoded = dumps_bytes(fields)
+    return encoded.decode("utf-8"), f"dec-{hashlib.sha256(encoded).hexdigest()}"
+
+
+def row_hash(prev_hash: str, payload: dict, ts_utc: str) -> str:
+    """sha256(prev_hash || canonical(payload without prev_hash/row_hash) || ts_utc)."""
+    data = {k: v for k, v in payload.items() if k not in HASH_EXCLUDED}
+    h = hashlib.sha256((prev_hash or "").encode("utf-8"))
+    h.update(dumps_bytes(data))
+    h.update((ts_utc or "").encode("utf-8"))
+    return h.hexdigest()
@@ -0,0 +1,90 @@
+"""Change feed over decision_logs for server-sent events (``/v1/credit/decisions/stream``).
+
+The stream walks an ``id`` watermark: every event carries the rows appended
+after the previous one (JSON array, list columns plus ``row_hash``) and the
+watermark as SSE ``id``, so clients resume with ``Last-Event-ID``. Between
+reads the stream sleeps on ``APPEND_SIGNAL``, which the chain appender fires
+after each committed group; rows written by another process are picked up
+by the ``FEED_POLL_S`` fallback read.
+"""
+import asyncio
+import json
+import os
+import threading
+
+FEED_COLUMNS = (
+    "id", "decision_id", "ts_utc", "order_id", "customer_id", "score", "decision", "overridden",
+    "second_approval", "rule_version", "data_version", "row_hash",
+)
+FEED_BATCH = int(os.getenv("FEED_BATCH", "500"))  # rows per event
+FEED_POLL_S = float(os.getenv("FEED_POLL_S", "1"))  # fallback re-read without a signal
+FEED_KEEPALIVE_S = float(os.getenv("FEED_KEEPALIVE_S", "15"))  # comment line on idle streams
+FEED_RETRY_MS = 2000  # client reconnect delay (SSE ``retry``)
+
+
+class AppendSignal:
+    """Wakes waiting streams (any event loop) from the appender thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = {}  # event -> loop
+
+    def listen(self) -> asyncio.Event:
+        # register before reading, so a commit in between is not missed
+        event = asyncio.Event()
+        with self._lock:
+            self._waiters[event] = asyncio.get_running_loop()
+        return event
+
+    def unlisten(self, event: asyncio.Event) -> None:
+        with self._lock:
+            self._waiters.pop(event, None)
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters.items())
+        for event, loop in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+
+APPEND_SIGNAL = AppendSignal()
+
+
+def parse_last_event_id(value) -> int | None:
+    try:
+        return max(0, int(str(value).strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def format_event(cursor: int, rows: list) -> str:
+    data = json.dumps(rows, separators=(",", ":"), ensure_ascii=False)
+    return f"id: {cursor}\nevent: decisions\ndata: {data}\n\n"
+
+
+async def stream_events(fetch, cursor: int, is_disconnected):
+    """SSE text chunks from ``cursor`` on; ``fetch(cursor)`` returns (rows, new_cursor)."""
+    yield f"retry: {FEED_RETRY_MS}\n\n"
+    idle = 0.0
+    while not await is_disconnected():
+        waiter = APPEND_SIGNAL.listen()
+        try:
+            rows, next_cursor = await fetch(cursor)
+            if next_cursor > cursor:
+                cursor = next_cursor
+                if rows:
+                    idle = 0.0
+                    yield format_event(cursor, rows)
+                continue
+            try:
+                await asyncio.wait_for(waiter.wait(), FEED_POLL_S)
+            except asyncio.TimeoutError:
+                idle += FEED_POLL_S
+        finally:
+            APPEND_SIGNAL.unlisten(waiter)
+        if idle >= FEED_KEEPALIVE_S:
+            idle = 0.0
+            yield ": keep-alive\n\n"
@@ -1,12 +1,30 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import IntegrityError
-import hashlib
-import json as _json
+from concurrent.futures import Future
+from contextlib import contextmanager
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+import asyncio
 import os
+import queue
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from canonical import row_hash as _row_hash
+from metrics import DB_ERRORS, DECISION_STAGE_SECONDS
+from merkle import CHECKPOINT_DDL, MERKLE_SEGMENT_SIZE, MerkleLog, leaf_hash, load_proof, merkle_root
+from search import SEARCH_LIMIT, ensure_search_index, search
+from resolutions import APPLY_OVERRIDE_SQL, OPEN_REVIEW_SQL, ensure_resolutions, review_sla
+from change_feed import APPEND_SIGNAL, FEED_BATCH, FEED_COLUMNS
+from rollup_worker import RollupWorker
+import decision_reads
 
 DB_URL = os.getenv("DB_URL", "sqlite:///./governance.db")
 engine = create_engine(DB_URL, future=True)
 
+# Group commit bounds for the chain appender
+APPEND_MAX_BATCH = int(os.getenv("APPEND_MAX_BATCH", "512"))  # rows per transaction
+APPEND_MAX_WAIT_MS = float(os.getenv("APPEND_MAX_WAIT_MS", "2"))  # linger for more rows
+
 DDL = """
 CREATE TABLE IF NOT EXISTS decision_logs (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -29,8 +47,16 @@ CREATE TABLE IF NOT EXISTS decision_logs (
 );
 """
 
-def ensure_schema():
-  with engine.begin() as cx:
+QUERY_INDEXES = (
+  "CREATE INDEX IF NOT EXISTS ix_decision_logs_ts_utc ON decision_logs(ts_utc)",
+  "CREATE INDEX IF NOT EXISTS ix_decision_logs_decision_ts ON decision_logs(decision, ts_utc)",
+  "CREATE INDEX IF NOT EXISTS ix_decision_logs_order_id ON decision_logs(order_id)",
+  "CREATE INDEX IF NOT EXISTS ix_decision_logs_customer_id ON decision_logs(customer_id)",
+  "CREATE INDEX IF NOT EXISTS ix_decision_logs_decision_id ON decision_logs(decision_id)",
+)
+
+def ensure_schema(eng=engine):
+  with eng.begin() as cx:
     cx.exec_driver_sql(DDL)
     # Ensure unique index for base rows ONLY (overridden=0) to allow overrides
     try:
@@ -52,6 +78,13 @@ def ensure_schema():
       cx.exec_driver_sql("ALTER TABLE decision_logs ADD COLUMN prev_hash TEXT")
     if 'row_hash' not in cols:
       cx.exec_driver_sql("ALTER TABLE decision_logs ADD COLUMN row_hash TEXT")
+    # Read paths of the oversight UI and the read API (filters, newest-first paging, case lookups)
+    for ddl in QUERY_INDEXES:
+      cx.exec_driver_sql(ddl)
+    # Trigram search over order/customer ids and override reasons (append-only, see search.py)
+    ensure_search_index(cx.connection.dbapi_connection)
+    # Per-case REVIEW resolution state for queue-time SLAs (see resolutions.py)
+    ensure_resolutions(cx.connection.dbapi_connection)
     # Immutable log via triggers (block UPDATE/DELETE)
     try:
       cx.exec_driver_sql("""
@@ -69,83 +102,336 @@ def ensure_schema():
       """)
     except Exception:
       pass
+    # Merkle checkpoints (one root per MERKLE_SEGMENT_SIZE rows), equally immutable
+    cx.exec_driver_sql(CHECKPOINT_DDL)
+    cx.exec_driver_sql("""
+      CREATE TRIGGER IF NOT EXISTS deny_update_checkpoints BEFORE UPDATE ON merkle_checkpoints BEGIN
+        SELECT RAISE(ABORT, 'immutable checkpoints');
+      END;
+    """)
+    cx.exec_driver_sql("""
+      CREATE TRIGGER IF NOT EXISTS deny_delete_checkpoints BEFORE DELETE ON merkle_checkpoints BEGIN
+        SELECT RAISE(ABORT, 'immutable checkpoints');
+      END;
+    """)
 
 ensure_schema()
-def _last_row_hash():
-  with engine.begin() as cx:
-    row = cx.execute(text("SELECT row_hash FROM decision_logs ORDER BY id DESC LIMIT 1")).fetchone()
-    return row[0] if row and row[0] else ""
-
 def _compute_hash(prev_hash: str, payload: dict, ts_utc: str) -> str:
-  # Create canonical JSON of payload (excluding prev_hash/row_hash) with sorted keys
-  data = {k: v for k, v in payload.items() if k not in ("prev_hash", "row_hash")}
-  payload_json = _json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
-  h = hashlib.sha256()
-  h.update((prev_hash or "").encode("utf-8"))
-  h.update(payload_json.encode("utf-8"))
-  h.update((ts_utc or "").encode("utf-8"))
-  return h.hexdigest()
+  # Canonical JSON of payload (excluding prev_hash/row_hash), see canonical.py
+  return _row_hash(prev_hash, payload, ts_utc)
 
 
-def log_decision(payload):
-  """Insert base decision row (overridden=0) append-only; skip if base already exists."""
-  decision_id = payload.get("decision_id")
-  ts_utc = payload.get("ts_utc")
-  overridden = payload.get("overridden", 0)
-  if overridden == 0:
-    # Skip if a non-overridden row already exists
-    with engine.begin() as cx:
-      exists = cx.execute(text("SELECT 1 FROM decision_logs WHERE decision_id=:d AND overridden=0 LIMIT 1"),
-                {"d": decision_id}).fetchone()
-      if exists:
+_STAGE_EXISTS = DECISION_STAGE_SECONDS.labels("exists_check")
+_STAGE_HASH = DECISION_STAGE_SECONDS.labels("hash")
+_STAGE_INSERT = DECISION_STAGE_SECONDS.labels("insert")
+
+
+@contextmanager
+def _count_db_errors(op: str):
+  try:
+    yield
+  except SQLAlchemyError:
+    DB_ERRORS.labels(op).inc()
+    raise
+
+
+_INSERT_SQL = text(
+  """
+  INSERT INTO decision_logs
+  (decision_id, ts_utc, order_id, customer_id, input_json, score, thresholds_json,
+   decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval,
+   prev_hash, row_hash)
+  VALUES
+  (:decision_id, :ts_utc, :order_id, :customer_id, :input_json, :score, :thresholds_json,
+   :decision, :rule_version, :data_version, :actor_sys, :actor_ux, :overridden, :override_reason, :second_approval,
+   :prev_hash, :row_hash)
+  """
+)
+
+_OPEN_REVIEW_SQL = text(OPEN_REVIEW_SQL)
+_APPLY_OVERRIDE_SQL = text(APPLY_OVERRIDE_SQL)
+
+
+def _record_resolutions(cx, rows) -> None:
+  """Keep review_resolutions in step with the rows of this group (same transaction)."""
+  opened = [r for r in rows if r.get("overridden", 0) == 0 and r.get("decision") == "REVIEW"]
+  if opened:
+    cx.execute(_OPEN_REVIEW_SQL, opened)
+  for row in rows:
+    if row.get("overridden", 0) == 1:
+      cx.execute(_APPLY_OVERRIDE_SQL, {**row, "actor_ux": row.get("actor_ux")})
+
+
+_TAIL_HASH_SQL = text("SELECT row_hash FROM decision_logs ORDER BY id DESC LIMIT 1")
+
+
+def _begin_append(cx) -> None:
+  # Take the write lock before the tail is read: writers in other processes
+  # (uvicorn --workers N) wait here instead of appending from the same head
+  if cx.dialect.name == "sqlite":
+    cx.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class ChainAppender:
+  """Per-process writer for decision_logs that caches the hash-chain head.
+
+  Callers submit payload lists; a background thread drains the queue and
+  commits groups of up to ``max_batch`` rows (waiting at most ``max_wait_s``
+  for more work) in one transaction, adding a Merkle checkpoint whenever a
+  full segment of MERKLE_SEGMENT_SIZE rows is complete. Each submitter's future resolves only
+  after its group has committed, so acknowledged decisions are durable and
+  concurrent requests can no longer read the same prev_hash and fork the
+  chain. Every group holds the database write lock (BEGIN IMMEDIATE) and
+  re-reads the stored tail row_hash; the cached head and checkpoint state
+  are only used while they still match it, otherwise (another worker
+  process appended, or a group failed) both are reloaded from the tables.
+  ``on_commit`` (also settable later) is called on the appender thread after
+  each committed group.
+  """
+
+  def __init__(self, engine, max_batch: int = APPEND_MAX_BATCH, max_wait_s: float = APPEND_MAX_WAIT_MS / 1000.0,
+               on_commit=None):
+    self._engine = engine
+    self.on_commit = on_commit
+    self._max_batch = max(1, max_batch)
+    self._max_wait_s = max(0.0, max_wait_s)
+    self._queue = queue.Queue()
+    self._head = None
+    self._checkpoints = None
+    self._thread = None
+    self._pid = None
+    self._start_lock = threading.Lock()
+
+  def submit(self, payloads, with_status: bool = False) -> Future:
+    """Queue rows; the future yields the persisted ts_utc per payload.
+
+    With ``with_status`` it yields (ts_utc, written) pairs instead, where
+    ``written`` is False for skipped duplicates of an already logged base row.
+    """
+    fut = Future()
+    self._ensure_started()
+    self._queue.put((list(payloads), fut, with_status))
+    return fut
+
+  def append(self, payloads, timeout=None) -> list:
+    """Append rows and block until committed.
+
+    Returns the persisted ts_utc per payload; for base rows that were already
+    logged this is the timestamp of the original row.
+    """
+    return self.submit(payloads).result(timeout)
+
+  def _ensure_started(self):
+    if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+      return
+    with self._start_lock:
+      if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
         return
-  # Compute hash chain values
-  prev_hash = _last_row_hash()
-  row_hash = _compute_hash(prev_hash, payload, ts_utc)
-  payload = dict(payload)
-  payload["prev_hash"] = prev_hash
-  payload["row_hash"] = row_hash
-  if overridden == 0:
-    with engine.begin() as cx:
-      try:
-        cx.execute(text(
-          """
-          INSERT INTO decision_logs
-          (decision_id, ts_utc, order_id, customer_id, input_json, score, thresholds_json,
-           decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval,
-           prev_hash, row_hash)
-          VALUES
-          (:decision_id, :ts_utc, :order_id, :customer_id, :input_json, :score, :thresholds_json,
-           :decision, :rule_version, :data_version, :actor_sys, :actor_ux, :overridden, :override_reason, :second_approval,
-           :prev_hash, :row_hash)
-          """
-        ), payload)
-      except IntegrityError:
+      self._head = None
+      self._checkpoints = None
+      self._pid = os.getpid()
+      self._thread = threading.Thread(target=self._run, name="decision-log-appender", daemon=True)
+      self._thread.start()
+
+  def _run(self):
+    while True:
+      group = [self._queue.get()]
+      rows = len(group[0][0])
+      deadline = time.monotonic() + self._max_wait_s
+      while rows < self._max_batch:
+        remaining = deadline - time.monotonic()
+        try:
+          item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+        except queue.Empty:
+          break
+        group.append(item)
+        rows += len(item[0])
+      self._commit_group(group)
+
+  def _commit_group(self, group):
+    try:
+      with _count_db_errors("append"):
+        results = self._write([payloads for payloads, _, _ in group])
+    except Exception as exc:
+      self._head = None
+      self._checkpoints = None
+      if len(group) == 1:
+        group[0][1].set_exception(exc)
         return
-  else:
-    with engine.begin() as cx:
-      cx.execute(text(
-        """
-        INSERT INTO decision_logs
-        (decision_id, ts_utc, order_id, customer_id, input_json, score, thresholds_json,
-         decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval,
-         prev_hash, row_hash)
-        VALUES
-        (:decision_id, :ts_utc, :order_id, :customer_id, :input_json, :score, :thresholds_json,
-         :decision, :rule_version, :data_version, :actor_sys, :actor_ux, :overridden, :override_reason, :second_approval,
-         :prev_hash, :row_hash)
-        """
-      ), payload)
-    return
+      # Isolate the failing submission so it does not fail its neighbours
+      for item in group:
+        self._commit_group([item])
+      return
+    for (_, fut, with_status), stored in zip(group, results):
+      fut.set_result(stored if with_status else [ts for ts, _ in stored])
+    APPEND_SIGNAL.notify()  # wake /v1/credit/decisions/stream
+    if self.on_commit is not None:
+      self.on_commit()
 
-def existing_override(decision_id: str, new_decision: str, override_reason: str):
-  with engine.begin() as cx:
-    row = cx.execute(text(
+  def _write(self, submissions):
+    with self._engine.begin() as cx:
+      _begin_append(cx)
+      row = cx.execute(_TAIL_HASH_SQL).fetchone()
+      head = row[0] if row and row[0] else ""
+      if self._checkpoints is not None and self._head == head:
+        checkpoints = self._checkpoints
+      else:
+        checkpoints = _load_checkpoint_state(cx)
+      base_ids = {p.get("decision_id") for payloads in submissions for p in payloads if p.get("overridden", 0) == 0}
+      t0 = time.perf_counter()
+      logged_ts = _existing_base_ts(cx, base_ids)
+      t1 = time.perf_counter()
+      _STAGE_EXISTS.observe(t1 - t0)
+      rows = []
+      results = []
+      for payloads in submissions:
+        stored = []
+        for payload in payloads:
+          if payload.get("overridden", 0) == 0:
+            # Skip if a non-overridden row already exists (or repeats within this group)
+            decision_id = payload.get("decision_id")
+            if decision_id in logged_ts:
+              stored.append((logged_ts[decision_id], False))
+              continue
+            logged_ts[decision_id] = payload.get("ts_utc")
+          row = dict(payload)
+          row.setdefault("second_approval", 0)
+          row_hash = _compute_hash(head, row, row.get("ts_utc"))
+          row["prev_hash"] = head
+          row["row_hash"] = row_hash
+          rows.append(row)
+          head = row_hash
+          stored.append((row.get("ts_utc"), True))
+        results.append(stored)
+      t2 = time.perf_counter()
+      _STAGE_HASH.observe(t2 - t1)
+      if rows:
+        cx.execute(_INSERT_SQL, rows)
+        _record_resolutions(cx, rows)
+        _STAGE_INSERT.observe(time.perf_counter() - t2)
+        checkpoints["pending"] += len(rows)
+        if checkpoints["pending"] >= MERKLE_SEGMENT_SIZE:
+          _write_checkpoints(cx, checkpoints)
+    self._head = head
+    self._checkpoints = checkpoints
+    return results
+
+
+def _load_checkpoint_state(cx) -> dict:
+  cps = cx.execute(text("SELECT last_id, root FROM merkle_checkpoints ORDER BY seq")).fetchall()
+  last_id = cps[-1][0] if cps else 0
+  pending = cx.execute(text("SELECT COUNT(*) FROM decision_logs WHERE id > :l"), {"l": last_id}).scalar()
+  return {"last_id": last_id, "log": MerkleLog(leaf_hash(r[1]) for r in cps), "pending": pending}
+
+
+def _write_checkpoints(cx, state: dict) -> None:
+  """Close every complete segment after state["last_id"] (also catches up legacy logs)."""
+  while state["pending"] >= MERKLE_SEGMENT_SIZE:
+    seg = cx.execute(text(
+      "SELECT id, row_hash FROM decision_logs WHERE id > :l ORDER BY id LIMIT :n"
+    ), {"l": state["last_id"], "n": MERKLE_SEGMENT_SIZE}).fetchall()
+    if len(seg) < MERKLE_SEGMENT_SIZE:
+      break
+    root = merkle_root([leaf_hash(h) for _, h in seg]).hex()
+    state["log"].append(leaf_hash(root))
+    cx.execute(text(
       """
-      SELECT 1 FROM decision_logs
-      WHERE decision_id=:d AND overridden=1 AND decision=:dec AND override_reason=:r LIMIT 1
+      INSERT INTO merkle_checkpoints (seq, first_id, last_id, size, root, log_root, created_utc)
+      VALUES (:seq, :first_id, :last_id, :size, :root, :log_root, :created_utc)
       """
-    ), {"d": decision_id, "dec": new_decision, "r": override_reason}).fetchone()
+    ), {
+      "seq": len(state["log"]),
+      "first_id": seg[0][0],
+      "last_id": seg[-1][0],
+      "size": len(seg),
+      "root": root,
+      "log_root": state["log"].root().hex(),
+      "created_utc": datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+    })
+    state["last_id"] = seg[-1][0]
+    state["pending"] -= len(seg)
+
+
+def _existing_base_ts(cx, decision_ids) -> dict:
+  """Map already logged base decision_ids to their stored ts_utc."""
+  found = {}
+  ids = [d for d in decision_ids if d is not None]
+  for i in range(0, len(ids), 500):
+    chunk = ids[i:i + 500]
+    params = {f"d{j}": d for j, d in enumerate(chunk)}
+    placeholders = ",".join(f":d{j}" for j in range(len(chunk)))
+    res = cx.execute(text(
+      f"SELECT decision_id, ts_utc FROM decision_logs WHERE overridden=0 AND decision_id IN ({placeholders})"
+    ), params)
+    found.update((r[0], r[1]) for r in res)
+  return found
+
+
+def _sqlite_path(eng):
+  database = eng.url.database
+  return database if eng.dialect.name == "sqlite" and database not in (None, "", ":memory:") else None
+
+
+_appender = ChainAppender(engine)
+_rollup_worker = None
+
+
+def start_rollup_worker():
+  """Keep the KPI rollups current from this process (app startup, not import).
+
+  Importing db never starts the worker, so tools and tests stay read-only.
+  """
+  global _rollup_worker
+  if _rollup_worker is None:
+    _rollup_worker = RollupWorker(_sqlite_path(engine))
+    _appender.on_commit = _rollup_worker.notify
+  _rollup_worker.notify()  # catch up on rows logged while the service was down
+
+
+def log_decision(payload):
+  """Append one row via the chain appender; base rows (overridden=0) are skipped if already logged.
+
+  Returns the ts_utc of the persisted row (the original one for skipped duplicates).
+  """
+  return _appender.append([payload])[0]
+
+
+def log_decisions(payloads):
+  """Append many rows as one unit of the chain appender (committed in a single transaction).
+
+  Base rows whose decision_id is already logged, or repeated within the
+  batch, are skipped. Returns the persisted ts_utc per payload, in order.
+  """
+  if not payloads:
+    return []
+  return _appender.append(payloads)
+
+
+_EXISTING_OVERRIDE_SQL = text(
+  """
+  SELECT 1 FROM decision_logs
+  WHERE decision_id=:d AND overridden=1 AND decision=:dec AND override_reason=:r LIMIT 1
+  """
+)
+
+_FETCH_BASE_SQL = text(
+  """
+  SELECT id, decision_id, ts_utc, order_id, customer_id,
+         input_json, score, thresholds_json,
+         decision, rule_version, data_version,
+         actor_sys, actor_ux, overridden, override_reason,
+         second_approval, prev_hash, row_hash
+    FROM decision_logs
+   WHERE decision_id = :did AND overridden = 0
+   ORDER BY id ASC
+   LIMIT 1
+  """
+)
+
+
+def existing_override(decision_id: str, new_decision: str, override_reason: str):
+  with engine.begin() as cx:
+    row = cx.execute(_EXISTING_OVERRIDE_SQL, {"d": decision_id, "dec": new_decision, "r": override_reason}).fetchone()
     return row is not None
 
 def fetch_base_decision(decision_id: str):
@@ -153,17 +439,177 @@ def fetch_base_decision(decision_id: str):
   Returns a SQLAlchemy Row or None.
   """
   with engine.begin() as cx:
-    row = cx.execute(text(
-      """
-      SELECT id, decision_id, ts_utc, order_id, customer_id,
-             input_json, score, thresholds_json,
-             decision, rule_version, data_version,
-             actor_sys, actor_ux, overridden, override_reason,
-             second_approval, prev_hash, row_hash
-        FROM decision_logs
-       WHERE decision_id = :did AND overridden = 0
-       ORDER BY id ASC
-       LIMIT 1
-      """
-    ), {"did": decision_id}).fetchone()
+    row = cx.execute(_FETCH_BASE_SQL, {"did": decision_id}).fetchone()
     return row
+
+
+def merkle_proof(decision_id: str, overridden: int = 0):
+  """Inclusion proof for a decision row (see merkle.load_proof)."""
+  with engine.connect() as cx:
+    return load_proof(cx.connection.dbapi_connection, decision_id, overridden)
+
+
+def search_decisions(term: str, limit: int = SEARCH_LIMIT) -> list:
+  """Ranked decision_ids whose order_id, customer_id or override_reason contain ``term``."""
+  with engine.connect() as cx:
+    return search(cx.connection.dbapi_connection, term, limit)
+
+
+def review_sla_snapshot() -> dict:
+  """Queue-time SLA figures from review_resolutions (see resolutions.review_sla)."""
+  with engine.connect() as cx:
+    return review_sla(cx.connection.dbapi_connection)
+
+
+def log_version() -> list:
+  """[id, row_hash] of the newest row; changes with every append (ETag basis)."""
+  with engine.connect() as cx:
+    return decision_reads.log_version(cx.connection.dbapi_connection)
+
+
+def list_decisions(**kwargs) -> dict:
+  """Keyset page of log rows (see decision_reads.list_decisions)."""
+  with engine.connect() as cx:
+    return decision_reads.list_decisions(cx.connection.dbapi_connection, **kwargs)
+
+
+def get_decision(decision_id: str):
+  """Base row, parsed request/thresholds and overrides of a case, or None."""
+  with engine.connect() as cx:
+    return decision_reads.get_decision(cx.connection.dbapi_connection, decision_id)
+
+
+_TAIL_ID_SQL = text("SELECT COALESCE(MAX(id), 0) FROM decision_logs")
+
+
+def _feed_sql(decisions):
+  cols = ", ".join(FEED_COLUMNS)
+  if decisions:
+    return text(
+      f"SELECT {cols} FROM decision_logs WHERE id > :after AND id <= :upto AND decision IN :decisions ORDER BY id LIMIT :n"
+    ).bindparams(bindparam("decisions", expanding=True))
+  return text(f"SELECT {cols} FROM decision_logs WHERE id > :after AND id <= :upto ORDER BY id LIMIT :n")
+
+
+def _feed_params(after_id: int, upto: int, decisions, limit: int) -> dict:
+  params = {"after": after_id, "upto": upto, "n": limit}
+  if decisions:
+    params["decisions"] = list(decisions)
+  return params
+
+
+def _feed_page(rows, upto: int, limit: int) -> tuple:
+  # a full page resumes after its last row, otherwise everything up to ``upto`` was scanned
+  rows = [dict(r) for r in rows]
+  return rows, (rows[-1]["id"] if len(rows) == limit else upto)
+
+
+def log_tail_id() -> int:
+  with engine.connect() as cx:
+    return cx.execute(_TAIL_ID_SQL).scalar()
+
+
+def fetch_appended(after_id: int, decisions=None, limit: int = FEED_BATCH) -> tuple:
+  """Rows appended after ``after_id`` (optionally only ``decisions``) and the new watermark."""
+  with engine.connect() as cx:
+    upto = cx.execute(_TAIL_ID_SQL).scalar()
+    if upto <= after_id:
+      return [], after_id
+    rows = cx.execute(_feed_sql(decisions), _feed_params(after_id, upto, decisions, limit)).mappings().all()
+    return _feed_page(rows, upto, limit)
+
+
+# --- Async variants -----------------------------------------------------------
+# Reads use an async engine (aiosqlite for SQLite); writes are awaited on the
+# chain appender's futures, so no request thread blocks while a group commits.
+# Without the async driver, reads fall back to the sync engine in a worker thread.
+
+def _async_url(url: str) -> str:
+  if url.startswith("sqlite:///"):
+    return "sqlite+aiosqlite:///" + url[len("sqlite:///"):]
+  return url
+
+ASYNC_DB_URL = os.getenv("ASYNC_DB_URL") or _async_url(DB_URL)
+# Async pools are bound to the event loop that created them: one engine per loop
+_async_engines = weakref.WeakKeyDictionary()
+_async_engine_failed = False
+
+
+def _get_async_engine():
+  global _async_engine_failed
+  if _async_engine_failed:
+    return None
+  loop = asyncio.get_running_loop()
+  aengine = _async_engines.get(loop)
+  if aengine is None:
+    try:
+      import greenlet  # noqa: F401  (required by sqlalchemy.ext.asyncio)
+      if ASYNC_DB_URL.startswith("sqlite+aiosqlite"):
+        import aiosqlite  # noqa: F401
+      from sqlalchemy.ext.asyncio import create_async_engine
+      aengine = create_async_engine(ASYNC_DB_URL)
+    except Exception:
+      # async driver not installed -> threadpool fallback
+      _async_engine_failed = True
+      return None
+    _async_engines[loop] = aengine
+  return aengine
+
+
+async def existing_override_async(decision_id: str, new_decision: str, override_reason: str):
+  aengine = _get_async_engine()
+  with _count_db_errors("read"):
+    if aengine is None:
+      return await asyncio.to_thread(existing_override, decision_id, new_decision, override_reason)
+    async with aengine.connect() as cx:
+      res = await cx.execute(_EXISTING_OVERRIDE_SQL, {"d": decision_id, "dec": new_decision, "r": override_reason})
+      return res.fetchone() is not None
+
+
+async def fetch_base_decision_async(decision_id: str):
+  """Async counterpart of ``fetch_base_decision``."""
+  aengine = _get_async_engine()
+  with _count_db_errors("read"):
+    if aengine is None:
+      return await asyncio.to_thread(fetch_base_decision, decision_id)
+    async with aengine.connect() as cx:
+      res = await cx.execute(_FETCH_BASE_SQL, {"did": decision_id})
+      return res.fetchone()
+
+
+async def log_tail_id_async() -> int:
+  aengine = _get_async_engine()
+  with _count_db_errors("read"):
+    if aengine is None:
+      return await asyncio.to_thread(log_tail_id)
+    async with aengine.connect() as cx:
+      return (await cx.execute(_TAIL_ID_SQL)).scalar()
+
+
+async def fetch_appended_async(after_id: int, decisions=None, limit: int = FEED_BATCH) -> tuple:
+  """Async counterpart of ``fetch_appended``."""
+  aengine = _get_async_engine()
+  with _count_db_errors("read"):
+    if aengine is None:
+      return await asyncio.to_thread(fetch_appended, after_id, decisions, limit)
+    async with aengine.connect() as cx:
+      upto = (await cx.execute(_TAIL_ID_SQL)).scalar()
+      if upto <= after_id:
+        return [], after_id
+      res = await cx.execute(_feed_sql(decisions), _feed_params(after_id, upto, decisions, limit))
+      return _feed_page(res.mappings().all(), upto, limit)
+
+
+async def log_decision_async(payload):
+  """Await the appender commit for one row; returns the persisted ts_utc."""
+  return (await asyncio.wrap_future(_appender.submit([payload])))[0]
+
+
+async def log_decisions_async(payloads, with_status: bool = False):
+  """Await the appender commit for many rows; returns the persisted ts_utc per payload.
+
+  ``with_status`` returns (ts_utc, written) pairs (see ChainAppender.submit).
+  """
+  if not payloads:
+    return []
+  return await asyncio.wrap_future(_appender.submit(payloads, with_status))
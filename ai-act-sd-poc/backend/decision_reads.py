@@ -0,0 +1,146 @@
+"""Read API over decision_logs: keyset-paginated listing and case lookup.
+
+Rows are listed newest first (``ts_utc DESC, id DESC``); the cursor is the
+(ts_utc, id) of the last row returned, so every page is one index range scan
+no matter how deep the client pages. Filters map onto the indexes created by
+``db.ensure_schema``; order/customer prefixes are byte ranges on those indexes
+(case-sensitive).
+
+``log_version`` (id and row_hash of the newest row) identifies the state of the
+append-only log; the API derives ETags from it and the request, so unchanged
+pages are answered with 304 before any query runs.
+
+Shared by the backend (``decision_reads``) and the tools
+(``backend.decision_reads``); any DB-API connection to the SQLite file.
+"""
+import base64
+import json
+
+LIST_FIELDS = (
+    "id", "decision_id", "ts_utc", "order_id", "customer_id", "score", "decision", "rule_version",
+    "data_version", "actor_sys", "actor_ux", "overridden", "override_reason", "second_approval",
+    "prev_hash", "row_hash",
+)
+DEFAULT_FIELDS = (
+    "id", "decision_id", "ts_utc", "order_id", "customer_id", "score", "decision", "overridden",
+    "second_approval", "rule_version", "data_version",
+)
+LIST_LIMIT = 100
+MAX_LIST_LIMIT = 1000
+_PREFIX_END = "\U0010ffff"  # sorts after every other character (UTF-8 bytes)
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(ts_utc: str, row_id: int) -> str:
+    raw = json.dumps([ts_utc, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts_utc, row_id = json.loads(raw)
+        if not isinstance(ts_utc, str) or not isinstance(row_id, int):
+            raise TypeError
+        return ts_utc, row_id
+    except (ValueError, TypeError) as exc:
+        raise CursorError("invalid cursor") from exc
+
+
+def select_fields(fields) -> tuple:
+    """Validated field selection (comma-separated string or list); ValueError on unknown names."""
+    if not fields:
+        return DEFAULT_FIELDS
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    chosen = tuple(dict.fromkeys(f.strip() for f in fields if f.strip()))
+    unknown = [f for f in chosen if f not in LIST_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return chosen or DEFAULT_FIELDS
+
+
+def log_version(con) -> list:
+    row = con.execute("SELECT id, row_hash FROM decision_logs ORDER BY id DESC LIMIT 1").fetchone()
+    return [row[0], row[1]] if row else [0, None]
+
+
+def _filters(decisions=None, ts_from=None, ts_to=None, overridden=None, order_prefix=None,
+             customer_prefix=None) -> tuple:
+    clauses, params = [], {}
+    if decisions:
+        names = [f"decision_{i}" for i in range(len(decisions))]
+        clauses.append(f"decision IN ({', '.join(':' + n for n in names)})")
+        params.update(zip(names, decisions))
+    if ts_from:
+        clauses.append("ts_utc >= :ts_from")
+        params["ts_from"] = ts_from
+    if ts_to:
+        clauses.append("ts_utc < :ts_to")
+        params["ts_to"] = ts_to
+    if overridden is not None:
+        clauses.append("COALESCE(overridden, 0) = :overridden")
+        params["overridden"] = int(overridden)
+    for column, prefix in (("order_id", order_prefix), ("customer_id", customer_prefix)):
+        if prefix:
+            clauses.append(f"{column} >= :{column}_lo AND {column} < :{column}_hi")
+            params[f"{column}_lo"] = prefix
+            params[f"{column}_hi"] = prefix + _PREFIX_END
+    return clauses, params
+
+
+def list_decisions(con, fields=DEFAULT_FIELDS, limit: int = LIST_LIMIT, cursor: str | None = None,
+                   **filters) -> dict:
+    """One page of log rows, newest first, plus the cursor of the next page (None on the last page).
+
+    ``filters``: decisions, ts_from (inclusive), ts_to (exclusive), overridden,
+    order_prefix, customer_prefix.
+    """
+    clauses, params = _filters(**filters)
+    if cursor:
+        ts_utc, row_id = decode_cursor(cursor)
+        clauses.append("(ts_utc < :cursor_ts OR (ts_utc = :cursor_ts AND id < :cursor_id))")
+        params.update(cursor_ts=ts_utc, cursor_id=row_id)
+    limit = max(1, min(int(limit), MAX_LIST_LIMIT))
+    params["limit"] = limit + 1  # one extra row tells whether another page follows
+    columns = list(dict.fromkeys(("id", "ts_utc", *fields)))
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    cur = con.execute(
+        f"SELECT {', '.join(columns)} FROM decision_logs {where} ORDER BY ts_utc DESC, id DESC LIMIT :limit", params,
+    )
+    rows = [dict(zip(columns, r)) for r in cur.fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["ts_utc"], rows[-1]["id"])
+    return {"items": [{f: r[f] for f in fields} for r in rows], "next_cursor": next_cursor}
+
+
+def _parse_json(value):
+    try:
+        return json.loads(value) if value else {}
+    except (TypeError, ValueError):
+        return {}
+
+
+def get_decision(con, decision_id: str) -> dict | None:
+    """Base row of a case with its parsed request and thresholds, plus all overrides (oldest first)."""
+    cur = con.execute(
+        f"SELECT {', '.join(LIST_FIELDS)}, input_json, thresholds_json FROM decision_logs"
+        " WHERE decision_id = :decision_id ORDER BY id",
+        {"decision_id": decision_id},
+    )
+    columns = [d[0] for d in cur.description]
+    rows = [dict(zip(columns, r)) for r in cur.fetchall()]
+    base = next((r for r in rows if not r["overridden"]), None)
+    if base is None:
+        return None
+    base["request"] = _parse_json(base.pop("input_json"))
+    base["thresholds"] = _parse_json(base.pop("thresholds_json"))
+    base["overrides"] = [
+        {f: r[f] for f in LIST_FIELDS if f not in ("decision_id",)} for r in rows if r["overridden"]
+    ]
+    return base
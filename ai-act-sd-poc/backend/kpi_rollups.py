@@ -0,0 +1,295 @@
+"""Incremental KPI rollups next to decision_logs (maintenance side).
+
+catch_up() folds every decision_logs row with an id above the stored
+watermark into kpi_rollup_hourly/daily (row counts and compute_metrics checks
+per bucket, decision and overridden flag) and kpi_queue_hourly/daily (REVIEW
+queue time as count, sum and a QuantileSketch). Each batch and the watermark
+commit in one BEGIN IMMEDIATE transaction, so concurrent or crashed catch-ups
+never count a row twice.
+
+Used by the backend's rollup worker and by tools/rollups.py, which also holds
+the readers. Stdlib only; takes plain sqlite3 connections.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    from sketches import QuantileSketch
+except ImportError:  # imported as backend.kpi_rollups (tools/, oversight UI)
+    from backend.sketches import QuantileSketch
+
+# thresholds_json fields; NULL if the JSON is missing or malformed
+THRESHOLD_COLUMNS_SQL = """
+    CASE WHEN json_valid(thresholds_json) THEN json_extract(thresholds_json, '$.allow_max') END AS allow_max,
+    CASE WHEN json_valid(thresholds_json) THEN json_extract(thresholds_json, '$.review_range[0]') END AS review_lo,
+    CASE WHEN json_valid(thresholds_json) THEN json_extract(thresholds_json, '$.review_range[1]') END AS review_hi,
+    CASE WHEN json_valid(thresholds_json) THEN json_extract(thresholds_json, '$.block_min') END AS block_min,
+    CASE WHEN json_valid(thresholds_json) THEN
+        json_type(thresholds_json, '$.allow_max') IS NOT NULL
+        AND json_type(thresholds_json, '$.review_range') IS NOT NULL
+        AND json_type(thresholds_json, '$.block_min') IS NOT NULL
+    ELSE 0 END AS thresholds_ok
+"""
+
+# Per-row checks of compute_metrics.py over a subquery selecting decision, score,
+# second_approval, override_reason, actor_ux, base, ovr and THRESHOLD_COLUMNS_SQL
+COMPLETE_SQL = """CASE
+        WHEN base THEN thresholds_ok
+        WHEN ovr THEN length(override_reason) >= 15 AND COALESCE(actor_ux, '') <> '' AND second_approval = 1
+    END"""
+COHERENCE_VIOLATION_SQL = """base AND decision <> CASE
+        WHEN score <= allow_max THEN 'ALLOW'
+        WHEN score BETWEEN review_lo AND review_hi THEN 'REVIEW'
+        WHEN score >= block_min THEN 'BLOCK'
+        ELSE 'ALLOW'
+    END"""
+EDGE_SQL = "base AND score BETWEEN review_lo - 5 AND review_lo + 5"
+CHECKED_ROWS_SQL = """
+    SELECT decision, score, second_approval, override_reason, actor_ux, ts_utc,
+           COALESCE(overridden, 0) AS overridden,
+           COALESCE(overridden, 0) = 0 AS base,
+           COALESCE(overridden, 0) = 1 AS ovr,
+           {thresholds}
+    FROM decision_logs {where}
+"""
+
+BATCH_ROWS = 50000
+# bucket = prefix of the ISO ts_utc
+GRAINS = {"hour": 13, "day": 10}
+WATERMARK_NAME = "decision_logs"
+_IN_CHUNK = 500
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS kpi_rollup_{grain} (
+  bucket TEXT NOT NULL,
+  decision TEXT NOT NULL,
+  overridden INTEGER NOT NULL,
+  cnt INTEGER NOT NULL DEFAULT 0,
+  second_approval INTEGER NOT NULL DEFAULT 0,
+  complete INTEGER NOT NULL DEFAULT 0,
+  coherence_violations INTEGER NOT NULL DEFAULT 0,
+  edge INTEGER NOT NULL DEFAULT 0,
+  inconsistent INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (bucket, decision, overridden)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS kpi_queue_{grain} (
+  bucket TEXT PRIMARY KEY,
+  n INTEGER NOT NULL,
+  sum_min REAL NOT NULL,
+  sketch TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+STATE_DDL = """
+CREATE TABLE IF NOT EXISTS kpi_case_state (
+  decision_id TEXT PRIMARY KEY,
+  bucket TEXT NOT NULL,
+  override_id INTEGER NOT NULL,
+  override_ts TEXT NOT NULL,
+  minutes REAL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS kpi_rollup_state (
+  name TEXT PRIMARY KEY,
+  last_id INTEGER NOT NULL,
+  updated_utc TEXT
+);
+"""
+
+_COUNTS_UPSERT = """
+INSERT INTO kpi_rollup_{grain} (bucket, decision, overridden, cnt, second_approval, complete, coherence_violations, edge)
+SELECT substr(ts_utc, 1, {width}), decision, overridden, COUNT(*),
+       COALESCE(SUM(second_approval = 1), 0),
+       COALESCE(SUM({complete}), 0),
+       COALESCE(SUM({coherence}), 0),
+       COALESCE(SUM({edge}), 0)
+FROM ({rows})
+WHERE true
+GROUP BY 1, 2, 3
+ON CONFLICT (bucket, decision, overridden) DO UPDATE SET
+  cnt = cnt + excluded.cnt,
+  second_approval = second_approval + excluded.second_approval,
+  complete = complete + excluded.complete,
+  coherence_violations = coherence_violations + excluded.coherence_violations,
+  edge = edge + excluded.edge
+"""
+
+# Base rows whose decision differs from the first base row of the same decision_id
+_INCONSISTENT_SQL = """
+SELECT n.ts_utc, n.decision FROM decision_logs AS n
+JOIN decision_logs AS f
+  ON f.id = (SELECT MIN(id) FROM decision_logs WHERE decision_id = n.decision_id AND overridden = 0)
+WHERE n.id > ? AND n.id <= ? AND COALESCE(n.overridden, 0) = 0 AND n.decision <> f.decision
+"""
+
+_OVERRIDES_SQL = """
+SELECT o.id, o.decision_id, o.ts_utc, b.ts_utc,
+       ROUND((julianday(o.ts_utc) - julianday(b.ts_utc)) * 86400.0, 3) / 60.0
+FROM decision_logs AS o
+JOIN decision_logs AS b ON b.decision_id = o.decision_id AND b.overridden = 0
+WHERE o.id > ? AND o.id <= ? AND o.overridden = 1 AND b.decision = 'REVIEW'
+ORDER BY o.id
+"""
+
+
+def open_db(db_path: str | Path) -> sqlite3.Connection:
+    """Writable connection (catch-up writes the rollup tables, never decision_logs)."""
+    return sqlite3.connect(str(db_path), timeout=30)
+
+
+def ensure_schema(con: sqlite3.Connection) -> None:
+    con.executescript("".join(ROLLUP_DDL.format(grain=g) for g in GRAINS) + STATE_DDL)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _chunks(items: List[Any], size: int = _IN_CHUNK) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def watermark(con: sqlite3.Connection) -> int:
+    row = con.execute("SELECT last_id FROM kpi_rollup_state WHERE name = ?", (WATERMARK_NAME,)).fetchone()
+    return row[0] if row else 0
+
+
+def _apply_counts(con: sqlite3.Connection, lo: int, hi: int) -> None:
+    rows = CHECKED_ROWS_SQL.format(thresholds=THRESHOLD_COLUMNS_SQL, where="WHERE id > ? AND id <= ?")
+    for grain, width in GRAINS.items():
+        con.execute(_COUNTS_UPSERT.format(
+            grain=grain, width=width, rows=rows,
+            complete=COMPLETE_SQL, coherence=COHERENCE_VIOLATION_SQL, edge=EDGE_SQL,
+        ), (lo, hi))
+    deltas: Dict[Tuple[str, str, str], int] = {}
+    for ts, decision in con.execute(_INCONSISTENT_SQL, (lo, hi)):
+        for grain, width in GRAINS.items():
+            key = (grain, ts[:width], decision)
+            deltas[key] = deltas.get(key, 0) + 1
+    for (grain, bucket, decision), n in deltas.items():
+        con.execute(
+            f"UPDATE kpi_rollup_{grain} SET inconsistent = inconsistent + ? "
+            "WHERE bucket = ? AND decision = ? AND overridden = 0", (n, bucket, decision),
+        )
+
+
+def _apply_queue(con: sqlite3.Connection, lo: int, hi: int) -> None:
+    overrides = con.execute(_OVERRIDES_SQL, (lo, hi)).fetchall()
+    if not overrides:
+        return
+    ids = sorted({r[1] for r in overrides})
+    state: Dict[str, Tuple[str, int, str, float | None]] = {}
+    for chunk in _chunks(ids):
+        marks = ",".join("?" * len(chunk))
+        for did, bucket, oid, ots, minutes in con.execute(
+            f"SELECT decision_id, bucket, override_id, override_ts, minutes FROM kpi_case_state WHERE decision_id IN ({marks})",
+            chunk,
+        ):
+            state[did] = (bucket, oid, ots, minutes)
+
+    # (grain, bucket) -> list of (minutes, weight)
+    changes: Dict[Tuple[str, str], List[Tuple[float, int]]] = {}
+    touched = set()
+    for oid, did, ots, base_ts, minutes in overrides:
+        prev = state.get(did)
+        if prev is not None and (ots, oid) <= (prev[2], prev[1]):
+            continue  # an earlier-dated override; the latest one still counts
+        bucket = base_ts[:GRAINS["hour"]]
+        for grain, width in GRAINS.items():
+            if prev is not None and prev[3] is not None:
+                changes.setdefault((grain, prev[0][:width]), []).append((prev[3], -1))
+            if minutes is not None:
+                changes.setdefault((grain, bucket[:width]), []).append((minutes, 1))
+        state[did] = (bucket, oid, ots, minutes)
+        touched.add(did)
+
+    con.executemany(
+        "INSERT OR REPLACE INTO kpi_case_state (decision_id, bucket, override_id, override_ts, minutes) VALUES (?, ?, ?, ?, ?)",
+        [(did, *state[did]) for did in sorted(touched)],
+    )
+    for grain in GRAINS:
+        buckets = sorted(b for g, b in changes if g == grain)
+        current = {}
+        for chunk in _chunks(buckets):
+            marks = ",".join("?" * len(chunk))
+            for bucket, n, sum_min, sketch in con.execute(
+                f"SELECT bucket, n, sum_min, sketch FROM kpi_queue_{grain} WHERE bucket IN ({marks})", chunk,
+            ):
+                current[bucket] = (n, sum_min, QuantileSketch.from_dict(json.loads(sketch)))
+        for bucket in buckets:
+            n, sum_min, sketch = current.get(bucket, (0, 0.0, QuantileSketch()))
+            for minutes, weight in changes[(grain, bucket)]:
+                n += weight
+                sum_min += minutes * weight
+                sketch.add(minutes, weight)
+            if n:
+                con.execute(
+                    f"INSERT OR REPLACE INTO kpi_queue_{grain} (bucket, n, sum_min, sketch) VALUES (?, ?, ?, ?)",
+                    (bucket, n, sum_min, json.dumps(sketch.to_dict(), separators=(",", ":"))),
+                )
+            else:
+                con.execute(f"DELETE FROM kpi_queue_{grain} WHERE bucket = ?", (bucket,))
+
+
+def catch_up(con: sqlite3.Connection, batch_rows: int = BATCH_ROWS) -> int:
+    """Fold rows after the watermark into the rollups; returns the number of ids covered."""
+    ensure_schema(con)
+    covered = 0
+    while True:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            last_id = watermark(con)
+            (max_id,) = con.execute("SELECT COALESCE(MAX(id), 0) FROM decision_logs").fetchone()
+            if max_id <= last_id:
+                con.rollback()
+                return covered
+            hi = min(max_id, last_id + max(1, batch_rows))
+            _apply_counts(con, last_id, hi)
+            _apply_queue(con, last_id, hi)
+            con.execute(
+                "INSERT INTO kpi_rollup_state (name, last_id, updated_utc) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET last_id = excluded.last_id, updated_utc = excluded.updated_utc",
+                (WATERMARK_NAME, hi, _now_iso()),
+            )
+            con.commit()
+        except BaseException:
+            con.rollback()
+            raise
+        covered += hi - last_id
+
+
+def rebuild(con: sqlite3.Connection, batch_rows: int = BATCH_ROWS) -> int:
+    """Drop all rollup state and recompute it from the first row."""
+    ensure_schema(con)
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        for grain in GRAINS:
+            con.execute(f"DELETE FROM kpi_rollup_{grain}")
+            con.execute(f"DELETE FROM kpi_queue_{grain}")
+        con.execute("DELETE FROM kpi_case_state")
+        con.execute("DELETE FROM kpi_rollup_state")
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+    return catch_up(con, batch_rows)
+
+
+def has_rollups(con: sqlite3.Connection) -> bool:
+    row = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'kpi_rollup_state'").fetchone()
+    return row is not None
+
+
+def rollup_lag(con: sqlite3.Connection) -> Tuple[int, str | None]:
+    """(ids not yet folded in, updated_utc of the watermark); read-only, needs has_rollups()."""
+    row = con.execute(
+        "SELECT last_id, updated_utc FROM kpi_rollup_state WHERE name = ?", (WATERMARK_NAME,)
+    ).fetchone()
+    last_id, updated_utc = row if row else (0, None)
+    (max_id,) = con.execute("SELECT COALESCE(MAX(id), 0) FROM decision_logs").fetchone()
+    return max(0, max_id - last_id), updated_utc
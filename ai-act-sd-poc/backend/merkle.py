@@ -0,0 +1,242 @@
+"""Merkle checkpoints over decision_logs (RFC 6962/9162 tree hashing, stdlib only).
+
+Every ``MERKLE_SEGMENT_SIZE`` rows the appender stores a checkpoint: the Merkle
+root over the segment's ``row_hash`` values plus a ``log_root`` over all
+segment roots so far. An inclusion proof for one row is then two audit paths
+(row -> segment root -> log root), i.e. O(log n) hashes instead of a walk of
+the whole hash chain. Building a proof reads the row's segment plus the
+checkpoints added since the previous proof: the log level is a MerkleLog per
+database file that keeps the roots of its complete subtrees in memory.
+
+Shared by the backend (``merkle``) and the tools (``backend.merkle``); the
+proof loader only needs a DB-API connection to the SQLite file.
+"""
+import hashlib
+import os
+import threading
+
+MERKLE_SEGMENT_SIZE = int(os.getenv("MERKLE_SEGMENT_SIZE", "1024"))
+
+CHECKPOINT_DDL = """
+CREATE TABLE IF NOT EXISTS merkle_checkpoints (
+  seq INTEGER PRIMARY KEY,
+  first_id INTEGER NOT NULL,
+  last_id INTEGER NOT NULL,
+  size INTEGER NOT NULL,
+  root TEXT NOT NULL,
+  log_root TEXT NOT NULL,
+  created_utc TEXT NOT NULL
+);
+"""
+
+PROOF_ROW_FIELDS = (
+    "id", "decision_id", "ts_utc", "order_id", "customer_id", "input_json", "score", "thresholds_json",
+    "decision", "rule_version", "data_version", "actor_sys", "actor_ux", "overridden", "override_reason",
+    "second_approval", "prev_hash", "row_hash",
+)
+
+
+def leaf_hash(value: str) -> bytes:
+    return hashlib.sha256(b"\x00" + (value or "").encode("utf-8")).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def _split(n: int) -> int:
+    # largest power of two strictly smaller than n
+    k = 1
+    while k << 1 < n:
+        k <<= 1
+    return k
+
+
+def merkle_root(leaves: list) -> bytes:
+    """Root over already leaf-hashed values (RFC 6962 MTH)."""
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    if len(leaves) == 1:
+        return leaves[0]
+    k = _split(len(leaves))
+    return node_hash(merkle_root(leaves[:k]), merkle_root(leaves[k:]))
+
+
+def audit_path(leaves: list, index: int) -> list:
+    """Sibling hashes from leaf ``index`` up to the root (RFC 6962 PATH)."""
+    if len(leaves) <= 1:
+        return []
+    k = _split(len(leaves))
+    if index < k:
+        return audit_path(leaves[:k], index) + [merkle_root(leaves[k:])]
+    return audit_path(leaves[k:], index - k) + [merkle_root(leaves[:k])]
+
+
+def verify_path(leaf: bytes, index: int, size: int, path: list, root: bytes) -> bool:
+    """RFC 9162 section 2.1.3.2 inclusion verification."""
+    if index >= size:
+        return False
+    fn, sn, r = index, size - 1, leaf
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+class MerkleLog:
+    """Append-only RFC 6962 tree that keeps the root of every complete, aligned subtree.
+
+    ``levels[k][j]`` is the root over leaves ``[j * 2**k, (j + 1) * 2**k)``.
+    Appending is amortized O(1); root() and path() for any tree size up to
+    ``len(self)`` read O(log n) stored nodes (plus O(log n) hashes for the
+    incomplete right edge) instead of rehashing all leaves.
+    """
+
+    def __init__(self, leaves=()):
+        self.levels = [[]]
+        for leaf in leaves:
+            self.append(leaf)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def append(self, leaf: bytes) -> None:
+        self.levels[0].append(leaf)
+        k, j = 0, len(self.levels[0]) - 1
+        while j & 1:  # right child completed a subtree one level up
+            if len(self.levels) == k + 1:
+                self.levels.append([])
+            self.levels[k + 1].append(node_hash(self.levels[k][j - 1], self.levels[k][j]))
+            k, j = k + 1, j >> 1
+
+    def _root(self, lo: int, hi: int) -> bytes:
+        # MTH of leaves[lo:hi]; lo is always a multiple of the left subtree size in the recursion
+        n = hi - lo
+        if n & (n - 1) == 0:
+            return self.levels[n.bit_length() - 1][lo // n]
+        k = _split(n)
+        return node_hash(self.levels[k.bit_length() - 1][lo // k], self._root(lo + k, hi))
+
+    def root(self, size: int | None = None) -> bytes:
+        size = len(self) if size is None else size
+        return self._root(0, size) if size else hashlib.sha256(b"").digest()
+
+    def path(self, index: int, size: int | None = None) -> list:
+        """Same as ``audit_path(leaves[:size], index)``."""
+        size = len(self) if size is None else size
+        lo, hi, path = 0, size, []
+        while hi - lo > 1:
+            k = _split(hi - lo)
+            if index < lo + k:
+                path.append(self._root(lo + k, hi))
+                hi = lo + k
+            else:
+                path.append(self._root(lo, lo + k))
+                lo += k
+        return path[::-1]
+
+
+# checkpoint-level trees per database file, extended with the checkpoints added since
+_LOG_TREES = {}
+_LOG_TREES_LOCK = threading.Lock()
+
+
+def _database_file(cur) -> str:
+    cur.execute("PRAGMA database_list")
+    return next((row[2] for row in cur.fetchall() if row[1] == "main"), "") or ""
+
+
+def _log_path(cur, index: int, size: int) -> list:
+    """Audit path of checkpoint ``index`` in the log of ``size`` checkpoints (cached tree per DB file)."""
+    key = _database_file(cur)
+    with _LOG_TREES_LOCK:
+        tree = _LOG_TREES.get(key) if key else None
+        if tree is not None and len(tree):
+            # cheap identity check: the newest leaf both sides know must still match
+            known = min(len(tree), size)
+            cur.execute("SELECT root FROM merkle_checkpoints WHERE seq = ?", (known,))
+            row = cur.fetchone()
+            if row is None or leaf_hash(row[0]) != tree.levels[0][known - 1]:
+                tree = None  # another file at the same path
+        if tree is None:
+            tree = MerkleLog()
+        if size > len(tree):
+            cur.execute("SELECT root FROM merkle_checkpoints WHERE seq > ? AND seq <= ? ORDER BY seq", (len(tree), size))
+            for (root,) in cur.fetchall():
+                tree.append(leaf_hash(root))
+        if key:
+            _LOG_TREES[key] = tree
+        return tree.path(index, size)
+
+
+def load_proof(con, decision_id: str, overridden: int = 0):
+    """Build the inclusion proof for the first row of ``decision_id`` (base row by default).
+
+    ``con`` is a DB-API connection (qmark style). Returns None if the row does
+    not exist and ``{"pending": True, ...}`` if it is not covered by a checkpoint yet.
+    """
+    cur = con.cursor()
+    cur.execute(
+        f"SELECT {', '.join(PROOF_ROW_FIELDS)} FROM decision_logs "
+        "WHERE decision_id=? AND overridden=? ORDER BY id ASC LIMIT 1",
+        (decision_id, overridden),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    row_map = dict(zip(PROOF_ROW_FIELDS, row))
+    row_id = row_map["id"]
+    cur.execute(
+        "SELECT seq, first_id, last_id, size, root FROM merkle_checkpoints "
+        "WHERE first_id <= ? AND last_id >= ? LIMIT 1",
+        (row_id, row_id),
+    )
+    seg = cur.fetchone()
+    if seg is None:
+        return {"pending": True, "decision_id": decision_id, "row_id": row_id}
+    seq, first_id, last_id, size, root = seg
+    cur.execute("SELECT id, row_hash FROM decision_logs WHERE id BETWEEN ? AND ? ORDER BY id", (first_id, last_id))
+    seg_rows = cur.fetchall()
+    index = next(i for i, (rid, _) in enumerate(seg_rows) if rid == row_id)
+    seg_leaves = [leaf_hash(h) for _, h in seg_rows]
+    cur.execute("SELECT seq, log_root FROM merkle_checkpoints ORDER BY seq DESC LIMIT 1")
+    log_size, log_root = cur.fetchone()
+    log_path = _log_path(cur, seq - 1, log_size)
+    return {
+        "decision_id": decision_id,
+        "row_id": row_id,
+        "row": row_map,
+        "leaf_index": index,
+        "segment": {"seq": seq, "first_id": first_id, "last_id": last_id, "size": size, "root": root},
+        "segment_path": [h.hex() for h in audit_path(seg_leaves, index)],
+        "log": {"size": log_size, "root": log_root},
+        "log_path": [h.hex() for h in log_path],
+    }
+
+
+def verify_proof(proof: dict, row_hash: str | None = None, log_root: str | None = None) -> tuple[bool, str]:
+    """Check both audit paths of a proof; optionally pin a recomputed row_hash / trusted log_root."""
+    rh = row_hash if row_hash is not None else proof["row"]["row_hash"]
+    if rh != proof["row"]["row_hash"]:
+        return False, "row_hash does not match row content"
+    seg = proof["segment"]
+    if not verify_path(leaf_hash(rh), proof["leaf_index"], seg["size"],
+                       [bytes.fromhex(h) for h in proof["segment_path"]], bytes.fromhex(seg["root"])):
+        return False, f"row not included in segment {seg['seq']}"
+    log = proof["log"]
+    if log_root is not None and log_root != log["root"]:
+        return False, "log_root differs from trusted value"
+    if not verify_path(leaf_hash(seg["root"]), seg["seq"] - 1, log["size"],
+                       [bytes.fromhex(h) for h in proof["log_path"]], bytes.fromhex(log["root"])):
+        return False, f"segment {seg['seq']} not included in log root"
+    hashes = len(proof["segment_path"]) + len(proof["log_path"])
+    return True, f"OK (row id={proof['row_id']}, segment {seg['seq']}, {hashes} hashes)"
@@ -0,0 +1,196 @@
+"""In-process metrics with Prometheus text exposition (no client library needed).
+
+Counters and histograms keep one small array per thread (event loop, appender
+thread, worker threads); the hot path only touches its own shard, so
+recording takes no lock. A scrape sums the shards under the registration
+lock. Label sets are created on first use and cached, so keep label values
+bounded (route templates, not raw paths).
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+import threading
+
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _Sharded:
+    """Per-thread arrays of ``width`` floats, summed on read."""
+
+    def __init__(self, width: int):
+        self._width = width
+        self._tls = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> list:
+        try:
+            return self._tls.values
+        except AttributeError:
+            values = [0.0] * self._width
+            with self._lock:
+                self._shards.append(values)
+            self._tls.values = values
+            return values
+
+    def snapshot(self) -> list:
+        total = [0.0] * self._width
+        with self._lock:
+            shards = list(self._shards)
+        for values in shards:
+            for i, v in enumerate(values):
+                total[i] += v
+        return total
+
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shard()[0] += amount
+
+
+class _HistogramChild(_Sharded):
+    # layout: [bucket_0 .. bucket_n-1, +Inf, sum]
+    def __init__(self, buckets: tuple):
+        super().__init__(len(buckets) + 2)
+        self._buckets = buckets
+
+    def observe(self, value: float) -> None:
+        values = self._shard()
+        values[bisect_left(self._buckets, value)] += 1
+        values[-1] += value
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self.labels()  # unlabeled series are exported from the start (as 0)
+
+    def labels(self, *values):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Fresh per-label-set child holding the sharded values."""
+
+    @abstractmethod
+    def _render_child(self, key: tuple, child) -> list:
+        """Exposition lines of one child."""
+
+    def _label_str(self, key: tuple, extra: tuple = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        inner = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+        return "{" + inner + "}"
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = sorted(self._children.items())
+        for key, child in children:
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _render_child(self, key, child):
+        return [f"{self.name}{self._label_str(key)} {_fmt(child.snapshot()[0])}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, key, child):
+        values = child.snapshot()
+        lines = []
+        cumulative = 0.0
+        for le, count in zip((*self.buckets, float("inf")), values):
+            cumulative += count
+            bound = "+Inf" if le == float("inf") else _fmt(le)
+            lines.append(f"{self.name}_bucket{self._label_str(key, (('le', bound),))} {_fmt(cumulative)}")
+        lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(values[-1])}")
+        lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(cumulative)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "credit_http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"),
+))
+DECISION_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "credit_decision_stage_seconds",
+    "Time spent per decision stage (validation, score, canonical, exists_check, insert, ...)", ("stage",),
+))
+REJECTIONS = REGISTRY.register(Counter(
+    "credit_rejections_total", "Requests rejected by security_limits", ("status",),
+))
+OVERRIDE_CONFLICTS = REGISTRY.register(Counter(
+    "credit_override_conflicts_total", "Identical override requests answered with 409",
+))
+DB_ERRORS = REGISTRY.register(Counter(
+    "credit_db_errors_total", "Database errors by operation", ("op",),
+))
+for _status in (413, 429):
+    REJECTIONS.labels(_status)
+for _op in ("read", "append", "rollup"):
+    DB_ERRORS.labels(_op)
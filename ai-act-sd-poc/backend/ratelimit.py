@@ -0,0 +1,171 @@
+"""Rate limiting for the credit API (GCRA, one float of state per key).
+
+GCRA keeps only the theoretical arrival time (TAT) per key. A key whose TAT
+lies in the past is fully replenished, so dropping it is lossless; this makes
+idle-key eviction free of side effects. Two backends:
+
+- ``memory``: per-process dict, capped at ``RATE_LIMIT_MAX_KEYS``; a min-heap
+  on TAT finds the most replenished key to evict in O(log n).
+- ``sqlite``: a small local SQLite file shared by all worker processes on one
+  host, so ``--workers N`` does not multiply the configured rate. Its calls
+  take a write lock and may wait for it, so the middleware awaits
+  ``allow_async`` (worker thread) instead of blocking the event loop.
+"""
+import asyncio
+import heapq
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "5"))  # tokens per second
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "10"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | sqlite
+RATE_LIMIT_DB = os.getenv("RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "credit_api_ratelimit.db"))
+
+
+def _load_role_quotas() -> dict:
+    """Per-role (rate, burst); roles as in auth.TOKENS plus "anon" for unauthenticated clients.
+
+    Override via RATE_LIMIT_ROLES_JSON, e.g. '{"admin": {"rate": 20, "burst": 40}}';
+    a malformed value fails at startup like a misconfigured TOKENS_JSON.
+    """
+    quotas = {role: (RATE_LIMIT_RATE, RATE_LIMIT_BURST) for role in ("anon", "reviewer", "admin")}
+    raw = os.getenv("RATE_LIMIT_ROLES_JSON")
+    if raw:
+        try:
+            roles = json.loads(raw)
+            if not isinstance(roles, dict) or not all(isinstance(cfg, dict) for cfg in roles.values()):
+                raise ValueError("expected a JSON object of role objects")
+            for role, cfg in roles.items():
+                quotas[str(role).lower()] = (
+                    float(cfg.get("rate", RATE_LIMIT_RATE)),
+                    float(cfg.get("burst", RATE_LIMIT_BURST)),
+                )
+        except (ValueError, TypeError) as exc:
+            raise RuntimeError(f"Rate limit misconfigured: invalid RATE_LIMIT_ROLES_JSON ({exc})") from exc
+    return quotas
+
+
+ROLE_QUOTAS = _load_role_quotas()
+
+
+def _gcra(tat: float | None, now: float, rate: float, burst: float) -> tuple[bool, float | None]:
+    """Return (allowed, new_tat); equivalent to a token bucket of size ``burst`` refilled at ``rate``."""
+    if rate <= 0:
+        return False, tat
+    interval = 1.0 / rate
+    new_tat = max(tat if tat is not None else now, now) + interval
+    if new_tat - now > burst * interval:
+        return False, tat
+    return True, new_tat
+
+
+class MemoryLimiter:
+    """In-process GCRA state; over the key cap the key with the smallest TAT is dropped.
+
+    The smallest TAT is the most replenished key: if it lies in the past the
+    key is idle and dropping it is lossless, otherwise it is the key that
+    loses the least. ``_heap`` holds (tat, key) entries and is cleaned lazily:
+    entries whose TAT no longer matches ``_tat`` are skipped when popped and
+    removed in bulk once they outnumber the live keys.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max(1, max_keys)
+        self._tat = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, rate: float, burst: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            allowed, new_tat = _gcra(self._tat.get(key), now, rate, burst)
+            if allowed:
+                self._tat[key] = new_tat
+                heapq.heappush(self._heap, (new_tat, key))
+                if len(self._tat) > self.max_keys:
+                    self._evict()
+                if len(self._heap) > 2 * len(self._tat) + 64:
+                    self._heap = [(tat, k) for k, tat in self._tat.items()]
+                    heapq.heapify(self._heap)
+            return allowed
+
+    async def allow_async(self, key: str, rate: float, burst: float) -> bool:
+        return self.allow(key, rate, burst)
+
+    def _evict(self) -> None:
+        while len(self._tat) > self.max_keys:
+            tat, key = heapq.heappop(self._heap)
+            if self._tat.get(key) == tat:
+                del self._tat[key]
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+class SQLiteLimiter:
+    """GCRA state in a local SQLite file shared by all workers on the host."""
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self, path: str = RATE_LIMIT_DB, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.path = path
+        self.max_keys = max(1, max_keys)
+        self._local = threading.local()
+        self._calls = 0
+        with self._connect() as con:
+            con.execute("CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID")
+            con.execute("CREATE INDEX IF NOT EXISTS ix_gcra_tat ON gcra(tat)")  # range scans in _evict
+
+    def _connect(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=OFF")  # limiter state is ephemeral
+            self._local.con = con
+        return con
+
+    def allow(self, key: str, rate: float, burst: float) -> bool:
+        now = time.time()  # wall clock: shared across processes
+        con = self._connect()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            row = con.execute("SELECT tat FROM gcra WHERE key=?", (key,)).fetchone()
+            allowed, new_tat = _gcra(row[0] if row else None, now, rate, burst)
+            if allowed:
+                con.execute(
+                    "INSERT INTO gcra(key, tat) VALUES(?, ?) ON CONFLICT(key) DO UPDATE SET tat=excluded.tat",
+                    (key, new_tat),
+                )
+            self._calls += 1
+            if self._calls % self.SWEEP_EVERY == 0:
+                self._evict(con, now)
+            con.execute("COMMIT")
+        except Exception:
+            con.execute("ROLLBACK")
+            raise
+        return allowed
+
+    async def allow_async(self, key: str, rate: float, burst: float) -> bool:
+        # BEGIN IMMEDIATE may wait up to the 5 s busy timeout: keep it off the event loop
+        return await asyncio.to_thread(self.allow, key, rate, burst)
+
+    def _evict(self, con: sqlite3.Connection, now: float) -> None:
+        con.execute("DELETE FROM gcra WHERE tat <= ?", (now,))
+        (count,) = con.execute("SELECT COUNT(*) FROM gcra").fetchone()
+        if count > self.max_keys:
+            con.execute(
+                "DELETE FROM gcra WHERE key IN (SELECT key FROM gcra ORDER BY tat ASC LIMIT ?)",
+                (count - self.max_keys,),
+            )
+
+
+def create_limiter():
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteLimiter()
+    return MemoryLimiter()
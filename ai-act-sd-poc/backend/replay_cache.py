@@ -0,0 +1,39 @@
+from collections import OrderedDict
+import os
+import threading
+
+DECISION_CACHE_SIZE = int(os.getenv("DECISION_CACHE_SIZE", "50000"))
+
+
+class DecisionReplayCache:
+    """Bounded LRU of logged CreditResponses keyed by (decision_id, rule_version).
+
+    Retries of an identical request are answered from memory with the
+    originally logged timestamp instead of re-scoring and hitting SQLite.
+    """
+
+    def __init__(self, maxsize: int = DECISION_CACHE_SIZE):
+        self.maxsize = max(0, maxsize)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, decision_id: str, rule_version: str):
+        key = (decision_id, rule_version)
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, decision_id: str, rule_version: str, response) -> None:
+        if self.maxsize == 0:
+            return
+        key = (decision_id, rule_version)
+        with self._lock:
+            self._data[key] = response
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
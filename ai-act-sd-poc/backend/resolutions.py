@@ -0,0 +1,137 @@
+"""Review resolutions: one row per REVIEW case, kept current by the chain appender.
+
+``review_resolutions`` holds, per base REVIEW decision, its timestamp, the first
+and latest override timestamp, the queue time (base -> latest override, as in
+tools/governance_metrics.py), the override count and the second approval and
+actor of the latest override. Open cases are rows without an override.
+
+The appender inserts the row with the base decision and updates it in the same
+transaction as every override, so SLA figures (queue mean/p95, open count,
+oldest open case) are read from two partial indexes instead of joining the log.
+Existing logs are backfilled once when the table is created.
+
+Shared by the backend (``resolutions``), the oversight UI and the tools
+(``backend.resolutions``); stdlib only, any DB-API connection to the SQLite file.
+"""
+from datetime import datetime, timezone
+
+SLA_QUANTILE = 0.95
+
+RESOLUTION_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS review_resolutions (
+      decision_id TEXT PRIMARY KEY,
+      base_ts_utc TEXT NOT NULL,
+      first_override_ts TEXT,
+      last_override_ts TEXT,
+      override_count INTEGER NOT NULL DEFAULT 0,
+      second_approval INTEGER,
+      resolved_by TEXT,
+      queue_minutes REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_review_resolutions_open ON review_resolutions(base_ts_utc)"
+    " WHERE last_override_ts IS NULL",
+    "CREATE INDEX IF NOT EXISTS ix_review_resolutions_queue ON review_resolutions(queue_minutes)"
+    " WHERE queue_minutes IS NOT NULL",
+)
+
+_QUEUE_MINUTES_SQL = "ROUND((julianday({last}) - julianday(base_ts_utc)) * 86400.0, 3) / 60.0"
+
+# Appender statements (named parameters of the decision_logs row)
+OPEN_REVIEW_SQL = """
+INSERT INTO review_resolutions (decision_id, base_ts_utc) VALUES (:decision_id, :ts_utc)
+ON CONFLICT(decision_id) DO NOTHING
+"""
+
+# The latest override wins on equal ts_utc (later row), as ORDER BY ts_utc DESC, id DESC
+_LATEST = "(last_override_ts IS NULL OR :ts_utc >= last_override_ts)"
+APPLY_OVERRIDE_SQL = f"""
+UPDATE review_resolutions SET
+  first_override_ts = CASE WHEN first_override_ts IS NULL OR :ts_utc < first_override_ts
+                           THEN :ts_utc ELSE first_override_ts END,
+  last_override_ts = CASE WHEN {_LATEST} THEN :ts_utc ELSE last_override_ts END,
+  second_approval = CASE WHEN {_LATEST} THEN :second_approval ELSE second_approval END,
+  resolved_by = CASE WHEN {_LATEST} THEN :actor_ux ELSE resolved_by END,
+  queue_minutes = CASE WHEN {_LATEST} THEN {_QUEUE_MINUTES_SQL.format(last=":ts_utc")} ELSE queue_minutes END,
+  override_count = override_count + 1
+WHERE decision_id = :decision_id
+"""
+
+_BACKFILL_SQL = f"""
+WITH ovr AS (
+    SELECT decision_id, ts_utc, second_approval, actor_ux,
+           ROW_NUMBER() OVER (PARTITION BY decision_id ORDER BY ts_utc DESC, id DESC) AS rn,
+           MIN(ts_utc) OVER (PARTITION BY decision_id) AS first_ts,
+           COUNT(*) OVER (PARTITION BY decision_id) AS n
+    FROM decision_logs WHERE COALESCE(overridden, 0) = 1
+)
+INSERT OR IGNORE INTO review_resolutions
+    (decision_id, base_ts_utc, first_override_ts, last_override_ts, override_count,
+     second_approval, resolved_by, queue_minutes)
+SELECT b.decision_id, b.ts_utc, o.first_ts, o.ts_utc, COALESCE(o.n, 0), o.second_approval, o.actor_ux,
+       ROUND((julianday(o.ts_utc) - julianday(b.ts_utc)) * 86400.0, 3) / 60.0
+FROM decision_logs AS b
+LEFT JOIN ovr AS o ON o.decision_id = b.decision_id AND o.rn = 1
+WHERE COALESCE(b.overridden, 0) = 0 AND b.decision = 'REVIEW'
+ORDER BY b.id
+"""
+
+
+def has_resolutions(con) -> bool:
+    row = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_resolutions'").fetchone()
+    return row is not None
+
+
+def ensure_resolutions(con) -> None:
+    """Create the table and its indexes; a new table is backfilled from decision_logs."""
+    created = not has_resolutions(con)
+    for ddl in RESOLUTION_DDL:
+        con.execute(ddl)
+    if created:
+        con.execute(_BACKFILL_SQL)
+
+
+def _age_minutes(ts_utc: str, now: datetime) -> float:
+    ts = datetime.fromisoformat(ts_utc.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return round((now - ts).total_seconds() / 60.0, 3)
+
+
+def review_sla(con, now: datetime | None = None, q: float = SLA_QUANTILE) -> dict:
+    """Queue time mean/quantile of resolved REVIEW cases, open count and the oldest open case.
+
+    The quantile interpolates linearly between order statistics (as pandas);
+    the ``oldest_open`` age is measured against ``now`` (UTC).
+    """
+    now = now or datetime.now(timezone.utc)
+    n, mean = con.execute(
+        "SELECT COUNT(*), AVG(queue_minutes) FROM review_resolutions WHERE queue_minutes IS NOT NULL"
+    ).fetchone()
+    p95 = None
+    if n:
+        pos = q * (n - 1)
+        bounds = [r[0] for r in con.execute(
+            "SELECT queue_minutes FROM review_resolutions WHERE queue_minutes IS NOT NULL"
+            " ORDER BY queue_minutes LIMIT 2 OFFSET ?", (int(pos),)
+        )]
+        lo = bounds[0]
+        hi = bounds[1] if len(bounds) > 1 else lo
+        p95 = lo + (hi - lo) * (pos - int(pos))
+    (open_cnt,) = con.execute("SELECT COUNT(*) FROM review_resolutions WHERE last_override_ts IS NULL").fetchone()
+    oldest = con.execute(
+        "SELECT decision_id, base_ts_utc FROM review_resolutions WHERE last_override_ts IS NULL"
+        " ORDER BY base_ts_utc LIMIT 1"
+    ).fetchone()
+    return {
+        "resolved": n,
+        "queue_mean_min": float(mean) if n else None,
+        "queue_p95_min": float(p95) if n else None,
+        "open": open_cnt,
+        "oldest_open": {
+            "decision_id": oldest[0],
+            "base_ts_utc": oldest[1],
+            "age_min": _age_minutes(oldest[1], now),
+        } if oldest else None,
+    }
@@ -0,0 +1,73 @@
+"""Backend maintenance of the KPI rollups (kpi_rollups.py).
+
+Started from the app's startup hook (db.start_rollup_worker), never at import,
+so tools and tests importing ``db`` do not spawn a writer. The chain appender
+then calls ``notify()`` after each committed group; a daemon
+thread then folds the new rows into the rollup tables with ``catch_up`` and
+sleeps ``ROLLUP_INTERVAL_S`` before the next run, so a burst of groups costs
+one catch-up. Each catch-up transaction covers at most ``ROLLUP_BATCH_ROWS``
+ids, which keeps the write lock short next to the appender. Readers (oversight
+UI, ``compute_metrics --source rollup``) only read the tables.
+
+``ROLLUP_INTERVAL_S=0`` turns the worker off, e.g. when ``tools/rollups.py``
+runs as a scheduled job instead.
+"""
+import os
+import threading
+import time
+
+from kpi_rollups import catch_up, open_db
+from metrics import DB_ERRORS
+
+ROLLUP_INTERVAL_S = float(os.getenv("ROLLUP_INTERVAL_S", "1"))  # pause between catch-ups, 0 = off
+ROLLUP_BATCH_ROWS = int(os.getenv("ROLLUP_BATCH_ROWS", "2000"))  # ids per catch-up transaction
+
+
+class RollupWorker:
+    def __init__(self, db_path: str | None, interval_s: float = ROLLUP_INTERVAL_S,
+                 batch_rows: int = ROLLUP_BATCH_ROWS):
+        self.db_path = db_path
+        self.interval_s = interval_s
+        self.batch_rows = max(1, batch_rows)
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.db_path) and self.interval_s > 0
+
+    def notify(self) -> None:
+        """Request a catch-up (never blocks; runs on the worker thread)."""
+        if not self.enabled:
+            return
+        self._ensure_started()
+        self._wake.set()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="kpi-rollup-worker", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        con = None
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                if con is None:
+                    con = open_db(self.db_path)
+                catch_up(con, self.batch_rows)
+            except Exception:
+                DB_ERRORS.labels("rollup").inc()
+                if con is not None:
+                    con.close()
+                    con = None
+            # rows committed meanwhile have set the event again and are folded in on the next run
+            time.sleep(self.interval_s)
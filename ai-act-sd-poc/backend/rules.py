@@ -1,8 +1,18 @@
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+try:  # optional: vectorised evaluation for replay/batch jobs
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
 
 RULE_VERSION = "rules_v1.2"
 
+# Schwellenregime (identisch für Einzel- und Batch-Pfad)
+THRESHOLDS = {"allow_max": 59, "review_range": [60, 79], "block_min": 80}
+
 def score_and_decision(req) -> Tuple[int, str, str]:
+    # Referenzimplementierung; der kompilierte Regelsatz wird dagegen geprüft
     # einfache Scoring-Heuristik (0..100)
     score = 50
     if req.overdue_ratio >= 0.25: score += 20
@@ -28,3 +38,139 @@ def score_and_decision(req) -> Tuple[int, str, str]:
             decision, rationale = "REVIEW", "DSO near/over target or history flag"
 
     return score, decision, rationale
+
+
+# --- Kompilierter Regelsatz -------------------------------------------------
+# Jede Regel ist ein boolesches Prädikat mit festem additiven Gewicht:
+# (Feld, Operator, Vergleichswert, Gewicht). Bit i der Prädikatmaske steht für
+# Regel i; das letzte Bit ist die DSO-Zusatzbedingung (Gewicht 0).
+_BASE_SCORE = 50
+_RULESETS = {
+    "rules_v1.2": {
+        "predicates": (
+            ("overdue_ratio", ">=", 0.25, 20),
+            ("order_value_eur", ">=", 50000, 15),
+            ("risk_class", "in", ("C", "D"), 10),
+            ("country_risk", ">=", 4, 10),
+            ("is_new_customer", "true", None, 5),
+            ("past_limit_breach", "true", None, 15),
+            ("incoterm", "==", "EXW", 5),
+        ),
+        "thresholds": THRESHOLDS,
+    },
+}
+
+
+def _predicate_hit(value, op, operand) -> bool:
+    if op == ">=":
+        return value >= operand
+    if op == "in":
+        return value in operand
+    if op == "==":
+        return value == operand
+    return bool(value)
+
+
+class CompiledRules:
+    """Lookup-table form of a rule version.
+
+    ``scores``, ``decisions`` and ``rationales`` are indexed by the predicate
+    bitmask, so evaluation is one mask computation plus a table lookup.
+    """
+
+    def __init__(self, rule_version: str):
+        spec = _RULESETS[rule_version]
+        self.rule_version = rule_version
+        self.predicates = spec["predicates"]
+        self.thresholds = spec["thresholds"]
+        self.breach_bit = next(i for i, p in enumerate(self.predicates) if p[0] == "past_limit_breach")
+        self.dso_bit = len(self.predicates)
+        size = 1 << (self.dso_bit + 1)
+        scores, decisions, rationales = [], [], []
+        for mask in range(size):
+            score, decision, rationale = self._evaluate_mask(mask)
+            scores.append(score)
+            decisions.append(decision)
+            rationales.append(rationale)
+        self.scores = tuple(scores)
+        self.decisions = tuple(decisions)
+        self.rationales = tuple(rationales)
+        if np is not None:
+            self._np_scores = np.asarray(scores, dtype=np.int64)
+            self._np_decisions = np.asarray(decisions, dtype=object)
+            self._np_rationales = np.asarray(rationales, dtype=object)
+
+    def _evaluate_mask(self, mask: int) -> Tuple[int, str, str]:
+        score = _BASE_SCORE + sum(p[3] for i, p in enumerate(self.predicates) if mask >> i & 1)
+        th = self.thresholds
+        if score >= th["block_min"]:
+            return score, "BLOCK", "High risk: overdue/amount/risk signals"
+        if th["review_range"][0] <= score <= th["review_range"][1]:
+            return score, "REVIEW", "Medium risk: manual check required"
+        if mask >> self.dso_bit & 1 and not mask >> self.breach_bit & 1:
+            return score, "ALLOW", "Low risk within terms"
+        return score, "REVIEW", "DSO near/over target or history flag"
+
+    def mask(self, req) -> int:
+        mask = 0
+        for i, (field, op, operand, _) in enumerate(self.predicates):
+            if _predicate_hit(getattr(req, field), op, operand):
+                mask |= 1 << i
+        if req.dso_proxy_days <= req.payment_terms_days + 10:
+            mask |= 1 << self.dso_bit
+        return mask
+
+    def evaluate(self, req) -> Tuple[int, str, str]:
+        m = self.mask(req)
+        return self.scores[m], self.decisions[m], self.rationales[m]
+
+    def masks_from_columns(self, columns: Dict[str, Sequence]):
+        """Vectorised predicate masks for column arrays (requires NumPy)."""
+        if np is None:
+            raise RuntimeError("numpy is required for array evaluation")
+        n = len(columns["dso_proxy_days"])
+        masks = np.zeros(n, dtype=np.int64)
+        for i, (field, op, operand, _) in enumerate(self.predicates):
+            col = np.asarray(columns[field])
+            if op == ">=":
+                hit = col >= operand
+            elif op == "in":
+                hit = np.isin(col, operand)
+            elif op == "==":
+                hit = col == operand
+            else:
+                hit = col.astype(bool)
+            masks |= hit.astype(np.int64) << i
+        dso_ok = np.asarray(columns["dso_proxy_days"]) <= np.asarray(columns["payment_terms_days"]) + 10
+        masks |= dso_ok.astype(np.int64) << self.dso_bit
+        return masks
+
+    def evaluate_columns(self, columns: Dict[str, Sequence]):
+        """Score whole arrays at once; returns (scores, decisions, rationales) arrays."""
+        masks = self.masks_from_columns(columns)
+        return self._np_scores[masks], self._np_decisions[masks], self._np_rationales[masks]
+
+    def column_fields(self) -> Tuple[str, ...]:
+        return tuple(p[0] for p in self.predicates) + ("dso_proxy_days", "payment_terms_days")
+
+
+@lru_cache(maxsize=None)
+def compile_rules(rule_version: str = RULE_VERSION) -> CompiledRules:
+    return CompiledRules(rule_version)
+
+
+def score_and_decision_batch(reqs: Sequence) -> List[Tuple[int, str, str]]:
+    """Score many requests via the compiled table; results match ``score_and_decision``.
+
+    With NumPy available the predicates are evaluated column-wise over the
+    whole batch, otherwise per request against the lookup table. Results are
+    returned in input order.
+    """
+    if not reqs:
+        return []
+    compiled = compile_rules(RULE_VERSION)
+    if np is None:
+        return [compiled.evaluate(r) for r in reqs]
+    columns = {f: [getattr(r, f) for r in reqs] for f in compiled.column_fields()}
+    masks = compiled.masks_from_columns(columns).tolist()
+    return [(compiled.scores[m], compiled.decisions[m], compiled.rationales[m]) for m in masks]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 class CreditRequest(BaseModel):
@@ -28,3 +28,9 @@ class CreditResponse(BaseModel):
     policy_rationale: str
     timestamp_utc: str
     service_version: str = "svc1.0.0"
+
+class CreditBatchRequest(BaseModel):
+    requests: List[CreditRequest] = Field(min_length=1)
+
+class CreditBatchResponse(BaseModel):
+    decisions: List[CreditResponse]
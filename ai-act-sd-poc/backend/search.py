@@ -0,0 +1,103 @@
+"""Search index over decision_logs (SQLite FTS5 with the trigram tokenizer).
+
+``decision_search`` is an external-content FTS5 table over order_id,
+customer_id and override_reason: it holds only the trigram index, the text
+stays in decision_logs. The log is append-only, so a single AFTER INSERT
+trigger keeps the index current. Trigram phrases match case-insensitive
+substrings (and therefore prefixes) through index lookups, so search cost
+grows with the number of hits, not with the size of the log.
+
+Terms shorter than three characters cannot be split into trigrams and fall
+back to a LIKE scan, as do databases whose SQLite lacks FTS5/trigram (< 3.34).
+
+Shared by the backend (``search``), the oversight UI and the tools
+(``backend.search``); only a DB-API connection to the SQLite file is needed.
+"""
+import sqlite3
+
+SEARCH_TABLE = "decision_search"
+SEARCH_COLUMNS = ("order_id", "customer_id", "override_reason")
+SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+TRIGRAM_MIN_CHARS = 3
+
+SEARCH_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+      order_id, customer_id, override_reason,
+      content='decision_logs', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS decision_search_insert AFTER INSERT ON decision_logs BEGIN
+      INSERT INTO {SEARCH_TABLE}(rowid, order_id, customer_id, override_reason)
+      VALUES (new.id, new.order_id, new.customer_id, new.override_reason);
+    END
+    """,
+)
+
+# Ranked by match quality (exact order/customer id, prefix, any substring incl.
+# override_reason), then newest first; overrides share the decision_id of their base row
+_SEARCH_SQL = """
+SELECT decision_id,
+       MIN(CASE
+             WHEN lower(order_id) = :search_exact OR lower(customer_id) = :search_exact THEN 0
+             WHEN order_id LIKE :search_prefix ESCAPE '\\' OR customer_id LIKE :search_prefix ESCAPE '\\' THEN 1
+             ELSE 2
+           END) AS tier,
+       MAX(id) AS last_id
+FROM decision_logs
+WHERE id IN ({match})
+GROUP BY decision_id
+ORDER BY tier, last_id DESC
+LIMIT :search_limit
+"""
+
+
+def has_search_index(con) -> bool:
+    row = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (SEARCH_TABLE,)).fetchone()
+    return row is not None
+
+
+def ensure_search_index(con) -> bool:
+    """Create the index and its trigger, indexing existing rows once; False without FTS5 trigram support."""
+    if has_search_index(con):
+        return True
+    try:
+        for ddl in SEARCH_DDL:
+            con.execute(ddl)
+    except sqlite3.OperationalError:
+        return False
+    con.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def match_sql(term: str, indexed: bool = True) -> tuple:
+    """SELECT of the decision_logs ids whose order_id, customer_id or override_reason contain ``term``.
+
+    Returns the SQL and its named parameters (usable with sqlite3 and SQLAlchemy ``text``).
+    """
+    term = (term or "").strip()
+    if indexed and len(term) >= TRIGRAM_MIN_CHARS:
+        phrase = '"' + term.replace('"', '""') + '"'
+        return f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :search_q", {"search_q": phrase}
+    like = " OR ".join(f"{col} LIKE :search_like ESCAPE '\\'" for col in SEARCH_COLUMNS)
+    return f"SELECT id FROM decision_logs WHERE {like}", {"search_like": f"%{_escape_like(term)}%"}
+
+
+def search(con, term: str, limit: int = SEARCH_LIMIT) -> list:
+    """Ranked decision_ids of the cases matching ``term`` (substring, case-insensitive)."""
+    term = (term or "").strip()
+    if not term:
+        return []
+    match, params = match_sql(term, has_search_index(con))
+    params.update({
+        "search_exact": term.lower(),
+        "search_prefix": f"{_escape_like(term)}%",
+        "search_limit": max(1, min(int(limit), MAX_SEARCH_LIMIT)),
+    })
+    return [row[0] for row in con.execute(_SEARCH_SQL.format(match=match), params).fetchall()]
@@ -0,0 +1,115 @@
+"""Mergeable streaming accumulators for compute_metrics and the KPI rollups (stdlib only).
+
+QuantileSketch is a DDSketch-style log histogram: a value x > 0 lands in bucket
+ceil(log_gamma(x)) with gamma = (1 + a) / (1 - a), so every quantile is
+returned with relative error <= a (default 1 %). Memory depends on the value
+range, not on the number of values (about 1000 buckets for 1 us .. 1000 s at
+1 %), and two sketches with the same accuracy merge by adding bucket counts,
+so shards can be summarized in worker processes and combined afterwards.
+A negative weight removes a value again (rollups replace a case's queue time
+when a later override arrives); min/max then stay valid outer bounds.
+"""
+from __future__ import annotations
+
+import math
+
+MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    __slots__ = ("alpha", "gamma", "_log_gamma", "buckets", "zero_count", "count", "total", "min", "max")
+
+    def __init__(self, alpha: float = 0.01):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be in (0, 1)")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: int = 1) -> None:
+        if value > MIN_INDEXABLE:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            n = self.buckets.get(key, 0) + weight
+            if n:
+                self.buckets[key] = n
+            else:
+                self.buckets.pop(key, None)
+        else:
+            # latencies are non-negative; treat tiny/negative values as zero
+            self.zero_count += weight
+        self.count += weight
+        self.total += value * weight
+        if weight > 0:
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.alpha != self.alpha:
+            raise ValueError("cannot merge sketches with different accuracy")
+        for key, n in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def value_at_rank(self, rank: int) -> float | None:
+        """Approximate value of the ``rank``-th smallest element (0-based)."""
+        if self.count == 0:
+            return None
+        rank = max(0, min(rank, self.count - 1))
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2.0 * self.gamma ** key / (self.gamma + 1.0)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def quantile(self, q: float, interpolation: str = "lower") -> float | None:
+        """Lower nearest-rank quantile, i.e. ``sorted(values)[int(q * (n - 1))]`` within ``alpha``.
+
+        ``interpolation="linear"`` interpolates between the neighbouring ranks like pandas/numpy.
+        """
+        if self.count == 0:
+            return None
+        pos = q * (self.count - 1)
+        lo = self.value_at_rank(int(pos))
+        if interpolation == "lower" or pos == int(pos):
+            return lo
+        hi = self.value_at_rank(int(pos) + 1)
+        return lo + (hi - lo) * (pos - int(pos))
+
+    def to_dict(self) -> dict:
+        return {
+            "alpha": self.alpha, "zero": self.zero_count, "count": self.count, "total": self.total,
+            "min": self.min if self.count else None, "max": self.max if self.count else None,
+            "buckets": {str(k): n for k, n in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data.get("alpha", 0.01))
+        sketch.buckets = {int(k): n for k, n in data.get("buckets", {}).items()}
+        sketch.zero_count = data.get("zero", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        if data.get("min") is not None:
+            sketch.min = data["min"]
+        if data.get("max") is not None:
+            sketch.max = data["max"]
+        return sketch
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,58 @@
+"""Client for the backend read API (``GET /v1/credit/decisions[/{decision_id}]``).
+
+Used by the oversight UI with ``UI_DATA_SOURCE=api``, when it runs without
+access to the SQLite file. Responses are kept per URL with their ETag and
+revalidated with ``If-None-Match``, so an unchanged page costs a 304;
+requests decompresses the gzip responses transparently.
+"""
+import requests
+
+ETAG_CACHE_SIZE = 256
+
+
+class DecisionsClient:
+	def __init__(self, backend_url: str, token: str, timeout: float = 10.0):
+		self.base = backend_url.rstrip("/")
+		self.timeout = timeout
+		self.session = requests.Session()
+		self.session.headers.update({"X-Auth-Token": token, "Accept-Encoding": "gzip"})
+		self._cache = {}  # (path, params) -> (etag, payload)
+
+	def _get(self, path: str, params: dict):
+		params = {k: v for k, v in params.items() if v not in (None, "", [])}
+		key = (path, tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in params.items())))
+		cached = self._cache.get(key)
+		headers = {"If-None-Match": cached[0]} if cached else {}
+		resp = self.session.get(f"{self.base}{path}", params=params, headers=headers, timeout=self.timeout)
+		if resp.status_code == 304 and cached:
+			return cached[1]
+		if resp.status_code == 404:
+			return None
+		resp.raise_for_status()
+		payload = resp.json()
+		etag = resp.headers.get("ETag")
+		if etag:
+			self._cache.pop(key, None)
+			self._cache[key] = (etag, payload)
+			while len(self._cache) > ETAG_CACHE_SIZE:
+				self._cache.pop(next(iter(self._cache)))
+		return payload
+
+	def list(self, *, decisions=None, ts_from=None, ts_to=None, overridden=None, order_prefix=None,
+			customer_prefix=None, fields=None, limit=100, cursor=None) -> dict:
+		"""One page (``items``, ``next_cursor``), newest first; ts_to is exclusive."""
+		return self._get("/v1/credit/decisions", {
+			"decision": list(decisions or []),
+			"from": ts_from,
+			"to": ts_to,
+			"overridden": overridden,
+			"order_prefix": order_prefix,
+			"customer_prefix": customer_prefix,
+			"fields": ",".join(fields) if fields else None,
+			"limit": limit,
+			"cursor": cursor,
+		})
+
+	def get(self, decision_id: str) -> dict | None:
+		"""Base decision with ``request``, ``thresholds`` and ``overrides``; None if unknown."""
+		return self._get(f"/v1/credit/decisions/{decision_id}", {})
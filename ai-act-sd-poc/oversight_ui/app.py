@@ -2,13 +2,15 @@ import json
 import os
 import sqlite3
 import sys
+from contextlib import closing
+from datetime import date, timedelta
 from pathlib import Path
 
 import altair as alt
 import pandas as pd
 import requests
 import streamlit as st
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -20,6 +22,16 @@ from tools.classifier_metrics import (
 	compute_classifier_metrics,
 	load_classifier_csv,
 )
+from tools.governance_metrics import connect as connect_readonly, empty_overview, governance_overview
+from tools.rollups import rollup_overview, timeline as rollup_timeline
+from oversight_ui.log_cache import DecisionLogFrame
+from oversight_ui.live_feed import LIVE_CHECK_S, DecisionFeed
+from oversight_ui.api_client import DecisionsClient
+from oversight_ui.audit_snapshot import load_snapshot, snapshot_key
+from oversight_ui.queue_sql import QUEUE_COLUMNS, page_sql, queue_filter_sql, summary_sql
+from backend.search import has_search_index, match_sql
+from backend.resolutions import has_resolutions, review_sla
+from backend.kpi_rollups import has_rollups, rollup_lag
 
 
 def _has_table(db_path: Path, table: str) -> bool:
@@ -53,56 +65,335 @@ def _resolve_db_path() -> Path:
 	return candidates[0]
 
 
-def _compute_governance_overview(log_df: pd.DataFrame) -> dict:
-	if log_df.empty:
-		return {
-			"mix_counts": {},
-			"mix_pct": {},
-			"base_total": 0,
-			"override_pct": 0.0,
-			"four_eyes_pct": 0.0,
-			"queue_mean_min": None,
-			"queue_p95_min": None,
-		}
-
-	work = log_df.copy()
-	work["overridden_flag"] = work["overridden"].fillna(0).astype(int)
-	base = work[work["overridden_flag"] == 0]
-	total_base = len(base)
-	mix_counts = base["decision"].value_counts().to_dict()
-	mix_pct = {k: (v / total_base * 100.0) if total_base else 0.0 for k, v in mix_counts.items()}
-	overrides = work[work["overridden_flag"] == 1]
-	override_pct = (len(overrides) / total_base * 100.0) if total_base else 0.0
-	four_eyes_pct = (
-		overrides["second_approval"].fillna(0).astype(int).mean() * 100.0
-		if not overrides.empty
-		else 0.0
+PAGE_SIZES = (25, 50, 100, 250, 500)
+ROLLUP_MAX_LAG_S = float(os.getenv("UI_ROLLUP_MAX_LAG_S", "30"))  # older pending rollups: direct SQL
+
+
+def _db_file_key(db_path: Path) -> tuple:
+	# a replaced DB file gets a new engine (pooled connections would keep reading the old inode)
+	try:
+		stat = db_path.stat()
+	except OSError:
+		return ()
+	return (stat.st_dev, stat.st_ino)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_engine(db_path: str, file_key: tuple):
+	return create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+
+
+@st.cache_resource(show_spinner=False)
+def _get_log_frame(db_path: str) -> DecisionLogFrame:
+	return DecisionLogFrame(db_path)
+
+
+@st.cache_resource(show_spinner="Audit-Snapshot wird aufbereitet …", max_entries=2)
+def _get_audit_snapshot(csv_path: str, file_key: tuple):
+	# file_key (size, mtime, footer SHA-256) changes with every new export
+	return load_snapshot(csv_path, file_key)
+
+
+def _search_row_ids(db_path: Path, search_text: str, indexed: bool) -> set:
+	"""Row ids matching the sidebar search (trigram index, see backend/search.py)."""
+	sql, params = match_sql(search_text, indexed)
+	with closing(connect_readonly(db_path)) as con:
+		return {row[0] for row in con.execute(sql, params)}
+
+
+def _get_feed(backend_url: str, token: str, db_path: str) -> DecisionFeed:
+	"""The session's change feed; a feed for another token, backend or DB file is stopped and replaced.
+
+	A feed that ended idle is restarted; one whose token was rejected stays stopped.
+	"""
+	log_frame = _get_log_frame(db_path)
+	feed = st.session_state.get("live_feed")
+	if (
+		feed is not None
+		and (feed.token, feed.url, feed.log_frame) == (token, DecisionFeed.stream_url(backend_url), log_frame)
+		and (not feed.stopped or feed.rejected)
+	):
+		return feed
+	_stop_feed()
+	st.session_state.pop("live_version", None)
+	feed = st.session_state["live_feed"] = DecisionFeed(backend_url, token, log_frame)
+	return feed
+
+
+def _stop_feed() -> None:
+	feed = st.session_state.pop("live_feed", None)
+	if feed is not None:
+		feed.stop()
+
+
+@st.fragment(run_every=LIVE_CHECK_S)
+def _live_updates(feed: DecisionFeed) -> None:
+	# rerun the page only when the change feed delivered rows (already merged into the shared frame)
+	feed.touch()
+	seen = st.session_state.setdefault("live_version", feed.version)
+	if feed.version != seen:
+		st.session_state["live_version"] = feed.version
+		st.rerun()
+	if feed.connected:
+		st.caption("🟢 Live-Feed verbunden")
+	else:
+		st.caption(f"⚪ Live-Feed getrennt{': ' + feed.error if feed.error else ''}")
+
+
+def _filter_frame(frame: pd.DataFrame, review_only: bool, decisions: list, search_ids: set | None, date_from, date_to) -> pd.DataFrame:
+	"""Same semantics as queue_filter_sql (search hits as row ids; whole UTC days)."""
+	mask = pd.Series(True, index=frame.index)
+	if review_only:
+		mask &= frame["decision"] == "REVIEW"
+	if decisions:
+		mask &= frame["decision"].isin(decisions)
+	if search_ids is not None:
+		mask &= frame["id"].isin(search_ids)
+	if date_from and date_to:
+		start = pd.Timestamp(date_from, tz="UTC")
+		end = pd.Timestamp(date_to, tz="UTC") + pd.Timedelta(days=1)
+		mask &= (frame["ts_utc"] >= start) & (frame["ts_utc"] < end)
+	return frame[mask]
+
+
+def _frame_summary(frame: pd.DataFrame) -> dict:
+	return {
+		"total": int(len(frame)),
+		"review_open": int((frame["decision"] == "REVIEW").sum()),
+		"override_cnt": int(frame["overridden"].fillna(0).astype(int).sum()),
+		"latest": frame["ts_utc"].max() if len(frame) else None,
+	}
+
+
+def _read_sql(engine, sql: str, params: dict | None = None) -> pd.DataFrame:
+	return pd.read_sql(text(sql), engine, params=params or {})
+
+
+def _queue_summary(engine, where: str, params: dict) -> dict:
+	row = _read_sql(engine, summary_sql(where), params).iloc[0]
+	return {
+		"total": int(row["total"]),
+		"review_open": int(row["review_open"]),
+		"override_cnt": int(row["override_cnt"]),
+		"latest": row["latest"],
+	}
+
+
+def _queue_page(engine, where: str, params: dict, limit: int, offset: int) -> pd.DataFrame:
+	page = _read_sql(engine, page_sql(where), {**params, "limit": limit, "offset": offset})
+	page["ts_utc"] = pd.to_datetime(page["ts_utc"], utc=True, errors="coerce")
+	return page
+
+
+def _fetch_case(engine, case_id: int):
+	case = _read_sql(
+		engine,
+		f"SELECT {QUEUE_COLUMNS}, thresholds_json, input_json FROM decision_logs WHERE id = :id",
+		{"id": case_id},
 	)
-	review_base = base[base["decision"] == "REVIEW"].rename(columns={"ts_utc": "ts_base"})
-	queue_mean_min = None
-	queue_p95_min = None
-	if not review_base.empty and not overrides.empty:
-		override_times = (
-			overrides.sort_values("ts_utc")
-			.drop_duplicates("decision_id", keep="last")
-			.rename(columns={"ts_utc": "ts_override"})[["decision_id", "ts_override"]]
+	if case.empty:
+		return None
+	case["ts_utc"] = pd.to_datetime(case["ts_utc"], utc=True, errors="coerce")
+	return case.iloc[0]
+
+
+def _rollups_ready(db_path: Path) -> bool:
+	"""True if the KPI rollups kept by the backend are current; the UI only reads them.
+
+	Missing or stalled rollups (no catch-up for ROLLUP_MAX_LAG_S while rows are
+	pending) fall back to direct aggregate SQL.
+	"""
+	try:
+		with closing(connect_readonly(db_path)) as con:
+			if not has_rollups(con):
+				return False
+			pending, updated_utc = rollup_lag(con)
+	except Exception:
+		return False
+	if not pending:
+		return True
+	updated = pd.to_datetime(updated_utc, utc=True, errors="coerce")
+	return pd.notna(updated) and (pd.Timestamp.now(tz="UTC") - updated).total_seconds() <= ROLLUP_MAX_LAG_S
+
+
+def _render_override_form(detail_row, input_obj: dict, selected_id, auth: dict) -> None:
+	"""Override workflow for an open REVIEW base case (DB row or read-API case)."""
+	base_review = (
+		detail_row.get("decision") == "REVIEW"
+		and int(detail_row.get("overridden") or 0) == 0
+	)
+	if base_review:
+		order_value = float(input_obj.get("order_value_eur", 0) or 0)
+		country_risk = float(input_obj.get("country_risk", 0) or 0)
+		needs_four_eyes = order_value >= 50000 or country_risk >= 4
+		if needs_four_eyes:
+			st.warning("Vier-Augen erforderlich (order_value_eur ≥ 50000 oder country_risk ≥ 4)")
+		decision_key = f"override_decision_{selected_id}"
+		reason_key = f"override_reason_{selected_id}"
+		new_decision = st.radio(
+			"Neue Entscheidung",
+			options=("ALLOW", "BLOCK"),
+			horizontal=True,
+			key=decision_key,
+		)
+		override_reason = st.text_area(
+			"Begründung (Pflicht, ≥15 Zeichen)",
+			key=reason_key,
+			height=120,
 		)
-		merged = review_base.merge(override_times, on="decision_id", how="left")
-		merged = merged.dropna(subset=["ts_override"])
-		if not merged.empty:
-			durations = (merged["ts_override"] - merged["ts_base"]).dt.total_seconds() / 60.0
-			queue_mean_min = float(durations.mean())
-			queue_p95_min = float(durations.quantile(0.95))
+		need_admin = needs_four_eyes and auth.get("role") == "reviewer"
+		if need_admin:
+			st.error("Admin benötigt für Vier-Augen-Fälle.")
+		btn_disabled = len(override_reason.strip()) < 15 or need_admin
+		if st.button(
+			"Override speichern",
+			type="primary",
+			use_container_width=True,
+			disabled=btn_disabled,
+			key=f"override_submit_{selected_id}",
+		):
+			payload = {
+				"decision_id": detail_row.get("decision_id"),
+				"new_decision": new_decision,
+				"override_reason": override_reason.strip(),
+			}
+			backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+			headers = {"X-Auth-Token": auth.get("token")}
+			try:
+				resp = requests.post(
+					f"{backend_url}/v1/credit/override",
+					json=payload,
+					headers=headers,
+					timeout=10,
+				)
+			except Exception as exc:
+				st.error(f"Request fehlgeschlagen: {exc}")
+			else:
+				if resp.status_code == 200:
+					st.success("Override gespeichert – Dashboard wird aktualisiert.")
+					st.session_state.pop(reason_key, None)
+					st.session_state.pop(decision_key, None)
+					st.experimental_rerun()
+				elif resp.status_code in (400, 403, 404, 409):
+					content_type = resp.headers.get("content-type", "")
+					if content_type.startswith("application/json"):
+						detail_msg = resp.json().get("detail", resp.text)
+					else:
+						detail_msg = resp.text
+					st.error(f"Fehler {resp.status_code}: {detail_msg}")
+				else:
+					st.error(f"Fehler {resp.status_code}: {resp.text}")
+	else:
+		st.info("Overrides sind nur für offene REVIEW-Basisfälle möglich.")
 
-	return {
-		"mix_counts": mix_counts,
-		"mix_pct": mix_pct,
-		"base_total": total_base,
-		"override_pct": override_pct,
-		"four_eyes_pct": four_eyes_pct,
-		"queue_mean_min": queue_mean_min,
-		"queue_p95_min": queue_p95_min,
+
+API_FIELDS = (
+	"id", "decision_id", "ts_utc", "order_id", "customer_id", "score", "decision", "overridden",
+	"second_approval", "rule_version", "data_version",
+)
+UI_DATA_SOURCE = os.getenv("UI_DATA_SOURCE", "db").strip().lower()  # "api": read API instead of the SQLite file
+
+
+@st.cache_resource(show_spinner=False)
+def _get_api_client(backend_url: str, token: str) -> DecisionsClient:
+	return DecisionsClient(backend_url, token)
+
+
+def _render_api_queue(client: DecisionsClient, auth: dict) -> None:
+	"""Review Queue over the backend read API (keyset pages, ETag revalidation); no SQLite access."""
+	st.caption(f"Datenquelle: Read-API {client.base} | User: {auth.get('user')} ({auth.get('role')})")
+	st.sidebar.header("Filter")
+	review_only = st.sidebar.toggle("Nur REVIEW-Fälle", value=True, key="filter_review")
+	decision_filter = st.sidebar.multiselect(
+		"Entscheidungen", ["ALLOW", "REVIEW", "BLOCK"], default=["ALLOW", "REVIEW", "BLOCK"], key="filter_decisions"
+	)
+	order_prefix = st.sidebar.text_input("Order ID beginnt mit", key="filter_order_prefix").strip()
+	customer_prefix = st.sidebar.text_input("Kunde beginnt mit", key="filter_customer_prefix").strip()
+	override_mode = st.sidebar.selectbox("Overrides", ("Alle", "Nur Basisfälle", "Nur Overrides"), key="filter_overridden")
+	date_from = date_to = None
+	if st.sidebar.checkbox("Zeitraum filtern", key="filter_use_date"):
+		range_value = st.sidebar.date_input(
+			"Zeitraum", value=(date.today() - timedelta(days=30), date.today()), key="filter_date"
+		)
+		if isinstance(range_value, (list, tuple)) and len(range_value) == 2:
+			date_from, date_to = range_value
+		elif range_value:
+			date_from = date_to = range_value
+
+	decisions = list(decision_filter)
+	if review_only:
+		decisions = [d for d in decisions if d == "REVIEW"] if decisions else ["REVIEW"]
+		if not decisions:
+			st.info("Keine Einträge für die aktuellen Filter.")
+			return
+	query = {
+		"decisions": decisions,
+		"ts_from": date_from.isoformat() if date_from else None,
+		"ts_to": (date_to + timedelta(days=1)).isoformat() if date_to else None,
+		"overridden": {"Nur Basisfälle": 0, "Nur Overrides": 1}.get(override_mode),
+		"order_prefix": order_prefix or None,
+		"customer_prefix": customer_prefix or None,
 	}
+	page_size = st.selectbox("Zeilen pro Seite", PAGE_SIZES, index=1, key="queue_page_size")
+	# keyset paging: stack of cursors, reset whenever the filters change
+	query_key = (repr(sorted(query.items())), page_size)
+	if st.session_state.get("api_query") != query_key:
+		st.session_state["api_query"] = query_key
+		st.session_state["api_cursors"] = [None]
+	cursors = st.session_state["api_cursors"]
+	try:
+		page = client.list(**query, fields=API_FIELDS, limit=page_size, cursor=cursors[-1])
+	except requests.RequestException as exc:
+		st.error(f"Read-API nicht erreichbar: {exc}")
+		return
+
+	st.markdown("### Arbeitsliste")
+	nav = st.columns([1, 1, 4])
+	if nav[0].button("◀ Zurück", disabled=len(cursors) == 1, key="api_prev"):
+		cursors.pop()
+		st.rerun()
+	if nav[1].button("Weiter ▶", disabled=not page["next_cursor"], key="api_next"):
+		cursors.append(page["next_cursor"])
+		st.rerun()
+	nav[2].caption(f"Seite {len(cursors)} · {len(page['items'])} Einträge")
+
+	page_df = pd.DataFrame(page["items"], columns=list(API_FIELDS))
+	table_col, detail_col = st.columns([3, 2], gap="large")
+	with table_col:
+		table_df = page_df.drop(columns=["id", "decision_id"])
+		if not table_df.empty:
+			table_df["ts_utc"] = pd.to_datetime(table_df["ts_utc"], utc=True, errors="coerce").dt.strftime("%Y-%m-%d %H:%M")
+		st.dataframe(table_df, use_container_width=True, height=420)
+	with detail_col:
+		st.caption("Details & Override-Workflow")
+		if page_df.empty:
+			st.info("Keine Einträge für die aktuellen Filter.")
+			return
+		decision_id = st.selectbox(
+			"Fall auswählen", page_df["decision_id"].drop_duplicates().tolist(), key="api_selected_case"
+		)
+		try:
+			case = client.get(decision_id)
+		except requests.RequestException as exc:
+			st.error(f"Fall konnte nicht geladen werden: {exc}")
+			return
+		if case is None:
+			st.warning("Fall nicht gefunden.")
+			return
+		st.markdown(
+			f"**decision_id:** `{case.get('decision_id')}`  "
+			f"**Entscheidung:** {case.get('decision')} (Score: {case.get('score')})"
+		)
+		st.markdown(f"**Zeitpunkt (UTC):** {case.get('ts_utc')}  |  **Overrides:** {len(case.get('overrides') or [])}")
+		if case.get("overrides"):
+			st.dataframe(
+				pd.DataFrame(case["overrides"])[["ts_utc", "decision", "actor_ux", "second_approval", "override_reason"]],
+				use_container_width=True,
+			)
+		_render_override_form(case, case.get("request") or {}, case.get("id"), auth)
+		with st.expander("Request Body & Thresholds"):
+			st.json(case.get("request") or {})
+			st.json(case.get("thresholds") or {})
 
 
 def _attempt_login(token: str) -> tuple[bool, dict | None, str]:
@@ -122,6 +413,7 @@ def _attempt_login(token: str) -> tuple[bool, dict | None, str]:
 
 
 def _logout() -> None:
+	_stop_feed()
 	st.session_state.pop("auth", None)
 	st.session_state["clear_login_token"] = True
 	for key in list(st.session_state.keys()):
@@ -199,23 +491,32 @@ if not auth:
 	st.info("Bitte anmelden, um die Oversight-Daten einzusehen.")
 	st.stop()
 
-db_path = _resolve_db_path()
-engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
-query = """
-	SELECT id, ts_utc, order_id, customer_id, score, decision,
-		   overridden, second_approval, rule_version, data_version,
-		   decision_id, thresholds_json, input_json
-	FROM decision_logs
-	ORDER BY ts_utc DESC
-"""
+if UI_DATA_SOURCE == "api":
+	# UI on another host than the backend: Review Queue via the read API only
+	_render_api_queue(_get_api_client(os.getenv("BACKEND_URL", "http://127.0.0.1:8000"), auth.get("token")), auth)
+	st.caption("Audit Logs, Scores & Metrics und KPIs benötigen Zugriff auf die SQLite-Datei (UI_DATA_SOURCE=db).")
+	st.stop()
 
+db_path = _resolve_db_path()
 try:
-	df = pd.read_sql(query, engine)
+	engine = _get_engine(str(db_path), _db_file_key(db_path))
+	# shared by all sessions; only rows after the last seen id are read (None = log too large, use SQL)
+	log_frame = _get_log_frame(str(db_path)).refresh()
+	if log_frame is not None:
+		decision_options = sorted(log_frame["decision"].dropna().unique().tolist())
+		ts_bounds = pd.DataFrame({"ts_min": [log_frame["ts_utc"].min()], "ts_max": [log_frame["ts_utc"].max()]})
+	else:
+		decision_options = _read_sql(
+			engine, "SELECT DISTINCT decision FROM decision_logs WHERE decision IS NOT NULL ORDER BY decision"
+		)["decision"].tolist()
+		ts_bounds = _read_sql(engine, "SELECT MIN(ts_utc) AS ts_min, MAX(ts_utc) AS ts_max FROM decision_logs")
+	with closing(connect_readonly(db_path)) as search_con:
+		search_indexed = has_search_index(search_con)
 except Exception as exc:
 	st.error(f"Daten konnten nicht geladen werden: {exc}")
 	st.stop()
 
-df["ts_utc"] = pd.to_datetime(df["ts_utc"], utc=True, errors="coerce")
+rollups_ready = _rollups_ready(db_path)
 resolved = str(db_path.resolve())
 try:
 	rel = str(db_path.relative_to(BASE_DIR))
@@ -239,19 +540,19 @@ else:
 
 st.sidebar.header("Filter")
 review_only = st.sidebar.toggle("Nur REVIEW-Fälle", value=True, key="filter_review")
-decision_options = sorted(df["decision"].dropna().unique().tolist())
 decision_filter = st.sidebar.multiselect(
 	"Entscheidungen",
 	decision_options,
 	default=decision_options,
 	key="filter_decisions",
 )
-search_text = st.sidebar.text_input("Suche (Order ID oder Kunde)", key="filter_search")
+search_text = st.sidebar.text_input("Suche (Order ID, Kunde, Override-Begründung)", key="filter_search")
 date_from = date_to = None
-date_bounds = df["ts_utc"].dropna()
-if not date_bounds.empty:
-	min_date = date_bounds.min().date()
-	max_date = date_bounds.max().date()
+min_ts = pd.to_datetime(ts_bounds["ts_min"], utc=True, errors="coerce").iloc[0]
+max_ts = pd.to_datetime(ts_bounds["ts_max"], utc=True, errors="coerce").iloc[0]
+if pd.notna(min_ts) and pd.notna(max_ts):
+	min_date = min_ts.date()
+	max_date = max_ts.date()
 	range_value = st.sidebar.date_input(
 		"Zeitraum",
 		value=(min_date, max_date),
@@ -262,35 +563,38 @@ if not date_bounds.empty:
 	elif range_value:
 		date_from = range_value
 		date_to = range_value
+if st.sidebar.toggle("Live-Updates", value=True, key="filter_live") and auth.get("token"):
+	# new rows arrive via the backend SSE feed instead of periodic full reloads
+	with st.sidebar:
+		_live_updates(_get_feed(os.getenv("BACKEND_URL", "http://127.0.0.1:8000"), auth["token"], str(db_path)))
+else:
+	_stop_feed()
 
-filtered_df = df.copy()
-if review_only:
-	filtered_df = filtered_df[filtered_df["decision"] == "REVIEW"]
-if decision_filter:
-	filtered_df = filtered_df[filtered_df["decision"].isin(decision_filter)]
-if search_text:
-	term = search_text.strip()
-	if term:
-		mask = (
-			filtered_df["order_id"].fillna("").str.contains(term, case=False)
-			| filtered_df["customer_id"].fillna("").str.contains(term, case=False)
-		)
-		filtered_df = filtered_df[mask]
-if date_from and date_to:
-	filtered_df = filtered_df[
-		(filtered_df["ts_utc"].dt.date >= date_from)
-		& (filtered_df["ts_utc"].dt.date <= date_to)
-	]
+# Filters run on the cached frame, or in SQLite where only counts and the current page leave the database
+filter_where, filter_params = queue_filter_sql(
+	review_only, decision_filter, search_text, date_from, date_to, search_indexed
+)
+filtered_frame = None
+try:
+	if log_frame is not None:
+		search_ids = _search_row_ids(db_path, search_text, search_indexed) if (search_text or "").strip() else None
+		filtered_frame = _filter_frame(log_frame, review_only, decision_filter, search_ids, date_from, date_to)
+		filtered_summary = _frame_summary(filtered_frame)
+		total_summary = _frame_summary(log_frame)
+	else:
+		filtered_summary = _queue_summary(engine, filter_where, filter_params)
+		total_summary = filtered_summary if not filter_where else _queue_summary(engine, "", {})
+except Exception as exc:
+	st.error(f"Daten konnten nicht geladen werden: {exc}")
+	st.stop()
 
-# Audit-CSV einlesen (Anzeige erfolgt später im Tab)
-audit_df = None
-if export_target.exists():
+# Audit-CSV: einmal je Dateistand geparst (Arrow-Sidecar), Anzeige seitenweise im Tab
+audit_snapshot = None
+audit_key = snapshot_key(export_target)
+if audit_key is not None:
 	try:
-		audit_df = pd.read_csv(export_target, comment="#")
-		if "ts_utc" in audit_df.columns:
-			audit_df["ts_utc"] = pd.to_datetime(audit_df["ts_utc"], errors="coerce")
+		audit_snapshot = _get_audit_snapshot(str(export_target), audit_key)
 	except Exception as exc:
-		audit_df = None
 		st.warning(f"Export konnte nicht geladen werden: {exc}")
 
 review_tab, audit_tab, metrics_tab, api_tab = st.tabs([
@@ -302,38 +606,54 @@ review_tab, audit_tab, metrics_tab, api_tab = st.tabs([
 
 with review_tab:
 	st.subheader("Arbeitsüberblick")
-	overview_df = filtered_df if not filtered_df.empty else df
-	overview_scope = "Filter" if not filtered_df.empty else "Gesamtbestand"
-	if filtered_df.empty and not df.empty:
+	filtered_total = filtered_summary["total"]
+	overview_summary = filtered_summary if filtered_total else total_summary
+	overview_scope = "Filter" if filtered_total else "Gesamtbestand"
+	if not filtered_total and total_summary["total"]:
 		st.caption("Keine Treffer für die aktuellen Filter – zeige Gesamtbestand.")
 	summary_cols = st.columns(4)
-	overview_len = int(len(overview_df))
+	overview_len = overview_summary["total"]
 	summary_cols[0].metric(f"Fälle ({overview_scope})", overview_len)
-	if overview_len:
-		review_open = int((overview_df["decision"] == "REVIEW").sum())
-		override_cnt = int(overview_df["overridden"].fillna(0).astype(int).sum())
-		latest_ts = overview_df["ts_utc"].dropna().max()
-		if pd.notna(latest_ts):
-			latest_val = latest_ts.tz_convert("UTC") if latest_ts.tzinfo else latest_ts.tz_localize("UTC")
-			latest_str = latest_val.strftime("%Y-%m-%d %H:%M")
-		else:
-			latest_str = "-"
-	else:
-		review_open = 0
-		override_cnt = 0
-		latest_str = "-"
+	review_open = overview_summary["review_open"]
+	override_cnt = overview_summary["override_cnt"]
+	latest_ts = pd.to_datetime(overview_summary["latest"], utc=True, errors="coerce")
+	latest_str = latest_ts.strftime("%Y-%m-%d %H:%M") if overview_len and pd.notna(latest_ts) else "-"
 	summary_cols[1].metric("Review offen", review_open)
 	summary_cols[2].metric("Übersteuert", override_cnt)
 	summary_cols[3].metric("Letztes Update (UTC)", latest_str)
 
-	if not overview_df.empty:
-		timeline_source = overview_df.dropna(subset=["ts_utc"]).copy()
-		timeline_source["ts_day"] = timeline_source["ts_utc"].dt.floor("D")
-		timeline_counts = (
-			timeline_source.groupby(["ts_day", "decision"])
-			.size()
-			.reset_index(name="count")
-		)
+	if overview_len:
+		timeline_where, timeline_params = (filter_where, filter_params) if filtered_total else ("", {})
+		if rollups_ready and not (search_text or "").strip():
+			# decision and date filters map onto the daily rollup buckets
+			timeline_decisions = None
+			timeline_from = timeline_to = None
+			if filtered_total:
+				if review_only:
+					timeline_decisions = [d for d in ["REVIEW"] if not decision_filter or d in decision_filter]
+				elif decision_filter:
+					timeline_decisions = decision_filter
+				if date_from and date_to:
+					timeline_from, timeline_to = date_from.isoformat(), date_to.isoformat()
+			with closing(connect_readonly(db_path)) as timeline_con:
+				timeline_rows = rollup_timeline(timeline_con, "day", timeline_decisions, timeline_from, timeline_to)
+			timeline_counts = pd.DataFrame(timeline_rows, columns=["ts_day", "decision", "count"])
+		elif log_frame is not None:
+			timeline_source = (filtered_frame if filtered_total else log_frame).dropna(subset=["ts_utc"])
+			timeline_counts = (
+				timeline_source.groupby([timeline_source["ts_utc"].dt.strftime("%Y-%m-%d").rename("ts_day"), "decision"])
+				.size()
+				.reset_index(name="count")
+			)
+		else:
+			timeline_counts = _read_sql(
+				engine,
+				f"SELECT substr(ts_utc, 1, 10) AS ts_day, decision, COUNT(*) AS count FROM decision_logs "
+				f"{timeline_where} GROUP BY 1, 2 ORDER BY 1, 2",
+				timeline_params,
+			)
+		timeline_counts["ts_day"] = pd.to_datetime(timeline_counts["ts_day"], utc=True, errors="coerce")
+		timeline_counts = timeline_counts.dropna(subset=["ts_day"])
 		if not timeline_counts.empty:
 			chart = alt.Chart(timeline_counts).mark_area(opacity=0.6).encode(
 				x=alt.X("ts_day:T", title="Datum"),
@@ -365,23 +685,36 @@ with review_tab:
 			"rule_version",
 			"data_version",
 		]
-		table_df = filtered_df[visible_cols].copy() if not filtered_df.empty else filtered_df
+		page_cols = st.columns(2)
+		page_size = page_cols[0].selectbox("Zeilen pro Seite", PAGE_SIZES, index=1, key="queue_page_size")
+		page_count = max(1, -(-filtered_total // page_size))
+		if st.session_state.get("queue_page", 1) > page_count:
+			st.session_state["queue_page"] = 1
+		page = page_cols[1].number_input("Seite", min_value=1, max_value=page_count, step=1, key="queue_page")
+		st.caption(f"{filtered_total} Treffer · Seite {page} von {page_count}")
+		page_offset = (int(page) - 1) * page_size
+		if filtered_frame is not None:
+			page_df = filtered_frame.iloc[page_offset:page_offset + page_size]
+		else:
+			page_df = _queue_page(engine, filter_where, filter_params, page_size, page_offset)
+		table_df = page_df[visible_cols].copy() if not page_df.empty else page_df
 		if not table_df.empty:
 			table_df["ts_utc"] = table_df["ts_utc"].dt.strftime("%Y-%m-%d %H:%M")
 		st.dataframe(table_df, use_container_width=True, height=420)
 
 	with detail_col:
 		st.caption("Details & Override-Workflow")
-		if filtered_df.empty:
+		if page_df.empty:
 			st.info("Keine Einträge für die aktuellen Filter.")
 		else:
 			selection = st.selectbox(
 				"Fall auswählen",
-				filtered_df["id"].tolist(),
+				page_df["id"].tolist(),
 				key="selected_case",
 			)
 			selected_id = int(selection)
-			detail_row = filtered_df[filtered_df["id"] == selected_id].iloc[0]
+			# input_json/thresholds_json are only loaded for the selected case
+			detail_row = _fetch_case(engine, selected_id)
 			ts_info = detail_row["ts_utc"]
 			if pd.notna(ts_info):
 				ts_display = ts_info.tz_convert("UTC") if ts_info.tzinfo else ts_info.tz_localize("UTC")
@@ -407,109 +740,38 @@ with review_tab:
 			except json.JSONDecodeError:
 				input_obj = {}
 
-			base_review = (
-				detail_row.get("decision") == "REVIEW"
-				and int(detail_row.get("overridden") or 0) == 0
-			)
-			if base_review:
-				order_value = float(input_obj.get("order_value_eur", 0) or 0)
-				country_risk = float(input_obj.get("country_risk", 0) or 0)
-				needs_four_eyes = order_value >= 50000 or country_risk >= 4
-				if needs_four_eyes:
-					st.warning("Vier-Augen erforderlich (order_value_eur ≥ 50000 oder country_risk ≥ 4)")
-				decision_key = f"override_decision_{selected_id}"
-				reason_key = f"override_reason_{selected_id}"
-				new_decision = st.radio(
-					"Neue Entscheidung",
-					options=("ALLOW", "BLOCK"),
-					horizontal=True,
-					key=decision_key,
-				)
-				override_reason = st.text_area(
-					"Begründung (Pflicht, ≥15 Zeichen)",
-					key=reason_key,
-					height=120,
-				)
-				need_admin = needs_four_eyes and auth.get("role") == "reviewer"
-				if need_admin:
-					st.error("Admin benötigt für Vier-Augen-Fälle.")
-				btn_disabled = len(override_reason.strip()) < 15 or need_admin
-				if st.button(
-					"Override speichern",
-					type="primary",
-					use_container_width=True,
-					disabled=btn_disabled,
-					key=f"override_submit_{selected_id}",
-				):
-					payload = {
-						"decision_id": detail_row.get("decision_id"),
-						"new_decision": new_decision,
-						"override_reason": override_reason.strip(),
-					}
-					backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
-					headers = {"X-Auth-Token": auth.get("token")}
-					try:
-						resp = requests.post(
-							f"{backend_url}/v1/credit/override",
-							json=payload,
-							headers=headers,
-							timeout=10,
-						)
-					except Exception as exc:
-						st.error(f"Request fehlgeschlagen: {exc}")
-					else:
-						if resp.status_code == 200:
-							st.success("Override gespeichert – Dashboard wird aktualisiert.")
-							st.session_state.pop(reason_key, None)
-							st.session_state.pop(decision_key, None)
-							st.experimental_rerun()
-						elif resp.status_code in (400, 403, 404, 409):
-							content_type = resp.headers.get("content-type", "")
-							if content_type.startswith("application/json"):
-								detail_msg = resp.json().get("detail", resp.text)
-							else:
-								detail_msg = resp.text
-							st.error(f"Fehler {resp.status_code}: {detail_msg}")
-						else:
-							st.error(f"Fehler {resp.status_code}: {resp.text}")
-			else:
-				st.info("Overrides sind nur für offene REVIEW-Basisfälle möglich.")
+			_render_override_form(detail_row, input_obj, selected_id, auth)
 
 			with audit_tab:
 				st.subheader("Audit Logs – CSV Snapshot")
-				if audit_df is None:
+				if audit_snapshot is None:
 					st.info("Kein Export geladen. Bitte tools/export_log.py ausführen und Seite neu laden.")
-				elif audit_df.empty:
+				elif not len(audit_snapshot):
 					st.warning("CSV vorhanden, aber ohne Einträge.")
 				else:
+					# KPIs from the counters stored with the snapshot, no pass over the rows
+					audit_stats = audit_snapshot.stats
 					col_a, col_b, col_c, col_d = st.columns(4)
-					col_a.metric("Einträge", len(audit_df))
-					if "overridden" in audit_df.columns:
-						col_b.metric("Overrides", int(audit_df["overridden"].fillna(0).astype(int).sum()))
-					if "decision" in audit_df.columns:
-						review_share = (
-							(audit_df["decision"] == "REVIEW").mean() * 100
-							if len(audit_df)
-							else 0
-						)
+					col_a.metric("Einträge", audit_stats["rows"])
+					if "overridden" in audit_snapshot.columns:
+						col_b.metric("Overrides", audit_stats["overrides"])
+					if "decision" in audit_snapshot.columns:
+						review_share = audit_stats["review"] / audit_stats["rows"] * 100
 						col_c.metric("Review-Anteil", f"{review_share:.1f}%")
-					if "ts_utc" in audit_df.columns and audit_df["ts_utc"].notna().any():
-						last_ts = audit_df["ts_utc"].dropna().max()
-						if isinstance(last_ts, pd.Timestamp):
-							col_d.metric("Letzter Eintrag", last_ts.strftime("%Y-%m-%d %H:%M"))
-
-					view_cols = [
-						"ts_utc",
-						"decision_id",
-						"decision",
-						"overridden",
-						"second_approval",
-						"actor_sys",
-						"actor_ux",
-						"override_reason",
-					]
-					available_cols = [c for c in view_cols if c in audit_df.columns]
-					view_df = audit_df[available_cols].copy() if available_cols else audit_df.copy()
+					if audit_snapshot.last_ts is not None:
+						col_d.metric("Letzter Eintrag", audit_snapshot.last_ts.strftime("%Y-%m-%d %H:%M"))
+
+					audit_page_cols = st.columns(2)
+					audit_page_size = audit_page_cols[0].selectbox(
+						"Zeilen pro Seite", PAGE_SIZES, index=2, key="audit_page_size"
+					)
+					audit_page_count = max(1, -(-len(audit_snapshot) // audit_page_size))
+					if st.session_state.get("audit_page", 1) > audit_page_count:
+						st.session_state["audit_page"] = 1
+					audit_page = audit_page_cols[1].number_input(
+						"Seite", min_value=1, max_value=audit_page_count, step=1, key="audit_page"
+					)
+					view_df = audit_snapshot.page((int(audit_page) - 1) * audit_page_size, audit_page_size)
 					if "ts_utc" in view_df.columns:
 						view_df["ts_utc"] = view_df["ts_utc"].dt.strftime("%Y-%m-%d %H:%M:%S")
 					for text_col in ["actor_sys", "actor_ux", "override_reason"]:
@@ -535,9 +797,11 @@ with review_tab:
 							"override_reason": "Begründung",
 						}
 					)
-					view_df = view_df.reset_index(drop=True)
-					st.dataframe(view_df.head(150), use_container_width=True, height=420)
-					st.caption("Quelle: data/abb_6_1_decision_logs.csv – Ansicht für Audits & Screenshots")
+					st.dataframe(view_df, use_container_width=True, height=420)
+					st.caption(
+						f"Quelle: data/abb_6_1_decision_logs.csv – Ansicht für Audits & Screenshots · "
+						f"Seite {audit_page} von {audit_page_count}"
+					)
 
 			with metrics_tab:
 				st.subheader("Scores & Metrics Evaluation")
@@ -652,7 +916,19 @@ with review_tab:
 					st.info("Noch keine Klassifizierer-Ergebnisse vorhanden. Zeige nur deterministische KPIs.")
 
 				st.markdown("#### Governance-KPIs (Oversight)")
-				gov = _compute_governance_overview(df)
+				# O(buckets) from the rollups; direct aggregate SQL if they are unavailable
+				sla = None
+				try:
+					with closing(connect_readonly(db_path)) as gov_con:
+						gov = rollup_overview(gov_con) if rollups_ready else governance_overview(gov_con)
+						# exact queue times and open cases from the appender-maintained review_resolutions
+						if has_resolutions(gov_con):
+							sla = review_sla(gov_con)
+							gov["queue_mean_min"] = sla["queue_mean_min"]
+							gov["queue_p95_min"] = sla["queue_p95_min"]
+				except Exception as exc:
+					st.error(f"Governance-KPIs konnten nicht berechnet werden: {exc}")
+					gov = empty_overview()
 				mix_rows = []
 				for label in ["ALLOW", "REVIEW", "BLOCK"]:
 					mix_rows.append(
@@ -671,6 +947,10 @@ with review_tab:
 				g_cols[3].metric("Review-Zeit p95", queue_p95)
 				queue_mean = f"{gov['queue_mean_min']:.1f} Min" if gov["queue_mean_min"] is not None else "n/a"
 				st.caption(f"Ø Review-Zeit: {queue_mean}")
+				if sla is not None:
+					oldest = sla["oldest_open"]
+					oldest_str = f"{oldest['age_min'] / 60.0:.1f} h ({oldest['decision_id']})" if oldest else "-"
+					st.caption(f"Offene REVIEW-Fälle: {sla['open']} · ältester offen seit {oldest_str}")
 
 	with api_tab:
 		st.subheader("API Input & Thresholds")
@@ -683,11 +963,10 @@ with review_tab:
 			except (TypeError, ValueError):
 				st.error("Ausgewählte Fall-ID ist ungültig. Bitte erneut wählen.")
 			else:
-				case_df = df[df["id"] == selected_case_id]
-				if case_df.empty:
+				case_row = _fetch_case(engine, selected_case_id)
+				if case_row is None:
 					st.warning("Fall nicht mehr im aktuellen Datensatz. Bitte Ansicht aktualisieren.")
 				else:
-					case_row = case_df.iloc[0]
 					try:
 						api_input = json.loads(case_row.get("input_json") or "{}")
 					except json.JSONDecodeError:
@@ -0,0 +1,188 @@
+"""Audit snapshot loader for the Audit Logs tab (``data/abb_6_1_decision_logs.csv``).
+
+snapshot_key() identifies the file state by size, mtime and the ``# SHA256=``
+footer (read from the file tail), so a rerun needs no pass over the rows. The
+first load streams the CSV in chunks, keeps only the display columns and
+writes them to an Arrow IPC sidecar next to the CSV; the KPIs (rows,
+overrides, REVIEW rows, last timestamp) are counted on the way and stored with
+the key in the sidecar's schema metadata. Later loads memory-map the sidecar:
+page() converts only the requested rows to pandas and the KPIs come from the
+metadata. Without pyarrow, or when the sidecar cannot be written, the parsed
+frame is held in memory instead.
+"""
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:  # optional: memory-mapped sidecar (ships with streamlit)
+	import pyarrow as pa
+	import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover
+	pa = None
+
+VIEW_COLUMNS = (
+	"ts_utc",
+	"decision_id",
+	"decision",
+	"overridden",
+	"second_approval",
+	"actor_sys",
+	"actor_ux",
+	"override_reason",
+)
+FLAG_COLUMNS = ("overridden", "second_approval")
+CHUNK_ROWS = 50_000
+SIDECAR_SUFFIX = ".audit-view.arrow"
+FOOTER_PREFIX = b"# SHA256="
+_TAIL_BYTES = 4096
+_META_KEY = b"snapshot_key"
+_META_STATS = b"snapshot_stats"
+
+
+def snapshot_key(path) -> tuple | None:
+	"""(size, mtime_ns, footer sha256) of the CSV; None if it does not exist."""
+	path = Path(path)
+	try:
+		stat = path.stat()
+		with path.open("rb") as f:
+			f.seek(max(0, stat.st_size - _TAIL_BYTES))
+			tail = f.read()
+	except FileNotFoundError:
+		return None
+	sha = ""
+	for line in reversed(tail.splitlines()):
+		if line.startswith(FOOTER_PREFIX):
+			sha = line[len(FOOTER_PREFIX):].strip().decode("ascii", "replace")
+			break
+	return stat.st_size, stat.st_mtime_ns, sha
+
+
+def sidecar_path(path) -> Path:
+	path = Path(path)
+	return path.with_name(path.stem + SIDECAR_SUFFIX)
+
+
+class AuditSnapshot:
+	"""Parsed snapshot: ``stats`` for the KPIs, ``page()`` for the table rows."""
+
+	def __init__(self, data, stats: dict, sidecar: Path | None = None):
+		self._data = data  # pyarrow.Table (memory-mapped if sidecar) or DataFrame
+		self.stats = stats
+		self.sidecar = sidecar
+
+	def __len__(self) -> int:
+		return self.stats["rows"]
+
+	@property
+	def columns(self) -> list:
+		return self.stats["columns"]
+
+	@property
+	def last_ts(self) -> pd.Timestamp | None:
+		return pd.Timestamp(self.stats["last_ts"]) if self.stats.get("last_ts") else None
+
+	def page(self, offset: int, limit: int) -> pd.DataFrame:
+		"""Rows [offset, offset + limit) in file order, columns present in the CSV only."""
+		offset = max(0, int(offset))
+		if isinstance(self._data, pd.DataFrame):
+			frame = self._data.iloc[offset:offset + limit]
+		else:
+			frame = self._data.slice(offset, limit).to_pandas()
+		return frame[self.columns].reset_index(drop=True)
+
+
+def _normalize(chunk: pd.DataFrame) -> pd.DataFrame:
+	frame = chunk.reindex(columns=list(VIEW_COLUMNS))
+	frame["ts_utc"] = pd.to_datetime(frame["ts_utc"], utc=True, errors="coerce", format="ISO8601")
+	for column in FLAG_COLUMNS:
+		frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0).astype("int8")
+	for column in VIEW_COLUMNS:
+		if column != "ts_utc" and column not in FLAG_COLUMNS:
+			frame[column] = frame[column].astype("string")
+	return frame
+
+
+def _parse(path: Path):
+	"""(chunks, stats): display columns of the CSV in CHUNK_ROWS frames plus the KPI counters."""
+	stats = {"rows": 0, "overrides": 0, "review": 0, "last_ts": None, "columns": []}
+	chunks = []
+	last_ts = None
+	reader = pd.read_csv(
+		path, comment="#", usecols=lambda c: c in VIEW_COLUMNS, dtype=str, chunksize=CHUNK_ROWS
+	)
+	for raw in reader:
+		if not stats["columns"]:
+			stats["columns"] = [c for c in VIEW_COLUMNS if c in raw.columns]
+		chunk = _normalize(raw)
+		stats["rows"] += len(chunk)
+		stats["overrides"] += int(chunk["overridden"].sum())
+		stats["review"] += int((chunk["decision"] == "REVIEW").sum())
+		chunk_max = chunk["ts_utc"].max()
+		if pd.notna(chunk_max) and (last_ts is None or chunk_max > last_ts):
+			last_ts = chunk_max
+		chunks.append(chunk)
+	stats["last_ts"] = last_ts.isoformat() if last_ts is not None else None
+	return chunks, stats
+
+
+def _arrow_schema():
+	return pa.schema([
+		("ts_utc", pa.timestamp("us", tz="UTC")),
+		("decision_id", pa.string()),
+		("decision", pa.string()),
+		("overridden", pa.int8()),
+		("second_approval", pa.int8()),
+		("actor_sys", pa.string()),
+		("actor_ux", pa.string()),
+		("override_reason", pa.string()),
+	])
+
+
+def _open_sidecar(sidecar: Path, key: tuple) -> AuditSnapshot | None:
+	try:
+		table = pa_ipc.open_file(pa.memory_map(str(sidecar), "r")).read_all()
+	except (OSError, pa.ArrowInvalid):
+		return None
+	meta = table.schema.metadata or {}
+	if meta.get(_META_KEY) != json.dumps(list(key)).encode("utf-8"):
+		return None  # stale: the CSV was re-exported or replaced
+	return AuditSnapshot(table, json.loads(meta[_META_STATS]), sidecar)
+
+
+def _write_sidecar(sidecar: Path, key: tuple, chunks: list, stats: dict) -> bool:
+	schema = _arrow_schema().with_metadata({
+		_META_KEY: json.dumps(list(key)),
+		_META_STATS: json.dumps(stats),
+	})
+	tmp = sidecar.with_name(sidecar.name + ".tmp")
+	try:
+		with pa_ipc.new_file(str(tmp), schema) as writer:
+			for chunk in chunks:
+				writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+		os.replace(tmp, sidecar)
+		return True
+	except OSError:
+		tmp.unlink(missing_ok=True)
+		return False
+
+
+def load_snapshot(path, key: tuple | None = None) -> AuditSnapshot | None:
+	"""Snapshot for ``path`` (None if missing): memory-mapped sidecar, rebuilt when ``key`` changed."""
+	path = Path(path)
+	key = key or snapshot_key(path)
+	if key is None:
+		return None
+	sidecar = sidecar_path(path)
+	if pa is not None:
+		snapshot = _open_sidecar(sidecar, key)
+		if snapshot is not None:
+			return snapshot
+	chunks, stats = _parse(path)
+	if pa is not None and _write_sidecar(sidecar, key, chunks, stats):
+		snapshot = _open_sidecar(sidecar, key)
+		if snapshot is not None:
+			return snapshot
+	frame = pd.concat(chunks, ignore_index=True) if chunks else _normalize(pd.DataFrame(columns=list(VIEW_COLUMNS)))
+	return AuditSnapshot(frame, stats)
@@ -0,0 +1,142 @@
+"""Subscription to the backend change feed (``GET /v1/credit/decisions/stream``).
+
+Each reviewer session owns one feed: a background thread reads the
+server-sent events and merges the pushed rows into the shared
+DecisionLogFrame. ``version`` counts the received events, so a Streamlit
+fragment can rerun the page only when something arrived instead of reloading
+on a timer. After a dropped connection the thread reconnects with
+``Last-Event-ID`` and continues where it stopped.
+
+The thread ends on stop() (logout, token change, live updates switched off),
+when the backend rejects the token (401/403; retrying cannot help), or when
+the session stopped calling touch() for ``IDLE_STOP_S`` (closed browser tab).
+"""
+import json
+import os
+import threading
+import time
+
+import requests
+
+from oversight_ui.log_cache import DecisionLogFrame
+
+LIVE_CHECK_S = float(os.getenv("UI_LIVE_CHECK_S", "0.5"))  # fragment interval in the UI
+RECONNECT_S = 2.0
+READ_TIMEOUT_S = 60.0  # the backend sends a keep-alive comment every 15 s
+IDLE_STOP_S = float(os.getenv("UI_LIVE_IDLE_S", "120"))  # no touch() for this long: session is gone
+
+
+def iter_sse(lines):
+	"""(id, data) per SSE event from decoded lines; comments and other fields are skipped."""
+	event_id, data = None, []
+	for line in lines:
+		if not line:
+			if data:
+				yield event_id, "\n".join(data)
+			event_id, data = None, []
+		elif line.startswith("id:"):
+			event_id = line[3:].strip()
+		elif line.startswith("data:"):
+			data.append(line[5:].lstrip())
+
+
+class DecisionFeed:
+	def __init__(self, backend_url: str, token: str, log_frame: DecisionLogFrame):
+		self.url = self.stream_url(backend_url)
+		self.token = token
+		self.log_frame = log_frame
+		self.version = 0
+		self.connected = False
+		self.error = None
+		self.rejected = False
+		self._last_event_id = None
+		self._touched = time.monotonic()
+		self._resp = None
+		self._stop = threading.Event()
+		self._thread = threading.Thread(target=self._run, name="decision-feed", daemon=True)
+		self._thread.start()
+
+	@staticmethod
+	def stream_url(backend_url: str) -> str:
+		return f"{backend_url.rstrip('/')}/v1/credit/decisions/stream"
+
+	@property
+	def stopped(self) -> bool:
+		return self._stop.is_set()
+
+	def touch(self) -> None:
+		"""Mark the feed as still watched (called from the UI fragment)."""
+		self._touched = time.monotonic()
+
+	def stop(self) -> None:
+		self._stop.set()
+		resp = self._resp
+		if resp is not None:
+			try:
+				resp.close()  # unblock the read instead of waiting for the next keep-alive
+			except Exception:
+				pass
+
+	def _idle(self) -> bool:
+		return time.monotonic() - self._touched > IDLE_STOP_S
+
+	def _lines(self, resp):
+		for line in resp.iter_lines(decode_unicode=True):
+			if self._stop.is_set() or self._idle():
+				return
+			yield line
+
+	def _run(self) -> None:
+		while not self._stop.is_set():
+			if self._idle():
+				self.stop()
+				break
+			headers = {"X-Auth-Token": self.token, "Accept": "text/event-stream"}
+			params = {}
+			if self._last_event_id is not None:
+				headers["Last-Event-ID"] = str(self._last_event_id)
+			elif self.log_frame.last_id:
+				# continue exactly where the cached frame ends
+				self._last_event_id = self.log_frame.last_id
+				params["after"] = self._last_event_id
+			try:
+				with requests.get(
+					self.url, headers=headers, params=params, stream=True, timeout=(5, READ_TIMEOUT_S)
+				) as resp:
+					if resp.status_code in (401, 403):
+						# the token is invalid or lacks the role: retrying cannot help
+						self.error = f"Token abgelehnt ({resp.status_code})"
+						self.rejected = True
+						self._stop.set()
+						break
+					resp.raise_for_status()
+					self._resp = resp
+					self.connected, self.error = True, None
+					for event_id, data in iter_sse(self._lines(resp)):
+						if not self._receive(event_id, data):
+							break  # resync from the frame
+			except Exception as exc:
+				if not self._stop.is_set():
+					self.error = str(exc)
+			finally:
+				self._resp = None
+				self.connected = False
+			self._stop.wait(RECONNECT_S)
+
+	def _receive(self, event_id, data: str) -> bool:
+		"""Merge one event; False if the frame did not take it and the stream must resync."""
+		try:
+			rows = json.loads(data)
+			cursor = int(event_id)
+		except (TypeError, ValueError):
+			return True
+		applied = self.log_frame.apply(rows, self._last_event_id)
+		self.version += 1  # rerun either way: refresh() reads rows the frame did not take
+		if applied or not self.log_frame.last_id:
+			# an empty frame has no position to resync to; the rerun's refresh() loads these rows
+			self._last_event_id = cursor
+			return True
+		# The frame is not where the stream is (reloaded meanwhile): keep the cursor and
+		# reconnect from the frame's own last id, so the gap arrives as pushed rows.
+		self._last_event_id = None
+		return False
@@ -0,0 +1,106 @@
+"""Process-wide, incrementally refreshed decision_logs frame for the oversight UI.
+
+One DecisionLogFrame per DB file is shared by all reviewer sessions of a
+Streamlit process (st.cache_resource). decision_logs is append-only, so
+refresh() only reads rows with an id above the last one seen and merges them
+into the frame. If the file is replaced (other device/inode), shrinks, or the
+row_hash at the watermark changed, the frame is dropped and reloaded.
+
+Only the list columns are held; input_json/thresholds_json are read per case.
+The returned frame is shared: filter it, never modify it in place.
+Rows pushed by the backend change feed (oversight_ui/live_feed.py) are merged
+via apply() without touching the database.
+"""
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+LIGHT_COLUMNS = (
+	"id",
+	"ts_utc",
+	"order_id",
+	"customer_id",
+	"score",
+	"decision",
+	"overridden",
+	"second_approval",
+	"rule_version",
+	"data_version",
+)
+# Above this many rows the UI falls back to per-click SQL instead of holding the frame
+FRAME_MAX_ROWS = int(os.getenv("UI_FRAME_MAX_ROWS", "2000000"))
+
+
+def _file_identity(db_path: Path) -> tuple:
+	st = os.stat(db_path)
+	return (st.st_dev, st.st_ino)
+
+
+class DecisionLogFrame:
+	def __init__(self, db_path, max_rows: int = FRAME_MAX_ROWS):
+		self.db_path = Path(db_path)
+		self.max_rows = max_rows
+		self._lock = threading.Lock()
+		self._reset(None)
+
+	def _reset(self, identity) -> None:
+		self._identity = identity
+		self._frame = pd.DataFrame(columns=list(LIGHT_COLUMNS))
+		self._last_id = 0
+		self._last_hash = None
+
+	@property
+	def last_id(self) -> int:
+		return self._last_id
+
+	def _same_log(self, con) -> bool:
+		if not self._last_id:
+			return True
+		row = con.execute("SELECT row_hash FROM decision_logs WHERE id = ?", (self._last_id,)).fetchone()
+		return row is not None and row[0] == self._last_hash
+
+	def refresh(self):
+		"""Frame sorted newest first (ts_utc, id), or None if the log exceeds max_rows."""
+		with self._lock:
+			identity = _file_identity(self.db_path)
+			con = sqlite3.connect(self.db_path.resolve().as_uri() + "?mode=ro", uri=True)
+			try:
+				if identity != self._identity or not self._same_log(con):
+					self._reset(identity)
+				(max_id,) = con.execute("SELECT COALESCE(MAX(id), 0) FROM decision_logs").fetchone()
+				if max_id > self.max_rows:
+					self._reset(identity)
+					return None
+				if max_id <= self._last_id:
+					return self._frame
+				new = pd.read_sql_query(
+					f"SELECT {', '.join(LIGHT_COLUMNS)}, row_hash FROM decision_logs WHERE id > ? AND id <= ? ORDER BY id",
+					con,
+					params=(self._last_id, max_id),
+				)
+			finally:
+				con.close()
+			if not new.empty:
+				self._merge(new)
+			return self._frame
+
+	def apply(self, rows: list, after_id) -> bool:
+		"""Merge rows pushed by the change feed if they directly continue the frame (ids after ``after_id``)."""
+		with self._lock:
+			if not rows or self._identity is None or after_id is None or after_id != self._last_id:
+				return False  # refresh() catches up from the database instead
+			self._merge(pd.DataFrame(rows, columns=[*LIGHT_COLUMNS, "row_hash"]))
+			return True
+
+	def _merge(self, new: pd.DataFrame) -> None:
+		self._last_id = int(new["id"].iloc[-1])
+		self._last_hash = new["row_hash"].iloc[-1]
+		new = new.drop(columns=["row_hash"])
+		new["ts_utc"] = pd.to_datetime(new["ts_utc"], utc=True, errors="coerce")
+		frames = [f for f in (self._frame, new) if not f.empty]
+		merged = pd.concat(frames, ignore_index=True) if len(frames) > 1 else new
+		# replace, never mutate: sessions may still hold the previous frame
+		self._frame = merged.sort_values(["ts_utc", "id"], ascending=False, na_position="last", ignore_index=True)
@@ -0,0 +1,64 @@
+"""SQL for the REVIEW queue of the oversight UI when it pages in SQLite.
+
+queue_filter_sql() turns the sidebar filters (REVIEW only, decisions, search
+text, UTC day range) into a WHERE clause with named parameters; search goes
+through backend/search.py (trigram index, or an escaped LIKE scan).
+summary_sql() and page_sql() wrap it: the counts and one page ordered by
+``ts_utc DESC, id DESC``, so pages stay stable when rows share a timestamp.
+The statements use ``:name`` parameters and run with sqlite3 as well as
+SQLAlchemy ``text``.
+"""
+from datetime import date, timedelta
+
+from backend.search import match_sql
+
+QUEUE_COLUMNS = (
+	"id, ts_utc, order_id, customer_id, score, decision, overridden, second_approval, "
+	"rule_version, data_version, decision_id"
+)
+
+
+def queue_filter_sql(
+	review_only: bool, decisions: list, search_text: str, date_from: date | None, date_to: date | None,
+	search_indexed: bool = False,
+) -> tuple[str, dict]:
+	"""WHERE clause and bind parameters for the sidebar filters ("" if none is set)."""
+	clauses = []
+	params = {}
+	if review_only:
+		clauses.append("decision = 'REVIEW'")
+	if decisions:
+		names = [f"decision_{i}" for i in range(len(decisions))]
+		clauses.append(f"decision IN ({', '.join(':' + n for n in names)})")
+		params.update(zip(names, decisions))
+	term = (search_text or "").strip()
+	if term:
+		# substring match on order_id, customer_id and override_reason
+		match, match_params = match_sql(term, search_indexed)
+		params.update(match_params)
+		clauses.append(f"id IN ({match})")
+	if date_from and date_to:
+		# ISO timestamps compare as strings; [from, to + 1 day) keeps the ts_utc index usable
+		params["day_from"] = date_from.isoformat()
+		params["day_after"] = (date_to + timedelta(days=1)).isoformat()
+		clauses.append("ts_utc >= :day_from AND ts_utc < :day_after")
+	return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def summary_sql(where: str) -> str:
+	"""Counts for the KPI header: total, open REVIEW rows, overrides and the latest ts_utc."""
+	return f"""
+		SELECT COUNT(*) AS total,
+			   COALESCE(SUM(decision = 'REVIEW'), 0) AS review_open,
+			   COALESCE(SUM(COALESCE(overridden, 0)), 0) AS override_cnt,
+			   MAX(ts_utc) AS latest
+		FROM decision_logs {where}
+		"""
+
+
+def page_sql(where: str) -> str:
+	"""One page of queue rows, newest first; binds :limit and :offset."""
+	return (
+		f"SELECT {QUEUE_COLUMNS} FROM decision_logs {where} "
+		"ORDER BY ts_utc DESC, id DESC LIMIT :limit OFFSET :offset"
+	)
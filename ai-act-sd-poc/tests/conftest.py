@@ -0,0 +1,100 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The backend uses flat imports (``from db import ...``) and binds its engine,
+# audit stream and limiter at import time: point them at throwaway state first.
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "backend"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+_STATE_DIR = Path(tempfile.mkdtemp(prefix="credit-api-tests-"))
+os.environ.setdefault("DB_URL", f"sqlite:///{_STATE_DIR / 'governance.db'}")
+os.environ.setdefault("AUDIT_LOG_DIR", "")
+os.environ.setdefault("RATE_LIMIT_RATE", "10000")
+os.environ.setdefault("RATE_LIMIT_BURST", "10000")
+os.environ.setdefault("RATE_LIMIT_DB", str(_STATE_DIR / "ratelimit.db"))
+
+
+# A valid POST /v1/credit/decision body; give each test its own order_id
+REQUEST = {
+    "customer_id": "C-OK", "order_value_eur": 8000.0, "payment_terms_days": 30, "overdue_ratio": 0.05,
+    "dso_proxy_days": 28, "risk_class": "A", "country_risk": 2, "incoterm": "DDP", "is_new_customer": False,
+    "credit_limit_eur": 20000.0, "past_limit_breach": False, "express_flag": False, "data_version": "dv1.0",
+}
+
+
+@pytest.fixture
+def api_client(tmp_path, monkeypatch):
+    """TestClient on the API with its own decision log and an empty replay cache."""
+    import app as api
+    import db
+    from fastapi.testclient import TestClient
+    from replay_cache import DecisionReplayCache
+    from sqlalchemy import create_engine
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'governance.db'}")
+    db.ensure_schema(engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "_appender", db.ChainAppender(engine))
+    monkeypatch.setattr(api, "_replay_cache", DecisionReplayCache())
+    yield TestClient(api.app)
+    engine.dispose()
+
+
+def audit_events(directory) -> list:
+    """All events of the audit stream segments in ``directory``, in order."""
+    return [
+        json.loads(line)
+        for path in sorted(Path(directory).glob("audit-*.jsonl"))
+        for line in path.read_text(encoding="utf-8").splitlines()
+    ]
+
+
+def decision_payload(i: int, **extra) -> dict:
+    """A base decision_logs row as the API would append it."""
+    return {
+        "decision_id": f"dec-{i}", "ts_utc": f"2025-01-{1 + i // 24 % 28:02d}T{i % 24:02d}:00:00Z",
+        "order_id": f"O-{i}", "customer_id": f"C-{i % 7}",
+        "input_json": json.dumps({"order_value_eur": 1000.0 + i, "risk_class": "ABC"[i % 3]}),
+        "score": i % 100, "thresholds_json": '{"allow_max": 59}', "decision": ("ALLOW", "REVIEW", "BLOCK")[i % 3],
+        "rule_version": "rules_v1.2", "data_version": "dv1.0", "actor_sys": "credit_decision_api",
+        "actor_ux": None, "overridden": 0, "override_reason": None,
+        **extra,
+    }
+
+
+@pytest.fixture
+def chain_db(tmp_path):
+    """append(n, **extra) writes n more chained rows to a fresh governance.db; returns its path."""
+    import db
+    from sqlalchemy import create_engine
+
+    path = tmp_path / "governance.db"
+    engine = create_engine(f"sqlite:///{path}")
+    db.ensure_schema(engine)
+    appender = db.ChainAppender(engine)
+    written = []
+
+    def append(n: int, **extra) -> Path:
+        appender.append([decision_payload(len(written) + i, **extra) for i in range(n)])
+        written.extend(range(n))
+        return path
+
+    yield append
+    engine.dispose()
+
+
+def tamper_row(db_path, row_id: int, change: str = "score = score + 1") -> None:
+    """Change a logged row behind the append-only triggers."""
+    con = sqlite3.connect(db_path)
+    con.execute("DROP TRIGGER IF EXISTS deny_update")
+    con.execute(f"UPDATE decision_logs SET {change} WHERE id = ?", (row_id,))
+    con.commit()
+    con.close()
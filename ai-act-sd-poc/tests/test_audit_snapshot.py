@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from oversight_ui import audit_snapshot
+
+HEADER = "id,ts_utc,decision_id,input_json,decision,overridden,second_approval,actor_ux,override_reason\n"
+
+
+def _write(path, rows, sha="ab" * 32):
+    body = "".join(
+        f'{i},{ts},d-{i},"{{""order_id"":""O-{i}""}}",{decision},{overridden},0,,\n'
+        for i, (ts, decision, overridden) in enumerate(rows, start=1)
+    )
+    path.write_text(HEADER + body + f"# SHA256={sha}\n", encoding="utf-8")
+
+
+ROWS = [
+    ("2025-01-01T10:00:00.123456+00:00", "REVIEW", 0),
+    ("2025-01-03T08:00:00Z", "ALLOW", 1),
+    ("2025-01-02T09:00:00Z", "REVIEW", 0),
+]
+
+
+def test_kpis_and_pages_come_from_the_sidecar(tmp_path):
+    csv = tmp_path / "abb_6_1_decision_logs.csv"
+    _write(csv, ROWS)
+    key = audit_snapshot.snapshot_key(csv)
+    assert key[2] == "ab" * 32
+    snap = audit_snapshot.load_snapshot(csv, key)
+    assert snap.sidecar == audit_snapshot.sidecar_path(csv) and snap.sidecar.exists()
+    assert (len(snap), snap.stats["overrides"], snap.stats["review"]) == (3, 1, 2)
+    assert snap.last_ts.isoformat() == "2025-01-03T08:00:00+00:00"
+    assert "actor_sys" not in snap.columns and "input_json" not in snap.columns
+    page = snap.page(1, 5)
+    assert page["decision_id"].tolist() == ["d-2", "d-3"]
+    assert page["overridden"].tolist() == [1, 0]
+
+    mtime = snap.sidecar.stat().st_mtime_ns
+    again = audit_snapshot.load_snapshot(csv, key)
+    assert again.sidecar.stat().st_mtime_ns == mtime  # reused, not rebuilt
+    assert again.stats == snap.stats
+
+
+def test_new_export_invalidates_the_sidecar(tmp_path):
+    csv = tmp_path / "abb_6_1_decision_logs.csv"
+    _write(csv, ROWS)
+    first = audit_snapshot.load_snapshot(csv)
+    _write(csv, ROWS[:1], sha="cd" * 32)
+    os.utime(csv, ns=(0, 0))
+    second = audit_snapshot.load_snapshot(csv)
+    assert len(first) == 3 and len(second) == 1
+    assert audit_snapshot.snapshot_key(tmp_path / "missing.csv") is None
+    assert audit_snapshot.load_snapshot(tmp_path / "missing.csv") is None
+
+
+def test_in_memory_fallback_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(audit_snapshot, "pa", None)
+    csv = tmp_path / "abb_6_1_decision_logs.csv"
+    _write(csv, ROWS)
+    snap = audit_snapshot.load_snapshot(csv)
+    assert snap.sidecar is None and not audit_snapshot.sidecar_path(csv).exists()
+    assert snap.page(0, 2)["decision"].tolist() == ["REVIEW", "ALLOW"]
+    assert snap.stats["review"] == 2
+
+
+@pytest.mark.skipif(audit_snapshot.pa is None, reason="pyarrow not installed")
+def test_read_only_directory_keeps_the_frame_in_memory(tmp_path, monkeypatch):
+    csv = tmp_path / "abb_6_1_decision_logs.csv"
+    _write(csv, ROWS)
+    monkeypatch.setattr(audit_snapshot, "_write_sidecar", lambda *args: False)
+    snap = audit_snapshot.load_snapshot(csv)
+    assert snap.sidecar is None and len(snap.page(0, 10)) == 3
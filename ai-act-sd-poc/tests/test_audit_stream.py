@@ -0,0 +1,79 @@
+import uuid
+
+from fastapi.testclient import TestClient
+
+import app as api
+import audit_stream
+from audit_stream import AuditStreamWriter
+from conftest import REQUEST, audit_events
+from tools.compute_metrics import REQUIRED_COMMON, check_completeness, compute_state, expand_inputs
+
+
+def test_segments_rotate_on_size_and_are_sealed(tmp_path):
+    writer = AuditStreamWriter(str(tmp_path), max_bytes=200, flush_s=0.01)
+    for i in range(10):
+        writer.emit({"event": "credit.decision", "i": i, "pad": "x" * 50})
+    writer.close()
+    segments = sorted(tmp_path.glob("audit-*.jsonl"))
+    assert len(segments) > 1
+    assert all(p.stat().st_size <= 200 for p in segments)
+    assert not any(p.stat().st_mode & 0o222 for p in segments)  # sealed read-only
+    assert [e["i"] for e in audit_events(tmp_path)] == list(range(10))
+
+
+def test_write_error_closes_and_seals_the_segment(tmp_path, monkeypatch):
+    handles = []
+
+    class FullDisk:
+        def __init__(self, f):
+            self.f = f
+
+        def write(self, data):
+            raise OSError(28, "No space left on device")
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+    def fake_open(*args, **kwargs):
+        handles.append(open(*args, **kwargs))
+        return FullDisk(handles[-1]) if len(handles) == 1 else handles[-1]
+
+    monkeypatch.setattr(audit_stream, "open", fake_open, raising=False)
+    writer = AuditStreamWriter(str(tmp_path), flush_s=0.01)
+    writer.emit({"event": "credit.decision", "i": 0})
+    writer.emit({"event": "credit.decision", "i": 1})
+    writer.close()
+
+    assert len(handles) == 2 and all(f.closed for f in handles)
+    segments = sorted(tmp_path.glob("audit-*.jsonl"))
+    assert len(segments) == 2
+    assert not any(p.stat().st_mode & 0o222 for p in segments)
+    assert [e["i"] for e in audit_events(tmp_path)] == [1]
+
+
+def test_stream_is_off_without_a_directory():
+    writer = AuditStreamWriter("")
+    writer.emit({"event": "credit.decision"})
+    assert not writer.enabled and writer._thread is None
+
+
+def test_decision_events_match_compute_metrics_and_flag_replays(tmp_path, monkeypatch):
+    writer = AuditStreamWriter(str(tmp_path), flush_s=0.01)
+    monkeypatch.setattr(audit_stream, "_writer", writer)
+    client = TestClient(api.app)
+    request = {**REQUEST, "order_id": f"A-{uuid.uuid4().hex[:8]}"}
+    first = client.post("/v1/credit/decision", json=request)
+    again = client.post("/v1/credit/decision", json=request)  # ERP retry
+    assert first.status_code == again.status_code == 200
+    writer.close()
+
+    events = audit_events(tmp_path)
+    assert [(e["event"], e["replayed"]) for e in events] == [("credit.decision", False), ("credit.decision", True)]
+    for event in events:
+        assert set(REQUIRED_COMMON) <= event.keys() and check_completeness(event)
+        assert event["response"] == first.json() and event["request"] == request
+        assert event["duration_ms"] >= 0
+
+    state = compute_state(expand_inputs([str(tmp_path)]))
+    assert (state.total, state.replayed, state.checked) == (1, 1, 1)
+    assert state.counts()["replayed"] == 1
@@ -0,0 +1,87 @@
+import uuid
+
+import app as api
+import audit_stream
+import db
+from audit_stream import AuditStreamWriter
+from replay_cache import DecisionReplayCache
+
+from conftest import REQUEST, audit_events
+
+
+def _orders(n: int) -> list:
+    prefix = uuid.uuid4().hex[:8]
+    return [{**REQUEST, "order_id": f"B-{prefix}-{i}", "order_value_eur": 1000.0 + i} for i in range(n)]
+
+
+def _logged_ids() -> list:
+    with db.engine.connect() as cx:
+        return [r[0] for r in cx.exec_driver_sql("SELECT decision_id FROM decision_logs ORDER BY id")]
+
+
+def test_batch_is_logged_in_one_transaction(api_client, monkeypatch):
+    groups = []
+    write = db._appender._write
+    monkeypatch.setattr(db._appender, "_write", lambda subs: groups.append([len(p) for p in subs]) or write(subs))
+
+    resp = api_client.post(api.BATCH_PATH, json={"requests": _orders(25)})
+    assert resp.status_code == 200
+    ids = [d["decision_id"] for d in resp.json()["decisions"]]
+    assert groups == [[25]]
+    assert _logged_ids() == ids
+
+
+def test_replay_flag_per_item(api_client, tmp_path, monkeypatch):
+    writer = AuditStreamWriter(str(tmp_path / "audit"), flush_s=0.01)
+    monkeypatch.setattr(audit_stream, "_writer", writer)
+    known, fresh, cached = _orders(3)
+    assert api_client.post("/v1/credit/decision", json=known).status_code == 200
+    assert api_client.post("/v1/credit/decision", json=cached).status_code == 200
+    monkeypatch.setattr(api, "_replay_cache", DecisionReplayCache())  # "known" is only in the log now
+    assert api_client.post("/v1/credit/decision", json=cached).status_code == 200  # back in the cache
+
+    batch = [known, fresh, cached, fresh]
+    resp = api_client.post(api.BATCH_PATH, json={"requests": batch})
+    writer.close()
+    assert resp.status_code == 200
+    decisions = resp.json()["decisions"]
+    assert decisions[1] == decisions[3]
+    assert len(_logged_ids()) == 3  # only the fresh order was new
+
+    events = audit_events(tmp_path / "audit")[-4:]
+    assert [e["request"]["order_id"] for e in events] == [r["order_id"] for r in batch]
+    assert [e["replayed"] for e in events] == [True, False, True, True]
+    assert all(e["batch_size"] == 4 for e in events)
+
+
+def test_db_error_rolls_back_the_whole_batch(api_client, monkeypatch):
+    assert api_client.post(api.BATCH_PATH, json={"requests": _orders(2)}).status_code == 200
+    before = _logged_ids()
+
+    def fail(cx, rows):
+        raise RuntimeError("disk I/O error")
+
+    with monkeypatch.context() as m:
+        m.setattr(db, "_record_resolutions", fail)  # runs after the INSERT, in the same transaction
+        orders = _orders(5)
+        resp = api_client.post(api.BATCH_PATH, json={"requests": orders})
+    assert resp.status_code == 400
+    assert _logged_ids() == before
+
+    # nothing was cached or half-written: the same batch logs completely afterwards
+    resp = api_client.post(api.BATCH_PATH, json={"requests": orders})
+    assert resp.status_code == 200
+    assert _logged_ids() == before + [d["decision_id"] for d in resp.json()["decisions"]]
+
+
+def test_batch_size_limits(api_client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BATCH_ITEMS", 3)
+    resp = api_client.post(api.BATCH_PATH, json={"requests": _orders(4)})
+    assert resp.status_code == 413 and "3 requests" in resp.json()["detail"]
+    assert api_client.post(api.BATCH_PATH, json={"requests": _orders(3)}).status_code == 200
+    assert api_client.post(api.BATCH_PATH, json={"requests": []}).status_code == 422
+
+    monkeypatch.setattr(api, "MAX_BATCH_BODY_BYTES", 500)
+    resp = api_client.post(api.BATCH_PATH, json={"requests": _orders(3)})
+    assert resp.status_code == 413 and resp.text == "Payload too large"
+    assert len(_logged_ids()) == 3
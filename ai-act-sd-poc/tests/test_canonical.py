@@ -0,0 +1,90 @@
+import json
+import random
+
+import pytest
+
+from backend import canonical
+
+# Request and decision id of row 2 in data/abb_6_1_decision_logs.csv
+GOLDEN_REQUEST = {
+    "order_id": "A-DEMO-55", "customer_id": "C-OK", "order_value_eur": 8000.0, "payment_terms_days": 30,
+    "overdue_ratio": 0.05, "dso_proxy_days": 28, "risk_class": "A", "country_risk": 2, "incoterm": "DDP",
+    "is_new_customer": False, "credit_limit_eur": 20000.0, "past_limit_breach": False, "express_flag": False,
+    "data_version": "dv1.0",
+}
+GOLDEN_REQUEST_JSON = (
+    '{"country_risk":2,"credit_limit_eur":20000.0,"customer_id":"C-OK","data_version":"dv1.0",'
+    '"dso_proxy_days":28,"express_flag":false,"incoterm":"DDP","is_new_customer":false,"order_id":"A-DEMO-55",'
+    '"order_value_eur":8000.0,"overdue_ratio":0.05,"past_limit_breach":false,"payment_terms_days":30,"risk_class":"A"}'
+)
+GOLDEN_DECISION_ID = "dec-54a93900dfc9c709cd4ab2d3ba1b47a1b4ceccbffba4c9275cb393faab795499"
+
+GOLDEN_ROW = {
+    "decision_id": GOLDEN_DECISION_ID, "ts_utc": "2025-11-13T18:08:29Z", "order_id": "A-DEMO-55",
+    "customer_id": "C-OK", "input_json": GOLDEN_REQUEST_JSON, "score": 50,
+    "thresholds_json": '{"allow_max":59,"review_range":[60,79],"block_min":80}', "decision": "ALLOW",
+    "rule_version": "rules_v1.2", "data_version": "dv1.0", "actor_sys": "credit_decision_api", "actor_ux": None,
+    "overridden": 0, "override_reason": None, "second_approval": 0,
+}
+GOLDEN_ROW_HASH = "e4e6c3b0ef1e5fa7174c07034e062687f9270351c378369673f154fbfad298d3"
+GOLDEN_OVERRIDE_HASH = "c318e6577d2f7a33fc86b05f14a75aa1bfc3cc72384f78058c8218107ebf6a53"
+
+GOLDEN_VALUES = [
+    (1e16, "1e+16"),
+    (1e-05, "1e-05"),
+    (12345678.9, "12345678.9"),
+    (-0.0, "-0.0"),
+    (float("nan"), "NaN"),
+    (float("inf"), "Infinity"),
+    (2 ** 64, "18446744073709551616"),
+    ({"b": [1, 2.5, None], "a": "ä \x00\t"}, '{"a":"ä \\u0000\\t","b":[1,2.5,null]}'),
+    ({"é": 1, "z": 2, "Z": 3, "😀": 4}, '{"Z":3,"z":2,"é":1,"😀":4}'),
+    ({1: "x"}, '{"1":"x"}'),
+]
+
+
+def _reference(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+@pytest.fixture(params=["fast", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "fast" and canonical.orjson is None:
+        pytest.skip("orjson not installed")
+    if request.param == "stdlib":
+        monkeypatch.setattr(canonical, "orjson", None)
+    return canonical
+
+
+def test_request_json_and_decision_id_are_stable(encoder):
+    assert encoder.request_json_and_id(GOLDEN_REQUEST) == (GOLDEN_REQUEST_JSON, GOLDEN_DECISION_ID)
+
+
+def test_row_hash_is_stable(encoder):
+    assert encoder.row_hash("", dict(GOLDEN_ROW, prev_hash="", row_hash=""), GOLDEN_ROW["ts_utc"]) == GOLDEN_ROW_HASH
+    override = dict(
+        GOLDEN_ROW, decision="BLOCK", actor_sys="oversight_ui", actor_ux="Prüferin ü", overridden=1,
+        override_reason='Zahlungsausfall "laut" Inkasso\n', second_approval=1,
+    )
+    assert encoder.row_hash(GOLDEN_ROW_HASH, override, "2025-11-14T08:00:00Z") == GOLDEN_OVERRIDE_HASH
+
+
+@pytest.mark.parametrize("value,expected", GOLDEN_VALUES)
+def test_edge_values_match_golden(encoder, value, expected):
+    assert encoder.dumps(value) == expected
+    assert encoder.dumps_bytes(value) == expected.encode("utf-8")
+
+
+def test_random_values_match_stdlib(encoder):
+    rnd = random.Random(13)
+    scalars = [
+        lambda: rnd.uniform(-1, 1) * 10 ** rnd.randint(-8, 20),
+        lambda: rnd.randint(-(2 ** 70), 2 ** 70),
+        lambda: "".join(chr(rnd.choice([rnd.randint(0, 0x7f), rnd.randint(0x80, 0xffff), rnd.randint(0x10000, 0x10ffff)]))
+                        for _ in range(rnd.randint(0, 8))).encode("utf-8", "ignore").decode("utf-8"),
+        lambda: rnd.choice([True, False, None]),
+    ]
+    for _ in range(3000):
+        obj = {f"k{rnd.randint(0, 50)}": rnd.choice(scalars)() for _ in range(rnd.randint(0, 6))}
+        obj["nested"] = [rnd.choice(scalars)() for _ in range(3)]
+        assert encoder.dumps(obj) == _reference(obj)
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine
+
+import db
+from canonical import row_hash
+from merkle import leaf_hash, merkle_root
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'governance.db'}"
+    engine = create_engine(url)
+    db.ensure_schema(engine)
+    engine.dispose()
+    return url
+
+
+def _payload(i: int, **extra) -> dict:
+    return {
+        "decision_id": f"dec-{i}", "ts_utc": f"2025-01-01T00:00:{i % 60:02d}Z", "order_id": f"O-{i}",
+        "customer_id": "C-1", "input_json": "{}", "score": i % 100, "thresholds_json": "{}",
+        "decision": "REVIEW", "rule_version": "rules_v1.2", "data_version": "dv1.0",
+        "actor_sys": "credit_decision_api", "actor_ux": None, "overridden": 0, "override_reason": None,
+        **extra,
+    }
+
+
+def _chain(url: str) -> list:
+    engine = create_engine(url)
+    with engine.connect() as cx:
+        rows = [dict(r) for r in cx.exec_driver_sql("SELECT * FROM decision_logs ORDER BY id").mappings()]
+    engine.dispose()
+    return rows
+
+
+def _assert_linked(rows: list) -> None:
+    head = ""
+    for row in rows:
+        payload = {k: v for k, v in row.items() if k not in ("id", "prev_hash", "row_hash")}
+        assert row["prev_hash"] == head
+        assert row["row_hash"] == row_hash(head, payload, row["ts_utc"])
+        head = row["row_hash"]
+
+
+def test_group_commit_links_all_submissions(db_url):
+    appender = db.ChainAppender(create_engine(db_url), max_batch=64, max_wait_s=0.05)
+    groups = []
+    write = appender._write
+    appender._write = lambda submissions: groups.append(len(submissions)) or write(submissions)
+
+    futures = [appender.submit([_payload(i)]) for i in range(40)]
+    assert [f.result(10) for f in futures] == [[_payload(i)["ts_utc"]] for i in range(40)]
+    assert sum(groups) == 40 and len(groups) < 40  # several submissions share one transaction
+
+    rows = _chain(db_url)
+    assert [r["decision_id"] for r in rows] == [f"dec-{i}" for i in range(40)]
+    _assert_linked(rows)
+
+
+def test_duplicate_base_rows_return_the_original_timestamp(db_url):
+    appender = db.ChainAppender(create_engine(db_url))
+    assert appender.append([_payload(1)]) == ["2025-01-01T00:00:01Z"]
+    again = _payload(1, ts_utc="2025-06-01T00:00:00Z")
+    assert appender.append([again, again]) == ["2025-01-01T00:00:01Z"] * 2
+    fresh = _payload(2, ts_utc="2025-01-01T00:00:01Z")  # same second as the original: status tells them apart
+    assert appender.submit([again, fresh, fresh], with_status=True).result(10) == [
+        ("2025-01-01T00:00:01Z", False), ("2025-01-01T00:00:01Z", True), ("2025-01-01T00:00:01Z", False)
+    ]
+    override = _payload(1, ts_utc="2025-06-01T00:00:00Z", overridden=1, decision="ALLOW")
+    assert appender.append([override]) == ["2025-06-01T00:00:00Z"]
+    assert len(_chain(db_url)) == 3
+
+
+def test_concurrent_appenders_keep_one_chain(db_url, monkeypatch):
+    # two appenders with their own engines stand in for two uvicorn worker processes
+    monkeypatch.setattr(db, "MERKLE_SEGMENT_SIZE", 8)
+    appenders = [db.ChainAppender(create_engine(db_url), max_wait_s=0.001) for _ in range(2)]
+    start = threading.Barrier(4)
+
+    def work(worker: int) -> None:
+        start.wait()
+        for i in range(15):
+            appenders[worker % 2].append([_payload(worker * 100 + i)])
+
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(work, range(4)))
+
+    rows = _chain(db_url)
+    assert len(rows) == 60
+    _assert_linked(rows)
+
+    engine = create_engine(db_url)
+    with engine.connect() as cx:
+        checkpoints = cx.exec_driver_sql(
+            "SELECT seq, first_id, last_id, root FROM merkle_checkpoints ORDER BY seq"
+        ).fetchall()
+    engine.dispose()
+    assert [(seq, first, last) for seq, first, last, _ in checkpoints] == [
+        (n + 1, 8 * n + 1, 8 * n + 8) for n in range(7)
+    ]
+    for _, first, last, root in checkpoints:
+        leaves = [leaf_hash(r["row_hash"]) for r in rows[first - 1:last]]
+        assert merkle_root(leaves).hex() == root
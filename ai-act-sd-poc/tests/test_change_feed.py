@@ -0,0 +1,36 @@
+import asyncio
+
+from backend import change_feed
+
+
+def test_stream_resumes_from_cursor_and_wakes_on_signal():
+    log = [{"id": i, "decision": "REVIEW"} for i in range(1, 4)]
+
+    async def fetch(after_id):
+        rows = [r for r in log if r["id"] > after_id]
+        return rows, (rows[-1]["id"] if rows else after_id)
+
+    async def run():
+        done = asyncio.Event()
+        chunks = []
+
+        async def consume():
+            async for chunk in change_feed.stream_events(fetch, 1, lambda: asyncio.sleep(0, done.is_set())):
+                chunks.append(chunk)
+                if len(chunks) == 3:
+                    done.set()
+
+        task = asyncio.create_task(consume())
+        while len(chunks) < 2:
+            await asyncio.sleep(0.01)
+        log.append({"id": 4, "decision": "BLOCK"})
+        change_feed.APPEND_SIGNAL.notify()
+        await asyncio.wait_for(task, 0.5)  # woken by the signal, not the poll interval
+        return chunks
+
+    chunks = asyncio.run(run())
+    assert chunks[0].startswith("retry:")
+    assert chunks[1] == 'id: 3\nevent: decisions\ndata: [{"id":2,"decision":"REVIEW"},{"id":3,"decision":"REVIEW"}]\n\n'
+    assert chunks[2].startswith("id: 4\n")
+    assert change_feed.parse_last_event_id(" 7 ") == 7
+    assert change_feed.parse_last_event_id("x") is None
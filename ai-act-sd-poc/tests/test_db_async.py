@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import weakref
+
+import pytest
+from sqlalchemy import create_engine
+
+import db
+
+
+def _payload(i: int, ts_utc: str = "2025-01-01T00:00:00Z") -> dict:
+    return {
+        "decision_id": f"dec-{i}", "ts_utc": ts_utc, "order_id": f"O-{i}", "customer_id": "C-1",
+        "input_json": "{}", "score": 65, "thresholds_json": "{}", "decision": "REVIEW",
+        "rule_version": "rules_v1.2", "data_version": "dv1.0", "actor_sys": "credit_decision_api",
+        "actor_ux": None, "overridden": 0, "override_reason": None,
+    }
+
+
+@pytest.fixture
+def log_db(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'governance.db'}"
+    engine = create_engine(url)
+    db.ensure_schema(engine)
+    monkeypatch.setattr(db, "engine", engine)
+    monkeypatch.setattr(db, "_appender", db.ChainAppender(engine))
+    monkeypatch.setattr(db, "ASYNC_DB_URL", db._async_url(url))
+    monkeypatch.setattr(db, "_async_engines", weakref.WeakKeyDictionary())
+    monkeypatch.setattr(db, "_async_engine_failed", False)
+    yield engine
+    engine.dispose()
+
+
+async def _round_trip(i: int) -> dict:
+    stored = await db.log_decision_async(_payload(i))
+    again = await db.log_decision_async(_payload(i, ts_utc="2025-06-01T00:00:00Z"))
+    row = await db.fetch_base_decision_async(f"dec-{i}")
+    missing = await db.fetch_base_decision_async("no-such-decision")
+    aengine = db._async_engines.get(asyncio.get_running_loop())
+    if aengine is not None:
+        await aengine.dispose()
+    return {"stored": stored, "again": again, "row": dict(row._mapping), "missing": missing, "engine": aengine}
+
+
+def _check(result: dict, i: int) -> None:
+    assert result["stored"] == result["again"] == "2025-01-01T00:00:00Z"  # duplicate keeps the original
+    assert result["missing"] is None
+    row = result["row"]
+    assert (row["decision_id"], row["order_id"], row["ts_utc"]) == (f"dec-{i}", f"O-{i}", "2025-01-01T00:00:00Z")
+    assert row["prev_hash"] is not None and row["row_hash"]
+
+
+def test_async_engine_per_event_loop(log_db):
+    pytest.importorskip("aiosqlite")
+    pytest.importorskip("greenlet")
+    first = asyncio.run(_round_trip(1))
+    second = asyncio.run(_round_trip(2))
+    _check(first, 1)
+    _check(second, 2)
+    assert first["engine"] is not None and second["engine"] is not None
+    assert first["engine"] is not second["engine"]  # pools are bound to their loop
+    assert not db._async_engine_failed
+
+
+def test_thread_fallback_without_async_driver(log_db, monkeypatch):
+    monkeypatch.setitem(sys.modules, "aiosqlite", None)  # import fails like a missing driver
+    threads = []
+    to_thread = asyncio.to_thread
+
+    async def spy(func, *args):
+        threads.append(func.__name__)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", spy)
+    result = asyncio.run(_round_trip(3))
+    _check(result, 3)
+    assert result["engine"] is None and db._async_engine_failed
+    assert threads == ["fetch_base_decision", "fetch_base_decision"]
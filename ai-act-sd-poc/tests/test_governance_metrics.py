@@ -0,0 +1,57 @@
+import json
+import sqlite3
+
+import pytest
+
+from tools.governance_metrics import governance_overview, snapshot_counts
+
+THRESHOLDS = json.dumps({"allow_max": 59, "review_range": [60, 79], "block_min": 80})
+REASON = "Kunde hat Sicherheiten nachgereicht"
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE decision_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, decision_id TEXT, ts_utc TEXT, input_json TEXT, score INTEGER,
+        thresholds_json TEXT, decision TEXT, actor_ux TEXT, overridden INTEGER DEFAULT 0,
+        override_reason TEXT, second_approval INTEGER DEFAULT 0)""")
+    rows = [
+        # decision_id, ts, input, score, decision, actor_ux, overridden, reason, second_approval
+        ("d1", "2025-01-01T10:00:00Z", '{"o":1}', 40, "ALLOW", None, 0, None, 0),
+        ("d2", "2025-01-01T10:00:00Z", '{"o":2}', 65, "REVIEW", None, 0, None, 0),
+        ("d3", "2025-01-01T11:00:00Z", '{"o":3}', 70, "REVIEW", None, 0, None, 0),
+        ("d3", "2025-01-02T09:00:00Z", '{"o":3}', 90, "BLOCK", None, 0, None, 0),
+        ("d2", "2025-01-01T10:30:00Z", '{"o":2}', 65, "ALLOW", "rev", 1, REASON, 1),
+        ("d2", "2025-01-01T10:40:00Z", '{"o":2}', 65, "BLOCK", "rev", 1, REASON, 1),
+        ("d3", "2025-01-01T13:00:00Z", '{"o":3}', 70, "ALLOW", None, 1, "kurz", 0),
+    ]
+    con.executemany(
+        "INSERT INTO decision_logs (decision_id, ts_utc, input_json, score, thresholds_json, decision, actor_ux,"
+        " overridden, override_reason, second_approval) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [r[:4] + (THRESHOLDS,) + r[4:] for r in rows],
+    )
+    return con
+
+
+def test_overview_uses_latest_override_for_queue_time(con):
+    gov = governance_overview(con)
+    assert gov["mix_counts"] == {"REVIEW": 2, "ALLOW": 1, "BLOCK": 1}
+    assert gov["base_total"] == 4
+    assert gov["override_pct"] == pytest.approx(75.0)
+    assert gov["four_eyes_pct"] == pytest.approx(200 / 3)
+    # d2: 40 min (latest override), d3: 120 min; p95 interpolates linearly
+    assert gov["queue_mean_min"] == pytest.approx(80.0)
+    assert gov["queue_p95_min"] == pytest.approx(116.0)
+
+
+def test_snapshot_counts_and_time_range(con):
+    counts = snapshot_counts(con)
+    assert (counts["total"], counts["allow"], counts["review"], counts["block"]) == (4, 1, 2, 1)
+    assert (counts["override_total"], counts["second_approval_true"]) == (3, 2)
+    assert (counts["complete"], counts["checked"]) == (6, 7)
+    assert counts["inconsistent"] == 1  # d3 first REVIEW, then BLOCK
+    assert counts["violations_threshold_coherence"] == 0
+    assert counts["edge_cnt"] == 1
+    day1 = snapshot_counts(con, "2025-01-01T00:00:00Z", "2025-01-01T23:59:59Z")
+    assert (day1["total"], day1["inconsistent"]) == (3, 0)
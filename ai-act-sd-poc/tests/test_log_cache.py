@@ -0,0 +1,65 @@
+import sqlite3
+
+from oversight_ui.log_cache import DecisionLogFrame
+
+
+def _create(path, rows):
+    con = sqlite3.connect(path)
+    con.execute("""CREATE TABLE decision_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, ts_utc TEXT, order_id TEXT, customer_id TEXT, score INTEGER,
+        decision TEXT, overridden INTEGER DEFAULT 0, second_approval INTEGER DEFAULT 0, rule_version TEXT,
+        data_version TEXT, row_hash TEXT)""")
+    _append(con, rows)
+    return con
+
+
+def _append(con, rows):
+    con.executemany(
+        "INSERT INTO decision_logs (ts_utc, order_id, decision, row_hash) VALUES (?, ?, ?, ?)",
+        [(ts, order_id, decision, f"h-{order_id}") for ts, order_id, decision in rows],
+    )
+    con.commit()
+
+
+def test_refresh_reads_only_new_rows(tmp_path):
+    db = tmp_path / "governance.db"
+    con = _create(db, [("2025-01-01T10:00:00Z", "A-1", "ALLOW"), ("2025-01-02T10:00:00Z", "A-2", "REVIEW")])
+    cache = DecisionLogFrame(db)
+    first = cache.refresh()
+    assert first["order_id"].tolist() == ["A-2", "A-1"]
+    assert cache.refresh() is first
+
+    _append(con, [("2025-01-01T12:00:00Z", "A-3", "BLOCK")])
+    second = cache.refresh()
+    assert cache.last_id == 3
+    assert second["order_id"].tolist() == ["A-2", "A-3", "A-1"]
+    assert len(first) == 2  # earlier frame untouched
+    con.close()
+
+
+def test_replaced_file_reloads_and_cap_falls_back(tmp_path):
+    db = tmp_path / "governance.db"
+    _create(db, [("2025-01-01T10:00:00Z", "A-1", "ALLOW"), ("2025-01-02T10:00:00Z", "A-2", "REVIEW")]).close()
+    cache = DecisionLogFrame(db)
+    assert len(cache.refresh()) == 2
+
+    replacement = tmp_path / "restored.db"
+    _create(replacement, [("2025-02-01T10:00:00Z", "B-1", "BLOCK")]).close()
+    replacement.replace(db)
+    assert cache.refresh()["order_id"].tolist() == ["B-1"]
+
+    assert DecisionLogFrame(db, max_rows=0).refresh() is None
+
+
+def test_apply_merges_feed_rows_that_continue_the_frame(tmp_path):
+    db = tmp_path / "governance.db"
+    con = _create(db, [("2025-01-01T10:00:00Z", "A-1", "ALLOW")])
+    cache = DecisionLogFrame(db)
+    cache.refresh()
+    _append(con, [("2025-01-02T10:00:00Z", "A-2", "REVIEW")])
+    row = {"id": 2, "ts_utc": "2025-01-02T10:00:00Z", "order_id": "A-2", "decision": "REVIEW", "row_hash": "h-A-2"}
+    assert not cache.apply([row], after_id=5)  # does not continue the frame: left to refresh()
+    assert cache.apply([row], after_id=1)
+    assert cache.last_id == 2
+    assert cache.refresh()["order_id"].tolist() == ["A-2", "A-1"]
+    con.close()
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import app as api
+import db
+import merkle
+from merkle import MerkleLog, audit_path, leaf_hash, load_proof, merkle_root, node_hash, verify_path
+
+ROOT = Path(__file__).resolve().parents[1]
+SIZES = (1, 2, 3, 5, 8, 9)
+
+
+def _leaves(n: int) -> list:
+    return [leaf_hash(f"row-{i}") for i in range(n)]
+
+
+def _reference_root(leaves: list) -> bytes:
+    # bottom-up RFC 6962 tree: an odd node is promoted unchanged to the next level
+    level = list(leaves)
+    while len(level) > 1:
+        level = [node_hash(level[i], level[i + 1]) if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def test_empty_tree_root():
+    assert merkle_root([]) == hashlib.sha256(b"").digest()
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_root_matches_reference_tree(n):
+    leaves = _leaves(n)
+    assert merkle_root(leaves) == _reference_root(leaves)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_every_audit_path_verifies(n):
+    leaves = _leaves(n)
+    root = merkle_root(leaves)
+    for i, leaf in enumerate(leaves):
+        path = audit_path(leaves, i)
+        assert len(path) <= max(0, (n - 1).bit_length())
+        assert verify_path(leaf, i, n, path, root)
+
+
+@pytest.mark.parametrize("n", SIZES)
+def test_tampered_leaf_or_path_is_rejected(n):
+    leaves = _leaves(n)
+    root = merkle_root(leaves)
+    for i, leaf in enumerate(leaves):
+        path = audit_path(leaves, i)
+        assert not verify_path(leaf_hash("forged"), i, n, path, root)
+        assert not verify_path(leaf, n, n, path, root)  # index outside the tree
+        if path:
+            assert not verify_path(leaf, i, n, path[:-1], root)
+            assert not verify_path(leaf, i, n, path + [path[-1]], root)
+            forged = path[:]
+            forged[0] = hashlib.sha256(forged[0]).digest()
+            assert not verify_path(leaf, i, n, forged, root)
+        if n > 1:
+            assert not verify_path(leaf, (i + 1) % n, n, path, root)
+
+
+def test_merkle_log_matches_the_recursive_definition():
+    leaves = _leaves(33)
+    log = MerkleLog()
+    for n, leaf in enumerate(leaves, 1):
+        log.append(leaf)
+        assert log.root() == merkle_root(leaves[:n])
+    for size in (*SIZES, 16, 17, 33):  # every prefix of the grown tree stays answerable
+        assert log.root(size) == merkle_root(leaves[:size])
+        assert all(log.path(i, size) == audit_path(leaves[:size], i) for i in range(size))
+    assert MerkleLog().root() == merkle_root([])
+
+
+def _payload(i: int) -> dict:
+    return {
+        "decision_id": f"dec-{i}", "ts_utc": f"2025-01-01T00:00:{i:02d}Z", "order_id": f"O-{i}",
+        "customer_id": "C-1", "input_json": json.dumps({"i": i}), "score": 60 + i, "thresholds_json": "{}",
+        "decision": "REVIEW", "rule_version": "rules_v1.2", "data_version": "dv1.0",
+        "actor_sys": "credit_decision_api", "actor_ux": None, "overridden": 0, "override_reason": None,
+    }
+
+
+@pytest.fixture
+def proof_db(tmp_path, monkeypatch):
+    # 11 rows with segments of 4: two checkpoints, the last three rows are still pending
+    path = tmp_path / "governance.db"
+    engine = create_engine(f"sqlite:///{path}")
+    db.ensure_schema(engine)
+    monkeypatch.setattr(db, "MERKLE_SEGMENT_SIZE", 4)
+    db.ChainAppender(engine).append([_payload(i) for i in range(11)])
+    monkeypatch.setattr(db, "engine", engine)
+    yield path
+    engine.dispose()
+
+
+def _cli(*args) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, str(ROOT / "tools" / "merkle_proof.py"), *args],
+                          capture_output=True, text=True, cwd=ROOT)
+
+
+def test_proof_endpoint_matches_cli(proof_db, tmp_path):
+    client = TestClient(api.app)
+    headers = {"X-Auth-Token": "reviewer@rittal"}
+
+    for i in (0, 3, 4, 7):  # first and last row of both segments
+        resp = client.get(f"/v1/credit/decisions/dec-{i}/proof", headers=headers)
+        assert resp.status_code == 200
+        proof = resp.json()
+        assert proof["segment"]["size"] == 4 and proof["log"]["size"] == 2
+
+        proof_file = tmp_path / f"proof-{i}.json"
+        proof_file.write_text(json.dumps(proof), encoding="utf-8")
+        from_api = _cli("--proof", str(proof_file), "--log-root", proof["log"]["root"])
+        local_file = tmp_path / f"local-{i}.json"
+        from_db = _cli("--db", str(proof_db), "--decision-id", f"dec-{i}", "--out", str(local_file))
+        assert from_api.returncode == from_db.returncode == 0, from_api.stdout + from_api.stderr
+        assert from_api.stdout == from_db.stdout
+        assert json.loads(local_file.read_text(encoding="utf-8")) == proof
+
+        proof["row"]["score"] += 1  # row content no longer matches its row_hash
+        proof_file.write_text(json.dumps(proof), encoding="utf-8")
+        assert _cli("--proof", str(proof_file)).returncode == 1
+
+    assert client.get("/v1/credit/decisions/dec-9/proof", headers=headers).status_code == 404  # pending
+    assert client.get("/v1/credit/decisions/missing/proof", headers=headers).status_code == 404
+    assert client.get("/v1/credit/decisions/dec-0/proof").status_code == 401
+
+
+def test_cli_rejects_forged_path_and_wrong_log_root(proof_db, tmp_path):
+    proof = TestClient(api.app).get("/v1/credit/decisions/dec-5/proof",
+                                    headers={"X-Auth-Token": "reviewer@rittal"}).json()
+    proof_file = tmp_path / "proof.json"
+
+    forged = {**proof, "segment_path": [hashlib.sha256(b"x").hexdigest()] + proof["segment_path"][1:]}
+    proof_file.write_text(json.dumps(forged), encoding="utf-8")
+    result = _cli("--proof", str(proof_file))
+    assert result.returncode == 1 and "not included in segment" in result.stdout
+
+    proof_file.write_text(json.dumps(proof), encoding="utf-8")
+    result = _cli("--proof", str(proof_file), "--log-root", "00" * 32)
+    assert result.returncode == 1 and "log_root differs" in result.stdout
+
+
+def test_proofs_read_only_new_checkpoints(proof_db, monkeypatch):
+    monkeypatch.setattr(merkle, "_LOG_TREES", {})
+    statements = []
+    con = sqlite3.connect(proof_db)
+    con.set_trace_callback(statements.append)
+    assert load_proof(con, "dec-0")["log"]["size"] == 2
+
+    db.ChainAppender(db.engine).append([_payload(i) for i in range(11, 25)])  # checkpoints 3..6
+    statements.clear()
+    proof = load_proof(con, "dec-1")
+    con.close()
+    checkpoint_reads = [s for s in statements if "FROM merkle_checkpoints" in s]
+    assert any("seq > 2 AND seq <= 6" in s for s in checkpoint_reads)
+    assert not any("ORDER BY seq" in s and "seq >" not in s and "LIMIT 1" not in s for s in checkpoint_reads)
+
+    # the incrementally extended tree gives the same path as one built from all checkpoints
+    engine = create_engine(f"sqlite:///{proof_db}")
+    with engine.connect() as cx:
+        roots = [leaf_hash(r) for (r,) in cx.exec_driver_sql("SELECT root FROM merkle_checkpoints ORDER BY seq")]
+    engine.dispose()
+    assert proof["log"]["size"] == 6
+    assert proof["log_path"] == [h.hex() for h in audit_path(roots, 0)]
+    assert merkle_root(roots).hex() == proof["log"]["root"]
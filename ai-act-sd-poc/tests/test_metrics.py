@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from backend.metrics import Counter, Histogram, Registry, _Metric
+
+
+def test_counter_sums_per_thread_shards():
+    c = Counter("t_total", "test", ("kind",))
+    child = c.labels("a")
+
+    def work():
+        for _ in range(10000):
+            child.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.render() == ["# HELP t_total test", "# TYPE t_total counter", 't_total{kind="a"} 80000']
+
+
+def test_histogram_exposition_is_cumulative():
+    reg = Registry()
+    h = reg.register(Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0)))
+    for v in (0.05, 0.1, 0.5, 3.0):
+        h.labels("score").observe(v)
+    unlabeled = reg.register(Counter("t_plain_total", "plain"))
+    assert reg.render().splitlines() == [
+        "# HELP t_seconds test",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{stage="score",le="0.1"} 2',
+        't_seconds_bucket{stage="score",le="1"} 3',
+        't_seconds_bucket{stage="score",le="+Inf"} 4',
+        't_seconds_sum{stage="score"} 3.65',
+        't_seconds_count{stage="score"} 4',
+        "# HELP t_plain_total plain",
+        "# TYPE t_plain_total counter",
+        "t_plain_total 0",
+    ]
+    unlabeled.inc(2)
+    assert reg.render().splitlines()[-1] == "t_plain_total 2"
+
+
+def test_metric_types_must_define_their_children():
+    class Gauge(_Metric):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Gauge("t_gauge", "test")
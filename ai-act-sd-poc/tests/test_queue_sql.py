@@ -0,0 +1,97 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from oversight_ui.queue_sql import page_sql, queue_filter_sql, summary_sql
+
+
+@pytest.fixture
+def con(chain_db):
+    chain_db(72)  # one row per hour over Jan 1-3; decisions cycle ALLOW/REVIEW/BLOCK
+    for order_id in ("PCT-10%", "PCTX10", "USC_10", "USCX10", "BS\\10"):
+        path = chain_db(1, order_id=order_id, ts_utc="2025-01-05T08:00:00Z")  # one shared timestamp
+    con = sqlite3.connect(path)
+    con.row_factory = sqlite3.Row
+    yield con
+    con.close()
+
+
+def _query(con, where: str, params: dict, limit: int = 1000, offset: int = 0) -> list:
+    return [r["id"] for r in con.execute(page_sql(where), {**params, "limit": limit, "offset": offset})]
+
+
+def _ids(con, review_only=False, decisions=(), search="", date_from=None, date_to=None, indexed=False) -> list:
+    where, params = queue_filter_sql(review_only, list(decisions), search, date_from, date_to, indexed)
+    return _query(con, where, params)
+
+
+def _expected(con, keep) -> list:
+    """Reference: filter all rows in Python and order them like the queue."""
+    rows = con.execute("SELECT * FROM decision_logs").fetchall()
+    return [r["id"] for r in sorted((r for r in rows if keep(r)), key=lambda r: (r["ts_utc"], r["id"]), reverse=True)]
+
+
+def _contains(row, term: str) -> bool:
+    return any(term.lower() in (row[c] or "").lower() for c in ("order_id", "customer_id", "override_reason"))
+
+
+def test_no_filter_lists_everything_newest_first(con):
+    assert queue_filter_sql(False, [], "  ", None, None) == ("", {})
+    ids = _ids(con)
+    assert ids[:5] == [77, 76, 75, 74, 73]  # shared ts_utc: id DESC
+    assert ids == _expected(con, lambda r: True)
+
+
+def test_each_filter(con):
+    assert _ids(con, review_only=True) == _expected(con, lambda r: r["decision"] == "REVIEW")
+    assert _ids(con, decisions=["ALLOW", "BLOCK"]) == _expected(con, lambda r: r["decision"] in ("ALLOW", "BLOCK"))
+    assert _ids(con, search="o-7") == _expected(con, lambda r: _contains(r, "o-7")) == [72, 71, 8]
+    assert _ids(con, date_from=date(2025, 1, 2), date_to=date(2025, 1, 2)) == _expected(
+        con, lambda r: r["ts_utc"].startswith("2025-01-02"))
+
+
+def test_filters_combine_with_and(con):
+    where, params = queue_filter_sql(True, ["REVIEW", "BLOCK"], "C-1", date(2025, 1, 2), date(2025, 1, 3))
+    assert where.count(" AND ") == 4  # review, decisions, search, day range (two bounds)
+    expected = _expected(con, lambda r: r["decision"] == "REVIEW" and _contains(r, "C-1")
+                         and "2025-01-02" <= r["ts_utc"][:10] <= "2025-01-03")
+    assert expected and _query(con, where, params) == expected
+    assert not _ids(con, review_only=True, decisions=["ALLOW"])  # REVIEW only AND ALLOW: nothing
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_like_metacharacters_match_literally(con, indexed):
+    assert _ids(con, search="%", indexed=indexed) == [73]
+    assert _ids(con, search="10%", indexed=indexed) == [73]
+    assert _ids(con, search="_", indexed=indexed) == [75]
+    assert _ids(con, search="C_1", indexed=indexed) == [75]  # not USCX10
+    assert _ids(con, search="\\", indexed=indexed) == [77]
+    assert _ids(con, search="PCT", indexed=indexed) == [74, 73]
+
+
+def test_date_to_covers_the_whole_utc_day(con):
+    where, params = queue_filter_sql(False, [], "", date(2025, 1, 1), date(2025, 1, 2))
+    assert (params["day_from"], params["day_after"]) == ("2025-01-01", "2025-01-03")
+    ids = _query(con, where, params)
+    assert ids[0] == 48 and ids[-1] == 1  # 2025-01-02T23:00:00Z is in, 2025-01-03T00:00:00Z (id 49) is not
+    assert 49 not in ids and len(ids) == 48
+    assert _ids(con, date_from=date(2025, 1, 5), date_to=date(2025, 1, 5)) == [77, 76, 75, 74, 73]
+    assert not _ids(con, date_from=date(2025, 1, 4), date_to=date(2025, 1, 4))
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 3, 4, 7])
+def test_pages_are_stable_across_boundaries(con, page_size):
+    where, params = queue_filter_sql(False, ["ALLOW", "BLOCK"], "", None, None)
+    everything = _query(con, where, params)
+    pages = [_query(con, where, params, page_size, offset) for offset in range(0, len(everything), page_size)]
+    assert all(len(p) == page_size for p in pages[:-1]) and 0 < len(pages[-1]) <= page_size
+    assert [i for p in pages for i in p] == everything  # no row skipped or repeated, ties included
+    assert _query(con, where, params, page_size, len(everything)) == []
+
+
+def test_summary_matches_the_filter(con):
+    where, params = queue_filter_sql(False, ["REVIEW", "BLOCK"], "", date(2025, 1, 1), date(2025, 1, 1))
+    row = con.execute(summary_sql(where), params).fetchone()
+    assert row["total"] == 16 and row["review_open"] == 8 and row["override_cnt"] == 0
+    assert row["latest"] == "2025-01-01T23:00:00Z"
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+import ratelimit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_limiter(request, tmp_path):
+    def make(max_keys: int = 100):
+        if request.param == "memory":
+            return ratelimit.MemoryLimiter(max_keys)
+        limiter = ratelimit.SQLiteLimiter(str(tmp_path / "ratelimit.db"), max_keys)
+        limiter.SWEEP_EVERY = 1  # enforce the cap on every call
+        return limiter
+
+    make.backend = request.param
+    return make
+
+
+def _count(limiter) -> int:
+    if isinstance(limiter, ratelimit.MemoryLimiter):
+        return len(limiter)
+    return limiter._connect().execute("SELECT COUNT(*) FROM gcra").fetchone()[0]
+
+
+def test_burst_then_reject(clock, make_limiter):
+    limiter = make_limiter()
+    assert [limiter.allow("k", 1.0, 3) for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("other", 1.0, 3)  # keys are independent
+
+
+def test_refill_at_rate(clock, make_limiter):
+    limiter = make_limiter()
+    assert all(limiter.allow("k", 2.0, 2) for _ in range(2))
+    assert not limiter.allow("k", 2.0, 2)
+    clock.now += 0.5  # one token back
+    assert limiter.allow("k", 2.0, 2)
+    assert not limiter.allow("k", 2.0, 2)
+    clock.now += 10  # idle: full burst again, never more
+    assert [limiter.allow("k", 2.0, 2) for _ in range(3)] == [True, True, False]
+    assert not limiter.allow("k", 0, 5)
+
+
+def test_key_cap_drops_the_most_replenished_keys(clock, make_limiter):
+    limiter = make_limiter(max_keys=3)
+    for key in ("a", "b", "c"):
+        assert limiter.allow(key, 1.0, 5)
+    for _ in range(3):
+        assert limiter.allow("a", 1.0, 5)  # "a" is the only key with used-up state
+    clock.now += 2  # "b" and "c" are idle now
+    assert limiter.allow("d", 1.0, 5)
+    assert limiter.allow("e", 1.0, 5)
+    assert _count(limiter) <= 3
+    # "a" survived eviction: its burst is still partly consumed
+    assert [limiter.allow("a", 1.0, 5) for _ in range(4)] == [True, True, True, False]
+
+
+def test_memory_heap_stays_bounded(clock):
+    limiter = ratelimit.MemoryLimiter(max_keys=10)
+    for i in range(5_000):
+        clock.now += 0.001
+        limiter.allow(f"k{i % 50}", 100.0, 10)
+    assert len(limiter) == 10
+    assert len(limiter._heap) <= 2 * 10 + 64 + 1
+
+
+def test_allow_async_matches_allow(clock, make_limiter):
+    limiter = make_limiter()
+
+    async def run():
+        return [await limiter.allow_async("k", 1.0, 2) for _ in range(3)]
+
+    assert asyncio.run(run()) == [True, True, False]
+
+
+def test_role_quotas_from_env(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_ROLES_JSON", '{"Admin": {"rate": 20, "burst": 40}, "reviewer": {"rate": 2}}')
+    quotas = ratelimit._load_role_quotas()
+    assert quotas["admin"] == (20.0, 40.0)
+    assert quotas["reviewer"] == (2.0, ratelimit.RATE_LIMIT_BURST)
+
+
+@pytest.mark.parametrize("raw", ["{not json", "[1, 2]", '{"admin": 20}', '{"admin": {"rate": "fast"}}'])
+def test_malformed_role_quotas_fail_fast(monkeypatch, raw):
+    monkeypatch.setenv("RATE_LIMIT_ROLES_JSON", raw)
+    with pytest.raises(RuntimeError, match="RATE_LIMIT_ROLES_JSON"):
+        ratelimit._load_role_quotas()
@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+
+import app as api
+import db
+from replay_cache import DecisionReplayCache
+
+from conftest import REQUEST
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """decision_ids looked up in the log (replay cache misses)."""
+    seen = []
+    fetch = api.fetch_base_decision_async
+
+    async def spy(decision_id):
+        seen.append(decision_id)
+        return await fetch(decision_id)
+
+    monkeypatch.setattr(api, "fetch_base_decision_async", spy)
+    return seen
+
+
+def _order(**changes) -> dict:
+    return {**REQUEST, "order_id": f"R-{uuid.uuid4().hex[:8]}", **changes}
+
+
+def _row_count() -> int:
+    with db.engine.connect() as cx:
+        return cx.exec_driver_sql("SELECT COUNT(*) FROM decision_logs").scalar()
+
+
+def test_cache_hit_answers_without_the_log(api_client, lookups):
+    order = _order()
+    first = api_client.post("/v1/credit/decision", json=order)
+    again = api_client.post("/v1/credit/decision", json=order)
+    assert first.status_code == again.status_code == 200
+    assert lookups == [first.json()["decision_id"]]  # only the first request missed
+    assert again.content == first.content
+    assert _row_count() == 1
+
+
+def test_miss_rebuilds_the_response_from_the_stored_row(api_client, lookups, monkeypatch):
+    order = _order(overdue_ratio=0.4, is_new_customer=True)  # a rationale other than the default
+    first = api_client.post("/v1/credit/decision", json=order)
+    monkeypatch.setattr(api, "_replay_cache", DecisionReplayCache())  # e.g. another worker or a restart
+
+    again = api_client.post("/v1/credit/decision", json=order)
+    assert lookups == [first.json()["decision_id"]] * 2
+    assert again.content == first.content  # byte for byte, incl. timestamp and rationale
+    assert _row_count() == 1
+    assert len(api._replay_cache) == 1  # rebuilt responses are cached again
+
+
+def test_evicted_entries_fall_back_to_the_log(api_client, lookups, monkeypatch):
+    monkeypatch.setattr(api, "_replay_cache", DecisionReplayCache(maxsize=1))
+    a, b = _order(), _order()
+    first_a = api_client.post("/v1/credit/decision", json=a)
+    api_client.post("/v1/credit/decision", json=b)  # evicts a
+    assert len(api._replay_cache) == 1
+
+    again = api_client.post("/v1/credit/decision", json=a)
+    assert lookups.count(first_a.json()["decision_id"]) == 2
+    assert again.content == first_a.content
+    assert _row_count() == 2
+
+
+def test_lru_keeps_recently_used_entries():
+    cache = DecisionReplayCache(maxsize=2)
+    cache.put("a", "v1", "A")
+    cache.put("b", "v1", "B")
+    assert cache.get("a", "v1") == "A"  # a is now the most recent
+    cache.put("c", "v1", "C")
+    assert (cache.get("a", "v1"), cache.get("b", "v1"), cache.get("c", "v1")) == ("A", None, "C")
+    assert cache.get("a", "other-rules") is None  # keyed by rule_version too
+
+    off = DecisionReplayCache(maxsize=0)
+    off.put("a", "v1", "A")
+    assert off.get("a", "v1") is None and len(off) == 0
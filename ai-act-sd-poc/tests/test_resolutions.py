@@ -0,0 +1,71 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from backend import resolutions
+from tools.governance_metrics import queue_time_minutes
+
+REASON = "Kunde hat Sicherheiten nachgereicht"
+NOW = datetime(2025, 1, 2, 12, 0, tzinfo=timezone.utc)
+COLUMNS = ("decision_id", "ts_utc", "decision", "actor_ux", "overridden", "override_reason", "second_approval")
+BASE_ROWS = [
+    ("d1", "2025-01-01T10:00:00Z", "ALLOW", None, 0, None, 0),
+    ("d2", "2025-01-01T10:00:00Z", "REVIEW", None, 0, None, 0),
+    ("d3", "2025-01-01T11:00:00Z", "REVIEW", None, 0, None, 0),
+    ("d4", "2025-01-02T09:00:00Z", "REVIEW", None, 0, None, 0),
+]
+# the second d2 override is dated before the first one and must not replace it
+OVERRIDE_ROWS = [
+    ("d2", "2025-01-01T10:40:00Z", "BLOCK", "rev", 1, REASON, 1),
+    ("d2", "2025-01-01T10:30:00Z", "ALLOW", "adm", 1, REASON, 0),
+    ("d3", "2025-01-01T13:00:00Z", "ALLOW", "rev", 1, REASON, 0),
+    ("d1", "2025-01-01T12:00:00Z", "BLOCK", "rev", 1, REASON, 0),
+]
+
+
+def _connect():
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE decision_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, decision_id TEXT, ts_utc TEXT, decision TEXT, actor_ux TEXT,
+        overridden INTEGER DEFAULT 0, override_reason TEXT, second_approval INTEGER DEFAULT 0)""")
+    return con
+
+
+def _insert(con, rows):
+    con.executemany(
+        f"INSERT INTO decision_logs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows,
+    )
+
+
+@pytest.fixture
+def backfilled():
+    con = _connect()
+    _insert(con, BASE_ROWS + OVERRIDE_ROWS)
+    resolutions.ensure_resolutions(con)
+    return con
+
+
+def test_appender_statements_match_backfill(backfilled):
+    con = _connect()
+    resolutions.ensure_resolutions(con)
+    for row in BASE_ROWS + OVERRIDE_ROWS:
+        _insert(con, [row])
+        params = dict(zip(COLUMNS, row))
+        if params["overridden"]:
+            con.execute(resolutions.APPLY_OVERRIDE_SQL, params)
+        elif params["decision"] == "REVIEW":
+            con.execute(resolutions.OPEN_REVIEW_SQL, params)
+    query = "SELECT * FROM review_resolutions ORDER BY decision_id"
+    assert con.execute(query).fetchall() == backfilled.execute(query).fetchall()
+    assert con.execute(
+        "SELECT first_override_ts, last_override_ts, override_count, second_approval, resolved_by"
+        " FROM review_resolutions WHERE decision_id = 'd2'"
+    ).fetchone() == ("2025-01-01T10:30:00Z", "2025-01-01T10:40:00Z", 2, 1, "rev")
+
+
+def test_review_sla(backfilled):
+    sla = resolutions.review_sla(backfilled, now=NOW)
+    assert (sla["resolved"], sla["open"]) == (2, 1)
+    assert (sla["queue_mean_min"], sla["queue_p95_min"]) == pytest.approx(queue_time_minutes(backfilled))
+    assert sla["oldest_open"] == {"decision_id": "d4", "base_ts_utc": "2025-01-02T09:00:00Z", "age_min": 180.0}
@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+
+from conftest import REQUEST
+from tools import rollups
+from tools.governance_metrics import governance_overview
+
+THRESHOLDS = json.dumps({"allow_max": 59, "review_range": [60, 79], "block_min": 80})
+REASON = "Kunde hat Sicherheiten nachgereicht"
+
+
+def _insert(con, rows):
+    con.executemany(
+        "INSERT INTO decision_logs (decision_id, ts_utc, input_json, score, thresholds_json, decision, actor_ux,"
+        " overridden, override_reason, second_approval) VALUES (?, ?, '{}', ?, ?, ?, ?, ?, ?, ?)",
+        [r[:3] + (THRESHOLDS,) + r[3:] for r in rows],
+    )
+    con.commit()
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE decision_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, decision_id TEXT, ts_utc TEXT, input_json TEXT, score INTEGER,
+        thresholds_json TEXT, decision TEXT, actor_ux TEXT, overridden INTEGER DEFAULT 0,
+        override_reason TEXT, second_approval INTEGER DEFAULT 0)""")
+    _insert(con, [
+        # decision_id, ts, score, decision, actor_ux, overridden, reason, second_approval
+        ("d1", "2025-01-01T10:00:00Z", 40, "ALLOW", None, 0, None, 0),
+        ("d2", "2025-01-01T10:00:00Z", 65, "REVIEW", None, 0, None, 0),
+        ("d3", "2025-01-01T11:00:00Z", 70, "REVIEW", None, 0, None, 0),
+        ("d2", "2025-01-01T10:30:00Z", 65, "ALLOW", "rev", 1, REASON, 1),
+    ])
+    return con
+
+
+def test_catch_up_is_incremental_and_matches_direct_sql(con):
+    assert rollups.catch_up(con) == 4
+    assert rollups.rollup_overview(con)["queue_mean_min"] == pytest.approx(30.0)
+    # a later override of d2 replaces its queue time, d3 gets its first one
+    _insert(con, [
+        ("d2", "2025-01-01T11:00:00Z", 65, "BLOCK", "rev", 1, REASON, 0),
+        ("d3", "2025-01-02T12:00:00Z", 70, "ALLOW", "rev", 1, REASON, 1),
+        ("d4", "2025-01-02T12:00:00Z", 95, "BLOCK", None, 0, None, 0),
+    ])
+    assert rollups.catch_up(con, batch_rows=2) == 3
+    assert rollups.catch_up(con) == 0
+    assert rollups.verify(con) == []
+    overview = rollups.rollup_overview(con)
+    assert overview["queue_mean_min"] == pytest.approx(governance_overview(con)["queue_mean_min"])
+    assert overview["mix_counts"] == {"REVIEW": 2, "ALLOW": 1, "BLOCK": 1}
+
+    day2 = rollups.rollup_snapshot_counts(con, "2025-01-02T00:00:00Z", "2025-01-02T23:59:59Z")
+    assert (day2["total"], day2["override_total"]) == (1, 1)
+    assert rollups.timeline(con, decisions=["BLOCK"]) == [("2025-01-01", "BLOCK", 1), ("2025-01-02", "BLOCK", 1)]
+
+    before = rollups.rollup_snapshot_counts(con)
+    assert rollups.rebuild(con) == 7
+    assert rollups.rollup_snapshot_counts(con) == before
+
+
+def test_rollup_lag_counts_pending_ids(con):
+    rollups.ensure_schema(con)
+    assert rollups.rollup_lag(con) == (4, None)
+    rollups.catch_up(con)
+    pending, updated_utc = rollups.rollup_lag(con)
+    assert pending == 0 and updated_utc
+    _insert(con, [("d4", "2025-01-02T09:00:00Z", 10, "ALLOW", None, 0, None, 0)])
+    assert rollups.rollup_lag(con)[0] == 1
+
+
+def test_backend_worker_follows_appender_groups(tmp_path):
+    import db
+    from rollup_worker import RollupWorker
+
+    path = tmp_path / "governance.db"
+    engine = create_engine(f"sqlite:///{path}")
+    db.ensure_schema(engine)
+    worker = RollupWorker(str(path), interval_s=0.01, batch_rows=3)
+    appender = db.ChainAppender(engine, on_commit=worker.notify)
+    for i in range(10):
+        appender.append([{
+            "decision_id": f"dec-{i}", "ts_utc": f"2025-01-01T0{i % 3}:00:00Z", "order_id": f"O-{i}",
+            "customer_id": "C-1", "input_json": "{}", "score": 60 + i, "thresholds_json": THRESHOLDS,
+            "decision": "REVIEW", "rule_version": "rules_v1.2", "data_version": "dv1.0",
+            "actor_sys": "credit_decision_api", "actor_ux": None, "overridden": 0, "override_reason": None,
+        }])
+
+    deadline = time.monotonic() + 10
+    with sqlite3.connect(path) as reader:
+        while not (rollups.has_rollups(reader) and rollups.rollup_lag(reader)[0] == 0):
+            assert time.monotonic() < deadline, "rollups did not catch up"
+            time.sleep(0.02)
+        assert rollups.verify(reader) == []
+    engine.dispose()
+
+
+def test_importing_db_starts_no_rollup_worker(tmp_path):
+    script = "import threading, db; print(sorted(t.name for t in threading.enumerate()))"
+    env = {**os.environ, "DB_URL": f"sqlite:///{tmp_path / 'governance.db'}"}
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env,
+                            cwd=Path(__file__).resolve().parents[1] / "backend")
+    assert result.returncode == 0, result.stderr
+    assert "kpi-rollup-worker" not in result.stdout
+    with sqlite3.connect(tmp_path / "governance.db") as reader:
+        assert not rollups.has_rollups(reader)
+
+
+def test_app_startup_keeps_rollups_current(api_client, tmp_path, monkeypatch):
+    import db
+
+    monkeypatch.setattr(db, "_rollup_worker", None)
+    with api_client:  # runs the lifespan startup hook
+        resp = api_client.post("/v1/credit/decision", json={**REQUEST, "order_id": "SO-ROLLUP-1"},
+                               headers={"X-Auth-Token": "reviewer@rittal"})
+        assert resp.status_code == 200
+        deadline = time.monotonic() + 10
+        with sqlite3.connect(tmp_path / "governance.db") as reader:
+            while not (rollups.has_rollups(reader) and rollups.rollup_lag(reader)[0] == 0):
+                assert time.monotonic() < deadline, "rollups did not catch up"
+                time.sleep(0.05)
+            assert rollups.rollup_snapshot_counts(reader)["total"] == 1
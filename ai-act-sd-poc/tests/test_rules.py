@@ -0,0 +1,60 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from backend.rules import RULE_VERSION, compile_rules, np, score_and_decision, score_and_decision_batch
+
+
+def _request_for_mask(mask: int) -> SimpleNamespace:
+    # One concrete request per predicate combination (bit order as in the compiled table)
+    return SimpleNamespace(
+        overdue_ratio=0.3 if mask & 1 else 0.1,
+        order_value_eur=60000.0 if mask & 2 else 8000.0,
+        risk_class="D" if mask & 4 else "A",
+        country_risk=5 if mask & 8 else 2,
+        is_new_customer=bool(mask & 16),
+        past_limit_breach=bool(mask & 32),
+        incoterm="EXW" if mask & 64 else "DDP",
+        payment_terms_days=30,
+        dso_proxy_days=35 if mask & 128 else 45,
+    )
+
+
+def _random_request(rnd: random.Random) -> SimpleNamespace:
+    return SimpleNamespace(
+        overdue_ratio=rnd.choice([0.0, 0.24, 0.25, 0.9]),
+        order_value_eur=rnd.choice([0.0, 49999.99, 50000.0, 120000.0]),
+        risk_class=rnd.choice("ABCD"),
+        country_risk=rnd.randint(1, 5),
+        is_new_customer=rnd.random() < 0.5,
+        past_limit_breach=rnd.random() < 0.5,
+        incoterm=rnd.choice(["EXW", "DDP", "DAP", "FCA", "CPT"]),
+        payment_terms_days=rnd.choice([14, 30, 60]),
+        dso_proxy_days=rnd.randint(0, 90),
+    )
+
+
+def test_compiled_table_matches_reference_exhaustively():
+    compiled = compile_rules(RULE_VERSION)
+    assert len(compiled.scores) == 2 ** (len(compiled.predicates) + 1)
+    for mask in range(len(compiled.scores)):
+        req = _request_for_mask(mask)
+        assert compiled.mask(req) == mask
+        assert compiled.evaluate(req) == score_and_decision(req)
+
+
+def test_batch_matches_reference_on_random_requests():
+    rnd = random.Random(7)
+    reqs = [_random_request(rnd) for _ in range(2000)]
+    assert score_and_decision_batch(reqs) == [score_and_decision(r) for r in reqs]
+
+
+@pytest.mark.skipif(np is None, reason="numpy not installed")
+def test_column_evaluation_matches_reference():
+    rnd = random.Random(11)
+    reqs = [_random_request(rnd) for _ in range(500)]
+    compiled = compile_rules(RULE_VERSION)
+    columns = {f: np.asarray([getattr(r, f) for r in reqs]) for f in compiled.column_fields()}
+    scores, decisions, rationales = compiled.evaluate_columns(columns)
+    assert list(zip(scores.tolist(), decisions.tolist(), rationales.tolist())) == [score_and_decision(r) for r in reqs]
@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+from backend import search
+
+REASON = "Kunde hat Sicherheiten nachgereicht"
+
+
+def _insert(con, rows):
+    con.executemany(
+        "INSERT INTO decision_logs (decision_id, order_id, customer_id, overridden, override_reason)"
+        " VALUES (?, ?, ?, ?, ?)",
+        rows,
+    )
+
+
+@pytest.fixture
+def con():
+    con = sqlite3.connect(":memory:")
+    con.execute("""CREATE TABLE decision_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, decision_id TEXT, order_id TEXT, customer_id TEXT,
+        overridden INTEGER DEFAULT 0, override_reason TEXT)""")
+    _insert(con, [
+        ("d1", "A-100", "C-OK", 0, None),
+        ("d2", "A-1001", "C-RISK", 0, None),
+    ])
+    # existing rows are indexed once, later rows by the insert trigger
+    assert search.ensure_search_index(con)
+    _insert(con, [
+        ("d3", "XA-100", "C-OK", 0, None),
+        ("d2", "A-1001", "C-RISK", 1, REASON),
+    ])
+    return con
+
+
+def test_search_ranks_exact_then_prefix_then_substring(con):
+    assert search.search(con, "a-100") == ["d1", "d2", "d3"]
+    assert search.search(con, "A-100", limit=1) == ["d1"]
+    assert search.search(con, "sicherheiten") == ["d2"]
+    assert search.search(con, "c-ok") == ["d3", "d1"]  # equal rank: newest first
+    assert search.search(con, "   ") == []
+
+
+def test_short_terms_and_missing_index_fall_back_to_like(con):
+    for term in ("XA", "risk", "100%"):
+        indexed_sql, params = search.match_sql(term)
+        like_sql, like_params = search.match_sql(term, indexed=False)
+        assert sorted(con.execute(indexed_sql, params).fetchall()) == sorted(con.execute(like_sql, like_params).fetchall())
+    assert search.match_sql("XA")[0].startswith("SELECT id FROM decision_logs")
@@ -0,0 +1,33 @@
+import random
+
+from sketches import QuantileSketch
+
+
+def test_quantiles_within_relative_error():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1.5) for _ in range(20000)]
+    sketch = QuantileSketch(alpha=0.01)
+    for v in values:
+        sketch.add(v)
+    ordered = sorted(values)
+    for q in (0.0, 0.5, 0.9, 0.95, 0.99, 1.0):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+
+def test_merge_equals_single_sketch():
+    rng = random.Random(11)
+    values = [rng.uniform(0, 500) for _ in range(5000)] + [0.0] * 10
+    whole = QuantileSketch()
+    parts = [QuantileSketch() for _ in range(4)]
+    for i, v in enumerate(values):
+        whole.add(v)
+        parts[i % 4].add(v)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    assert merged.count == whole.count
+    assert merged.buckets == whole.buckets
+    for q in (0.01, 0.5, 0.95):
+        assert merged.quantile(q) == whole.quantile(q)
+    assert QuantileSketch().quantile(0.5) is None
@@ -0,0 +1,114 @@
+import pytest
+
+from conftest import tamper_row
+from tools import verify_audit
+from tools.verify_audit import load_watermark, verify_db
+
+
+def test_watermark_makes_runs_incremental(chain_db, tmp_path):
+    db_path = chain_db(30)
+    state = tmp_path / "verify.json"
+    assert verify_db(db_path, state) == (True, "OK (30 rows)", 30)
+    assert load_watermark(state)["last_id"] == 30
+
+    chain_db(12)
+    assert verify_db(db_path, state) == (True, "OK (12 new rows after id=30, 42 verified in total)", 12)
+    assert verify_db(db_path, state) == (True, "OK (0 new rows after id=42, 42 verified in total)", 0)
+    assert load_watermark(state)["verified_rows"] == 42
+
+
+def test_interrupted_run_resumes_after_the_last_batch(chain_db, tmp_path, monkeypatch):
+    db_path = chain_db(30)
+    state = tmp_path / "verify.json"
+    calls = []
+    check_chain = verify_audit.check_chain
+
+    def interrupted(entries, prev, label):
+        calls.append(1)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return check_chain(entries, prev, label)
+
+    with monkeypatch.context() as m:
+        m.setattr(verify_audit, "check_chain", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            verify_db(db_path, state, batch_size=7)
+    assert load_watermark(state)["last_id"] == 14  # two batches were committed
+
+    assert verify_db(db_path, state, batch_size=7) == (True, "OK (16 new rows after id=14, 30 verified in total)", 16)
+
+
+def test_tampering_before_and_after_the_watermark(chain_db, tmp_path):
+    db_path = chain_db(20)
+    state = tmp_path / "verify.json"
+    assert verify_db(db_path, state)[0]
+    chain_db(10)
+
+    tamper_row(db_path, 25)  # after the watermark: the incremental run finds it
+    ok, msg, count = verify_db(db_path, state)
+    assert not ok and msg.startswith("Mismatch at row id=25") and count == 4
+    assert load_watermark(state)["last_id"] == 24
+
+    tamper_row(db_path, 5)  # before the watermark: only a full run re-reads it
+    assert verify_db(db_path, state)[1].startswith("Mismatch at row id=25")
+
+    tamper_row(db_path, 24, "row_hash = 'forged'")  # the watermark row itself
+    assert verify_db(db_path, state) == (False, "Watermark row id=24 changed since last run (use --full)", 0)
+
+    ok, msg, _ = verify_db(db_path, state, full=True)
+    assert not ok and msg.startswith("Mismatch at row id=5")
+
+
+def _parallel(**kw):
+    return {"workers": 2, "chunk_size": 6, **kw}
+
+
+@pytest.mark.parametrize("tampered", [None, 1, 6, 7, 23, 40])
+def test_db_serial_and_parallel_agree(chain_db, tampered):
+    db_path = chain_db(40)
+    if tampered:
+        tamper_row(db_path, tampered)
+    serial = verify_db(db_path, None)
+    assert serial[0] == (tampered is None)
+    assert verify_db(db_path, None, **_parallel()) == serial
+
+
+def test_parallel_db_run_keeps_the_watermark(chain_db, tmp_path):
+    db_path = chain_db(25)
+    state = tmp_path / "verify.json"
+    assert verify_db(db_path, state, **_parallel()) == (True, "OK (25 rows)", 25)
+    chain_db(5)
+    tamper_row(db_path, 28)
+    assert verify_db(db_path, state, **_parallel())[1].startswith("Mismatch at row id=28")
+    assert load_watermark(state)["last_id"] == 27
+
+
+def test_parallel_db_run_reports_progress(chain_db, capsys):
+    db_path = chain_db(30)
+    verify_db(db_path, None, progress_every=1e-9)
+    serial = capsys.readouterr().err.splitlines()
+    verify_db(db_path, None, progress_every=1e-9, **_parallel())
+    parallel = capsys.readouterr().err.splitlines()
+    assert len(parallel) > 1
+    assert serial[-1].startswith("verified 30 rows (id<=30)") and parallel[-1].startswith("verified 30 rows (id<=30)")
+
+
+def _export(db_path, out):
+    from tools.export_log import export_csv
+
+    export_csv(out, db_path, None, None, compress="gzip" if out.suffix == ".gz" else None)
+    return out
+
+
+@pytest.mark.parametrize("name", ["log.csv", "log.csv.gz"])
+def test_csv_serial_and_parallel_agree(chain_db, tmp_path, name):
+    db_path = chain_db(40)
+    clean = _export(db_path, tmp_path / name)
+    assert verify_audit.verify_csv(clean) == (True, "OK (40 rows)", 40)
+    assert verify_audit.verify_csv(clean, **_parallel()) == (True, "OK (40 rows)", 40)
+
+    tamper_row(db_path, 17)
+    tampered = _export(db_path, tmp_path / f"tampered-{name}")
+    serial = verify_audit.verify_csv(tampered)
+    assert not serial[0] and serial[1].startswith("Mismatch at CSV row id=17") and serial[2] == 16
+    assert verify_audit.verify_csv(tampered, **_parallel()) == serial
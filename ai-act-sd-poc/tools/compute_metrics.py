@@ -1,17 +1,48 @@
-"""Compute metrics snapshot from an audit log (JSONL).
-Stdlib only. Default input: docs/examples/audit_log_example.jsonl
+"""Compute metrics snapshot from audit logs (JSONL).
+Stdlib only (orjson is used for parsing if installed). Default input: docs/examples/audit_log_example.jsonl
+With --source db the same columns are computed by aggregate SQL on decision_logs
+(tools/governance_metrics.py), with --source rollup from the incrementally
+maintained hourly/daily rollups (tools/rollups.py, ranges widened to whole
+hours); latencies are NA there, the table has none.
 Output: data/metrics_snapshot.csv with required columns.
+
+Single streaming pass: every event updates a MetricsState (counters, a
+mergeable latency sketch, and a request-digest map for the determinism check).
+Inputs may be several files, directories or globs; with --workers the files
+are cut into newline-aligned byte ranges, summarized in worker processes and
+merged in input order, which gives the same result as a serial run.
+
+credit.decision events with ``replayed: true`` (retries answered from the
+replay cache or the logged row) are not new decisions: they are only counted
+in ``replayed`` and reported in the notes, not in totals, mix or latencies.
 """
 from __future__ import annotations
 import argparse
 import csv
+import glob
+import hashlib
 import json
-import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from statistics import median
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
+
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover
+    _loads = json.loads
 
 BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from backend.canonical import dumps_bytes  # noqa: E402
+from tools.governance_metrics import DEFAULT_DB, connect, snapshot_counts  # noqa: E402
+from backend.kpi_rollups import catch_up, open_db  # noqa: E402
+from backend.sketches import QuantileSketch  # noqa: E402
+from tools.rollups import rollup_snapshot_counts  # noqa: E402
+
 DEFAULT_LOG = BASE_DIR/"docs"/"examples"/"audit_log_example.jsonl"
 OUT_FILE = BASE_DIR/"data"/"metrics_snapshot.csv"
 
@@ -30,39 +61,48 @@ REQUIRED_COMMON = [
 REQUIRED_RESPONSE_CREDIT = ["decision","score","thresholds"]
 REQ_THRESH_KEYS = ["allow_max","review_range","block_min"]
 
+# Determinism map values pack (decision code, count) into one int: code | count << 3
+DECISION_CODES = {None: 0, "ALLOW": 1, "REVIEW": 2, "BLOCK": 3}
+OTHER_CODE = 4
+SHARD_BYTES = 64 * 1024 * 1024
+
 
 def parse_args():
     p = argparse.ArgumentParser()
-    p.add_argument("--log", type=str, default=str(DEFAULT_LOG), help="Path to JSONL audit log")
+    p.add_argument("--log", type=str, nargs="+", default=[str(DEFAULT_LOG)],
+                   help="JSONL audit log(s): files, directories (*.jsonl) or glob patterns")
     p.add_argument("--batch", type=str, default="demo1")
     p.add_argument("--out", type=str, default=str(OUT_FILE))
+    p.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all CPU cores)")
+    p.add_argument("--shard-mb", type=float, default=SHARD_BYTES / (1024 * 1024),
+                   help="Split input files into shards of about this size for --workers")
+    p.add_argument("--source", choices=["jsonl", "db", "rollup"], default="jsonl",
+                   help="jsonl: audit event logs (--log); db: aggregate SQL on decision_logs (--db); "
+                        "rollup: catch up and read the KPI rollup tables (--db)")
+    p.add_argument("--db", type=str, default=str(DEFAULT_DB), help="Path to governance.db (--source db/rollup)")
+    p.add_argument("--from", dest="ts_from", help="Start timestamp (inclusive, ISO UTC '...Z'; --source db/rollup)")
+    p.add_argument("--to", dest="ts_to", help="End timestamp (inclusive, ISO UTC '...Z'; --source db/rollup)")
     return p.parse_args()
 
 
-def load_log(path: Path) -> List[Dict[str, Any]]:
-    events = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            events.append(json.loads(line))
-    return events
+def expand_inputs(patterns: Iterable[str]) -> List[Path]:
+    """Files in the given order; directories expand to their *.jsonl, patterns to sorted matches."""
+    paths: List[Path] = []
+    for pattern in patterns:
+        p = Path(pattern)
+        if p.is_dir():
+            paths.extend(sorted(p.glob("*.jsonl")))
+        elif any(ch in pattern for ch in "*?["):
+            paths.extend(Path(m) for m in sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(p)
+    return paths
 
 
 def pct(num: int, den: int) -> float:
     return (num/den*100.0) if den else 0.0
 
 
-def latency_percentiles(values: List[float]) -> Tuple[str,str]:
-    if not values:
-        return ("NA","NA")
-    values = sorted(values)
-    p50 = values[int(0.5*(len(values)-1))]
-    p95 = values[int(0.95*(len(values)-1))]
-    return (f"{p50:.0f}", f"{p95:.0f}")
-
-
 def check_completeness(ev: Dict[str, Any]) -> bool:
     # Check required keys
     for k in REQUIRED_COMMON:
@@ -99,77 +139,204 @@ def decision_from_score(score: float, th: Dict[str, Any]) -> str:
     return "ALLOW"
 
 
-def main():
-    args = parse_args()
-    log_path = Path(args.log)
-    out_path = Path(args.out)
-    out_path.parent.mkdir(exist_ok=True)
-
-    events = load_log(log_path)
-
-    credit_events = [e for e in events if e.get("event") == "credit.decision"]
-    override_events = [e for e in events if e.get("event") == "override.apply"]
-
-    total = len(credit_events)
-    allow = sum(1 for e in credit_events if e.get("response",{}).get("decision") == "ALLOW")
-    review = sum(1 for e in credit_events if e.get("response",{}).get("decision") == "REVIEW")
-    block = sum(1 for e in credit_events if e.get("response",{}).get("decision") == "BLOCK")
-
-    allow_pct = pct(allow,total)
-    review_pct = pct(review,total)
-    block_pct = pct(block,total)
-
-    override_total = len(override_events)
-    override_pct = pct(override_total,total)
-    second_approval_true = sum(1 for e in override_events if e.get("second_approval") is True)
-    second_approval_pct = pct(second_approval_true, override_total) if override_total else 0.0
-
-    compl = sum(1 for e in (credit_events + override_events) if check_completeness(e))
-    denom = len(credit_events) + len(override_events)
-    log_completeness_pct = pct(compl, denom) if denom else 0.0
-
-    # Determinism: same request JSON should yield same decision
-    decisions_by_req = {}
-    inconsistent = 0
-    for e in credit_events:
-        req = e.get("request", {})
-        req_key = json.dumps(req, sort_keys=True)
-        dec = e.get("response",{}).get("decision")
-        prev = decisions_by_req.setdefault(req_key, dec)
-        if prev != dec:
-            inconsistent += 1
-    determinism_consistency_pct = 100.0 if inconsistent == 0 else max(0.0, 100.0 - 100.0*inconsistent/ max(1,total))
-
-    # Latencies
-    lat = [float(e.get("duration_ms")) for e in credit_events if isinstance(e.get("duration_ms"), (int,float))]
-    p50_latency_ms, p95_latency_ms = latency_percentiles(lat)
-
-    # Violations: threshold coherence
-    violations_threshold_coherence = 0
-    for e in credit_events:
+class MetricsState:
+    """Mergeable partial result of one or more event shards."""
+
+    def __init__(self):
+        self.total = 0
+        self.allow = 0
+        self.review = 0
+        self.block = 0
+        self.override_total = 0
+        self.second_approval_true = 0
+        self.complete = 0
+        self.checked = 0
+        self.violations_threshold_coherence = 0
+        self.edge_cnt = 0
+        self.bad_lines = 0
+        self.replayed = 0
+        self.latency = QuantileSketch()
+        # request digest -> code | count << 3 while all its events agree
+        self.decisions: Dict[int, int] = {}
+        # request digest -> [first_code, counts by code] once they disagree
+        self.mixed: Dict[int, list] = {}
+
+    def add(self, e: Dict[str, Any]) -> None:
+        kind = e.get("event")
+        if kind == "credit.decision" and e.get("replayed"):
+            self.replayed += 1
+            return
+        if kind == "credit.decision":
+            self._add_credit(e)
+        elif kind == "override.apply":
+            self.override_total += 1
+            if e.get("second_approval") is True:
+                self.second_approval_true += 1
+        else:
+            return
+        self.checked += 1
+        if check_completeness(e):
+            self.complete += 1
+
+    def _add_credit(self, e: Dict[str, Any]) -> None:
+        self.total += 1
         resp = e.get("response", {})
-        score = resp.get("score")
-        th = resp.get("thresholds", {})
         dec = resp.get("decision")
-        expected = decision_from_score(score, th)
-        if expected != dec:
-            violations_threshold_coherence += 1
+        if dec == "ALLOW":
+            self.allow += 1
+        elif dec == "REVIEW":
+            self.review += 1
+        elif dec == "BLOCK":
+            self.block += 1
 
-    # Monotonicity heuristic (no strict check in MVP)
-    violations_monotonicity = 0
+        # Determinism: same request JSON should yield same decision
+        key = int.from_bytes(hashlib.blake2b(dumps_bytes(e.get("request", {})), digest_size=16).digest(), "big")
+        self._count_decision(key, DECISION_CODES.get(dec, OTHER_CODE), 1)
+
+        duration = e.get("duration_ms")
+        if isinstance(duration, (int, float)):
+            self.latency.add(float(duration))
 
-    # Edge band: within ±5 around lower boundary of review_range
-    edge_cnt = 0
-    for e in credit_events:
-        resp = e.get("response", {})
         score = resp.get("score")
         th = resp.get("thresholds", {})
+        if decision_from_score(score, th) != dec:
+            self.violations_threshold_coherence += 1
+        # Edge band: within ±5 around lower boundary of review_range
         review_lo = th.get("review_range", [None, None])[0]
-        if review_lo is None:
-            continue
-        if (review_lo - 5) <= float(score) <= (review_lo + 5):
-            edge_cnt += 1
-    edge_band_pct = pct(edge_cnt, total)
+        if review_lo is not None and (review_lo - 5) <= float(score) <= (review_lo + 5):
+            self.edge_cnt += 1
+
+    def _count_decision(self, key: int, code: int, count: int) -> None:
+        mixed = self.mixed.get(key)
+        if mixed is not None:
+            mixed[1][code] += count
+            return
+        packed = self.decisions.get(key)
+        if packed is None:
+            self.decisions[key] = code | (count << 3)
+        elif packed & 7 == code:
+            self.decisions[key] = packed + (count << 3)
+        else:
+            counts = [0] * (OTHER_CODE + 1)
+            counts[packed & 7] = packed >> 3
+            counts[code] += count
+            self.mixed[key] = [packed & 7, counts]
+            del self.decisions[key]
+
+    def merge(self, other: "MetricsState") -> None:
+        """Fold in the state of shards that come *after* this one in input order."""
+        for name in ("total", "allow", "review", "block", "override_total", "second_approval_true",
+                     "complete", "checked", "violations_threshold_coherence", "edge_cnt", "bad_lines",
+                     "replayed"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.latency.merge(other.latency)
+        for key, packed in other.decisions.items():
+            self._count_decision(key, packed & 7, packed >> 3)
+        for key, (first, counts) in other.mixed.items():
+            if key in self.decisions or key in self.mixed:
+                for code, n in enumerate(counts):
+                    if n:
+                        self._count_decision(key, code, n)
+            else:
+                self.mixed[key] = [first, list(counts)]
+
+    def counts(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "allow": self.allow,
+            "review": self.review,
+            "block": self.block,
+            "override_total": self.override_total,
+            "second_approval_true": self.second_approval_true,
+            "checked": self.checked,
+            "complete": self.complete,
+            "inconsistent": self.inconsistent(),
+            "violations_threshold_coherence": self.violations_threshold_coherence,
+            "edge_cnt": self.edge_cnt,
+            "replayed": self.replayed,
+            "p50_latency_ms": self.latency.quantile(0.5),
+            "p95_latency_ms": self.latency.quantile(0.95),
+        }
+
+    def inconsistent(self) -> int:
+        # events whose decision differs from the first decision seen for the same request
+        return sum(sum(counts) - counts[first] for first, counts in self.mixed.values())
+
+
+def process_shard(shard: Tuple[str, int, int]) -> MetricsState:
+    """Summarize the lines of ``path`` that start in [start, end)."""
+    path, start, end = shard
+    state = MetricsState()
+    with open(path, "rb") as f:
+        pos = start
+        if start > 0:
+            f.seek(start - 1)
+            pos = start - 1 + len(f.readline())  # skip the line owned by the previous shard
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                ev = _loads(line)
+            except ValueError:
+                state.bad_lines += 1
+                continue
+            state.add(ev)
+    return state
+
+
+def make_shards(paths: List[Path], shard_bytes: int) -> List[Tuple[str, int, int]]:
+    shards = []
+    for p in paths:
+        size = p.stat().st_size
+        step = max(1, shard_bytes)
+        for start in range(0, max(size, 1), step):
+            shards.append((str(p), start, min(start + step, size)))
+    return shards
+
+
+def compute_state(paths: List[Path], workers: int = 1, shard_bytes: int = SHARD_BYTES) -> MetricsState:
+    state = MetricsState()
+    if workers <= 1:
+        for p in paths:
+            state.merge(process_shard((str(p), 0, p.stat().st_size)))
+        return state
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() yields in submission order, so merging keeps "first seen" semantics
+        for part in pool.map(process_shard, make_shards(paths, shard_bytes)):
+            state.merge(part)
+    return state
+
+
+def format_snapshot(counts: Dict[str, Any], batch_id: str) -> Dict[str, Any]:
+    """COLUMNS row from aggregate counts (MetricsState.counts() or governance_metrics.snapshot_counts())."""
+    total = counts["total"]
+    allow_pct = pct(counts["allow"], total)
+    review_pct = pct(counts["review"], total)
+    block_pct = pct(counts["block"], total)
+
+    override_total = counts["override_total"]
+    override_pct = pct(override_total, total)
+    second_approval_pct = pct(counts["second_approval_true"], override_total) if override_total else 0.0
+    log_completeness_pct = pct(counts["complete"], counts["checked"]) if counts["checked"] else 0.0
+
+    inconsistent = counts["inconsistent"]
+    determinism_consistency_pct = 100.0 if inconsistent == 0 else max(0.0, 100.0 - 100.0*inconsistent/ max(1,total))
+
+    # Latencies (sketch: relative error <= 1 %)
+    if counts["p50_latency_ms"] is not None:
+        p50_latency_ms = f"{counts['p50_latency_ms']:.0f}"
+        p95_latency_ms = f"{counts['p95_latency_ms']:.0f}"
+    else:
+        p50_latency_ms, p95_latency_ms = "NA", "NA"
+
+    # Monotonicity heuristic (no strict check in MVP)
+    violations_monotonicity = 0
+    edge_band_pct = pct(counts["edge_cnt"], total)
 
     notes = []
     if override_pct < 10:
@@ -178,20 +345,22 @@ def main():
         notes.append("log_complete")
     if second_approval_pct == 100.0 and override_total>0:
         notes.append("four_eyes_ok")
-    if violations_threshold_coherence == 0:
+    if counts["violations_threshold_coherence"] == 0:
         notes.append("coherence_ok")
+    if counts.get("replayed"):
+        notes.append(f"replayed_excluded={counts['replayed']}")
     try:
         if p95_latency_ms != "NA" and float(p95_latency_ms) < 150:
             notes.append("p95<150ms")
     except Exception:
         pass
 
-    row = {
-        "batch_id": args.batch,
+    return {
+        "batch_id": batch_id,
         "total": total,
-        "allow": allow,
-        "review": review,
-        "block": block,
+        "allow": counts["allow"],
+        "review": counts["review"],
+        "block": counts["block"],
         "allow_pct": f"{allow_pct:.2f}",
         "review_pct": f"{review_pct:.2f}",
         "block_pct": f"{block_pct:.2f}",
@@ -203,16 +372,46 @@ def main():
         "p50_latency_ms": p50_latency_ms,
         "p95_latency_ms": p95_latency_ms,
         "violations_monotonicity": violations_monotonicity,
-        "violations_threshold_coherence": violations_threshold_coherence,
+        "violations_threshold_coherence": counts["violations_threshold_coherence"],
         "edge_band_pct": f"{edge_band_pct:.2f}",
         "notes": ",".join(notes) or "artefact-run"
     }
 
-    with OUT_FILE.open("w", newline='', encoding='utf-8') as f:
+
+def main():
+    args = parse_args()
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.source == "db":
+        con = connect(args.db)
+        try:
+            counts = snapshot_counts(con, args.ts_from, args.ts_to)
+        finally:
+            con.close()
+    elif args.source == "rollup":
+        con = open_db(args.db)
+        try:
+            catch_up(con)
+            counts = rollup_snapshot_counts(con, args.ts_from, args.ts_to)
+        finally:
+            con.close()
+    else:
+        paths = expand_inputs(args.log)
+        if not paths:
+            raise SystemExit(f"No input files match {args.log}")
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        state = compute_state(paths, workers, int(args.shard_mb * 1024 * 1024))
+        if state.bad_lines:
+            print(f"Skipped {state.bad_lines} unparsable line(s)", file=sys.stderr)
+        counts = state.counts()
+
+    row = format_snapshot(counts, args.batch)
+    with out_path.open("w", newline='', encoding='utf-8') as f:
         w = csv.DictWriter(f, fieldnames=COLUMNS)
         w.writeheader()
         w.writerow(row)
-    print(f"Wrote {OUT_FILE}")
+    print(f"Wrote {out_path}")
 
 if __name__ == "__main__":
     main()
@@ -1,71 +1,458 @@
 import argparse
 import csv
+import gzip
 import hashlib
+import json
+import os
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 
+try:  # optional: only needed for --compress zstd
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:  # optional: only needed for --format parquet|arrow
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
 DEFAULT_DB = Path(__file__).resolve().parents[1] / "backend" / "governance.db"
 
+HEADER = [
+    "id","ts_utc","decision_id","order_id","customer_id","input_json","score","thresholds_json",
+    "decision","rule_version","data_version","overridden","second_approval","actor_sys","actor_ux",
+    "override_reason","prev_hash","row_hash"
+]
 
-def export_csv(out_path: Path, db_path: Path, ts_from: str | None, ts_to: str | None):
-    con = sqlite3.connect(str(db_path))
-    cur = con.cursor()
-    q = "SELECT id, ts_utc, decision_id, order_id, customer_id, input_json, score, thresholds_json, decision, rule_version, data_version, overridden, second_approval, actor_sys, actor_ux, override_reason, prev_hash, row_hash FROM decision_logs"
+COMPRESS_SUFFIX = {"gzip": ".gz", "zstd": ".zst"}
+FORMAT_SUFFIX = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# CreditRequest fields promoted out of input_json (order_id/customer_id/data_version are top-level already)
+FEATURE_COLUMNS = (
+    ("order_value_eur", "float64"),
+    ("payment_terms_days", "int32"),
+    ("overdue_ratio", "float64"),
+    ("dso_proxy_days", "int32"),
+    ("risk_class", "category"),
+    ("country_risk", "int8"),
+    ("incoterm", "category"),
+    ("is_new_customer", "bool"),
+    ("credit_limit_eur", "float64"),
+    ("past_limit_breach", "bool"),
+    ("express_flag", "bool"),
+)
+CATEGORY_COLUMNS = ("decision", "rule_version", "data_version")
+MAX_ROW_GROUP = 1_000_000
+
+
+class _HashingWriter:
+    """Text sink for csv.writer: hashes the UTF-8 bytes and forwards them to a binary stream (if any)."""
+
+    def __init__(self, raw=None):
+        self.raw = raw
+        self.sha = hashlib.sha256()
+
+    def write(self, s: str) -> int:
+        b = s.encode('utf-8')
+        self.sha.update(b)
+        if self.raw is not None:
+            self.raw.write(b)
+        return len(s)
+
+
+def _open_raw(path: Path, compress: str | None):
+    if compress == "gzip":
+        return gzip.open(path, "wb")
+    if compress == "zstd":
+        if zstandard is None:
+            raise SystemExit("--compress zstd requires the 'zstandard' package")
+        return zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb", buffering=1 << 20)
+
+
+def _export_query(ts_from: str | None, ts_to: str | None, max_id: int | None = None, after_id: int | None = None):
+    q = "SELECT " + ", ".join(HEADER) + " FROM decision_logs"
     clauses = []
     params = []
+    if after_id is not None:
+        clauses.append("id > ?")
+        params.append(after_id)
     if ts_from:
         clauses.append("ts_utc >= ?")
         params.append(ts_from)
     if ts_to:
         clauses.append("ts_utc <= ?")
         params.append(ts_to)
+    if max_id is not None:
+        clauses.append("id <= ?")
+        params.append(max_id)
     if clauses:
         q += " WHERE " + " AND ".join(clauses)
     q += " ORDER BY id"
-    rows = list(cur.execute(q, params))
-    con.close()
-
-    # write to a temp buffer to compute hash, then append footer line
-    lines = []
-    header = [
-        "id","ts_utc","decision_id","order_id","customer_id","input_json","score","thresholds_json",
-        "decision","rule_version","data_version","overridden","second_approval","actor_sys","actor_ux",
-        "override_reason","prev_hash","row_hash"
-    ]
-    lines.append(",".join(header) + "\n")
-    for r in rows:
-        # simple CSV with basic escaping by csv module
-        # we'll build rows via writer for correctness, then collect as string
-        pass
-
-    # Use csv module to generate content reliably
-    import io
-    buf = io.StringIO()
-    w = csv.writer(buf, lineterminator='\n')
-    w.writerow(header)
-    for r in rows:
-        w.writerow([*r])
-    content = buf.getvalue()
-    buf.close()
-
-    sha = hashlib.sha256(content.encode('utf-8')).hexdigest()
-    content_with_footer = content + f"# SHA256={sha}\n"
+    return q, params
+
+
+def _iter_batches(cur, q: str, params: list, batch_size: int):
+    cur.execute(q, params)
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def export_csv(out_path: Path, db_path: Path, ts_from: str | None, ts_to: str | None,
+               compress: str | None = None, batch_size: int = 5000,
+               after_id: int | None = None, max_id: int | None = None):
+    """Stream decision_logs to CSV with a trailing ``# SHA256=`` footer.
+
+    Rows are pulled with fetchmany and written as they arrive; the SHA-256 is
+    taken over the uncompressed CSV (header + rows, without the footer), so the
+    footer means the same thing for plain and compressed files. Output goes to
+    a temp file next to ``out_path`` and is renamed into place at the end.
+    """
+    con = sqlite3.connect(str(db_path))
+    cur = con.cursor()
+    q, params = _export_query(ts_from, ts_to, max_id, after_id)
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(content_with_footer, encoding='utf-8')
-    return sha, len(rows)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    n = 0
+    try:
+        with _open_raw(tmp, compress) as raw:
+            sink = _HashingWriter(raw)
+            w = csv.writer(sink, lineterminator='\n')
+            w.writerow(HEADER)
+            for rows in _iter_batches(cur, q, params, batch_size):
+                w.writerows(rows)
+                n += len(rows)
+            sha = sink.sha.hexdigest()
+            raw.write(f"# SHA256={sha}\n".encode('utf-8'))
+        os.replace(tmp, out_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        con.close()
+    return sha, n
+
+
+def _arrow_schema():
+    types = {"float64": pa.float64(), "int32": pa.int32(), "int8": pa.int8(), "bool": pa.bool_(),
+             "category": pa.dictionary(pa.int32(), pa.string())}
+    fields = []
+    for name in HEADER:
+        if name in CATEGORY_COLUMNS:
+            fields.append(pa.field(name, types["category"]))
+        elif name in ("id",):
+            fields.append(pa.field(name, pa.int64(), nullable=False))
+        elif name in ("score", "overridden", "second_approval"):
+            fields.append(pa.field(name, pa.int32()))
+        else:
+            fields.append(pa.field(name, pa.string()))
+        if name == "ts_utc":
+            fields.append(pa.field("ts", pa.timestamp("us", tz="UTC")))
+    fields += [pa.field(name, types[kind]) for name, kind in FEATURE_COLUMNS]
+    fields += [pa.field(name, pa.int16()) for name in ("allow_max", "review_min", "review_max", "block_min")]
+    return pa.schema(fields)
+
+
+def _parse_ts(value: str | None):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _loads(value: str | None) -> dict:
+    try:
+        obj = json.loads(value) if value else {}
+    except ValueError:
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _record_batch(rows: list, schema, dictionaries: dict | None = None):
+    """Typed columns for one row group; input_json/thresholds_json are kept verbatim for re-hashing.
+
+    ``dictionaries`` pins the category vocabularies (needed for Arrow IPC files,
+    which allow only one dictionary per field); otherwise each group encodes its own.
+    """
+    cols = {name: [r[i] for r in rows] for i, name in enumerate(HEADER)}
+    cols["ts"] = [_parse_ts(v) for v in cols["ts_utc"]]
+    inputs = [_loads(v) for v in cols["input_json"]]
+    for name, _ in FEATURE_COLUMNS:
+        cols[name] = [d.get(name) for d in inputs]
+    review = []
+    thresholds = [_loads(v) for v in cols["thresholds_json"]]
+    for d in thresholds:
+        rr = d.get("review_range")
+        review.append(rr if isinstance(rr, list) and len(rr) == 2 else (None, None))
+    cols["allow_max"] = [d.get("allow_max") for d in thresholds]
+    cols["review_min"] = [rr[0] for rr in review]
+    cols["review_max"] = [rr[1] for rr in review]
+    cols["block_min"] = [d.get("block_min") for d in thresholds]
+    arrays = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type) and dictionaries is not None:
+            values = dictionaries[field.name]
+            index = {v: i for i, v in enumerate(values)}
+            indices = pa.array([index.get(v) for v in cols[field.name]], pa.int32())
+            arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(values, pa.string())))
+        elif pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(cols[field.name], pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(cols[field.name], field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema.remove_metadata())
+
+
+def _time_groups(batches, partition: str):
+    """Regroup fetchmany batches so that each group covers one UTC day/hour (capped at MAX_ROW_GROUP rows)."""
+    key_len = 13 if partition == "hour" else 10
+    group, key = [], None
+    for rows in batches:
+        for r in rows:
+            k = (r[1] or "")[:key_len]
+            if group and (k != key or len(group) >= MAX_ROW_GROUP):
+                yield group
+                group = []
+            group.append(r)
+            key = k
+    if group:
+        yield group
+
+
+def _prepass(rows_iter) -> tuple[str, dict]:
+    """CSV-equivalent sha256 plus the sorted category vocabularies of all rows."""
+    sink = _HashingWriter()
+    w = csv.writer(sink, lineterminator='\n')
+    w.writerow(HEADER)
+    cat_idx = [HEADER.index(name) for name in CATEGORY_COLUMNS]
+    features = [name for name, kind in FEATURE_COLUMNS if kind == "category"]
+    seen = {name: set() for name in (*CATEGORY_COLUMNS, *features)}
+    input_idx = HEADER.index("input_json")
+    for rows in rows_iter:
+        w.writerows(rows)
+        for r in rows:
+            for name, i in zip(CATEGORY_COLUMNS, cat_idx):
+                seen[name].add(r[i])
+            d = _loads(r[input_idx])
+            for name in features:
+                seen[name].add(d.get(name))
+    return sink.sha.hexdigest(), {name: sorted(v for v in values if v is not None) for name, values in seen.items()}
+
+
+def export_columnar(out_path: Path, db_path: Path, ts_from: str | None, ts_to: str | None,
+                    fmt: str = "parquet", batch_size: int = 5000, partition: str = "day",
+                    after_id: int | None = None, max_id: int | None = None):
+    """Export to Parquet or Arrow IPC with flattened, typed feature columns.
+
+    One row group (Parquet) / record batch (Arrow) per UTC day or hour. The
+    file metadata key ``sha256`` carries the hash the CSV export of the same
+    rows would have in its footer, so both formats can be cross-checked.
+    Parquet receives it after the last row group; Arrow IPC fixes its schema
+    up front and allows a single dictionary per field, so it needs a pre-pass
+    over the same rows for the hash and the category vocabularies.
+    """
+    if pa is None:
+        raise SystemExit(f"--format {fmt} requires the 'pyarrow' package")
+    con = sqlite3.connect(str(db_path))
+    cur = con.cursor()
+    # pin the id range so both passes (and the metadata) see the same rows
+    if max_id is None:
+        (max_id,) = cur.execute("SELECT COALESCE(MAX(id), 0) FROM decision_logs").fetchone()
+    q, params = _export_query(ts_from, ts_to, max_id, after_id)
+    schema = _arrow_schema()
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    n = 0
+    dictionaries = None
+    sink = _HashingWriter()
+    hasher = csv.writer(sink, lineterminator='\n')
+    hasher.writerow(HEADER)
+    try:
+        if fmt == "arrow":
+            sha, dictionaries = _prepass(_iter_batches(cur, q, params, batch_size))
+            writer = pa_ipc.new_file(str(tmp), schema.with_metadata({"sha256": sha, "source": "decision_logs"}))
+        else:
+            writer = pq.ParquetWriter(str(tmp), schema, compression="zstd")
+        with writer:
+            for group in _time_groups(_iter_batches(cur, q, params, batch_size), partition):
+                batch = _record_batch(group, schema, dictionaries)
+                if fmt == "arrow":
+                    writer.write_batch(batch)
+                else:
+                    hasher.writerows(group)
+                    writer.write_table(pa.Table.from_batches([batch]), row_group_size=len(group))
+                n += len(group)
+            if fmt == "parquet":
+                sha = sink.sha.hexdigest()
+                writer.add_key_value_metadata({"sha256": sha, "source": "decision_logs", "rows": str(n)})
+        os.replace(tmp, out_path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        con.close()
+    return sha, n
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _entry_hash(entry: dict) -> str:
+    body = {k: v for k, v in entry.items() if k != "entry_hash"}
+    return hashlib.sha256(json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def read_manifest(manifest_path: Path) -> list:
+    if not manifest_path.exists():
+        return []
+    with manifest_path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check_manifest(manifest_path: Path) -> tuple[bool, str]:
+    """Re-check the entry chain, id continuity and the on-disk sha256 of every segment."""
+    prev = None
+    entries = read_manifest(manifest_path)
+    for e in entries:
+        if e.get("prev_entry_hash") != (prev["entry_hash"] if prev else "") or _entry_hash(e) != e.get("entry_hash"):
+            return False, f"Manifest chain broken at seq={e.get('seq')}"
+        if prev and e["after_id"] != prev["last_id"]:
+            return False, f"Id gap before seq={e['seq']}: after_id={e['after_id']} != previous last_id={prev['last_id']}"
+        seg = manifest_path.parent / e["file"]
+        if not seg.exists():
+            return False, f"Segment missing: {e['file']}"
+        if _file_sha256(seg) != e["file_sha256"]:
+            return False, f"Segment altered: {e['file']}"
+        prev = e
+    return True, f"OK ({len(entries)} segments, last_id={prev['last_id'] if prev else 0})"
+
+
+def export_incremental(out_dir: Path, db_path: Path, manifest_path: Path, fmt: str = "csv",
+                       compress: str | None = None, batch_size: int = 5000, partition: str = "day"):
+    """Export rows with id > last exported id as a new segment and append a chained manifest entry.
+
+    The id range is pinned to MAX(id) at start, so concurrent appends end up in
+    the next segment. The segment is renamed into place before its manifest
+    line is written; the manifest is the commit point of a run. Returns the new
+    entry or None if there is nothing to export.
+    """
+    entries = read_manifest(manifest_path)
+    prev = entries[-1] if entries else None
+    after_id = prev["last_id"] if prev else 0
+
+    con = sqlite3.connect(str(db_path))
+    try:
+        (max_id,) = con.execute("SELECT COALESCE(MAX(id), 0) FROM decision_logs").fetchone()
+        span = "SELECT id, row_hash FROM decision_logs WHERE id > ? AND id <= ? ORDER BY id {} LIMIT 1"
+        first = con.execute(span.format("ASC"), (after_id, max_id)).fetchone()
+        last = con.execute(span.format("DESC"), (after_id, max_id)).fetchone()
+    finally:
+        con.close()
+    if first is None:
+        return None
+
+    suffix = FORMAT_SUFFIX.get(fmt, ".csv") + (COMPRESS_SUFFIX[compress] if compress else "")
+    out_path = out_dir / f"decision_logs_{first[0]:012d}_{last[0]:012d}{suffix}"
+    if fmt == "csv":
+        sha, n = export_csv(out_path, db_path, None, None, compress, batch_size, after_id=after_id, max_id=max_id)
+    else:
+        sha, n = export_columnar(out_path, db_path, None, None, fmt, batch_size, partition,
+                                 after_id=after_id, max_id=max_id)
+
+    entry = {
+        "seq": (prev["seq"] + 1) if prev else 1,
+        "file": os.path.relpath(out_path, manifest_path.parent).replace(os.sep, "/"),
+        "format": fmt,
+        "compress": compress,
+        "after_id": after_id,
+        "first_id": first[0],
+        "last_id": last[0],
+        "rows": n,
+        "first_row_hash": first[1],
+        "last_row_hash": last[1],
+        "sha256": sha,
+        "file_sha256": _file_sha256(out_path),
+        "created_utc": _utc_now_iso(),
+        "prev_entry_hash": prev["entry_hash"] if prev else "",
+    }
+    entry["entry_hash"] = _entry_hash(entry)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    with manifest_path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    return entry
 
 
 def main():
     p = argparse.ArgumentParser(description="Export decision_logs to signed CSV")
     p.add_argument("--db", default=str(DEFAULT_DB), help="Path to governance.db")
-    p.add_argument("--out", default="data/decision_logs_export.csv", help="Output CSV path")
+    p.add_argument("--out", help="Output path (default data/decision_logs_export.csv; directory data/exports with --incremental)")
     p.add_argument("--from", dest="ts_from", help="Start timestamp (inclusive, ISO UTC '...Z')")
     p.add_argument("--to", dest="ts_to", help="End timestamp (inclusive, ISO UTC '...Z')")
+    p.add_argument("--format", choices=["csv", *FORMAT_SUFFIX], default="csv", help="Output format (parquet/arrow need pyarrow)")
+    p.add_argument("--row-groups", choices=["day", "hour"], default="day", help="Time partitioning of Parquet row groups / Arrow batches")
+    p.add_argument("--compress", choices=sorted(COMPRESS_SUFFIX), help="Compress output (suffix .gz/.zst is appended if missing)")
+    p.add_argument("--batch-size", type=int, default=5000, help="Rows per fetchmany batch")
+    p.add_argument("--incremental", action="store_true", help="Export rows after the last exported id into a new segment under --out (a directory)")
+    p.add_argument("--manifest", help="Manifest JSONL for --incremental/--check-manifest (default: <out>/manifest.jsonl)")
+    p.add_argument("--check-manifest", action="store_true", help="Verify manifest chain and segment hashes, then exit")
     args = p.parse_args()
 
-    sha, n = export_csv(Path(args.out), Path(args.db), args.ts_from, args.ts_to)
-    print(f"Exported {n} rows to {args.out}")
+    if args.incremental or args.check_manifest:
+        out_dir = Path(args.out or "data/exports")
+        manifest = Path(args.manifest) if args.manifest else out_dir / "manifest.jsonl"
+        if args.check_manifest:
+            ok, msg = check_manifest(manifest)
+            print(msg)
+            raise SystemExit(0 if ok else 1)
+        if args.ts_from or args.ts_to:
+            p.error("--incremental selects rows by id; --from/--to are not supported")
+        if args.compress and args.format != "csv":
+            p.error("--compress only applies to --format csv (parquet is zstd-compressed internally)")
+        entry = export_incremental(out_dir, Path(args.db), manifest, args.format, args.compress,
+                                   args.batch_size, args.row_groups)
+        if entry is None:
+            print("No new rows to export")
+            return
+        print(f"Exported {entry['rows']} rows (id {entry['first_id']}..{entry['last_id']}) to {manifest.parent / entry['file']}")
+        print(f"SHA256={entry['sha256']}")
+        return
+
+    out = Path(args.out or "data/decision_logs_export.csv")
+    if args.format != "csv":
+        if args.compress:
+            p.error("--compress only applies to --format csv (parquet is zstd-compressed internally)")
+        if out.suffix == ".csv":
+            out = out.with_suffix(FORMAT_SUFFIX[args.format])
+        sha, n = export_columnar(out, Path(args.db), args.ts_from, args.ts_to, args.format,
+                                 args.batch_size, args.row_groups)
+        print(f"Exported {n} rows to {out}")
+        print(f"SHA256={sha}")
+        return
+    if args.compress and not out.name.endswith(COMPRESS_SUFFIX[args.compress]):
+        out = out.with_name(out.name + COMPRESS_SUFFIX[args.compress])
+    sha, n = export_csv(out, Path(args.db), args.ts_from, args.ts_to, args.compress, args.batch_size)
+    print(f"Exported {n} rows to {out}")
     print(f"SHA256={sha}")
 
 if __name__ == "__main__":
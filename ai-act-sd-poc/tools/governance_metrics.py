@@ -0,0 +1,200 @@
+"""Governance metrics computed inside SQLite (aggregate SQL against decision_logs).
+
+Shared by tools/compute_metrics.py (``--source db``) and the oversight UI.
+Every function runs a handful of aggregate queries (conditional SUMs,
+GROUP BY, window functions for the latest override per case and the queue
+time percentile); only aggregates leave the database, never the rows.
+Stdlib only; needs SQLite >= 3.25 (window functions) with JSON1, which every
+supported Python ships.
+
+Base rows (``overridden = 0``) are the credit decisions, override rows
+(``overridden = 1``) the human overrides referencing the same decision_id.
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+# per-row checks shared with the incremental rollups
+from backend.kpi_rollups import (  # noqa: E402
+    CHECKED_ROWS_SQL,
+    COHERENCE_VIOLATION_SQL,
+    COMPLETE_SQL,
+    EDGE_SQL,
+    THRESHOLD_COLUMNS_SQL,
+)
+
+DEFAULT_DB = BASE_DIR / "backend" / "governance.db"
+
+QUEUE_QUANTILE = 0.95
+
+# One pass over the range: mirrors the per-event checks of compute_metrics.py
+_SNAPSHOT_SQL = """
+SELECT
+    COALESCE(SUM(base), 0),
+    COALESCE(SUM(base AND decision = 'ALLOW'), 0),
+    COALESCE(SUM(base AND decision = 'REVIEW'), 0),
+    COALESCE(SUM(base AND decision = 'BLOCK'), 0),
+    COALESCE(SUM(ovr), 0),
+    COALESCE(SUM(ovr AND second_approval = 1), 0),
+    COALESCE(SUM(base OR ovr), 0),
+    COALESCE(SUM({complete}), 0),
+    COALESCE(SUM({coherence}), 0),
+    COALESCE(SUM({edge}), 0)
+FROM ({rows})
+"""
+
+# Requests logged more than once with a different decision than the first one
+# (decision_id is the hash of the canonical request JSON)
+_DETERMINISM_SQL = """
+SELECT COALESCE(SUM(decision <> first_decision), 0) FROM (
+    SELECT decision, FIRST_VALUE(decision) OVER (PARTITION BY decision_id ORDER BY id) AS first_decision
+    FROM decision_logs {where}
+)
+"""
+
+_MIX_SQL = """
+SELECT decision, COUNT(*) FROM decision_logs {where}
+GROUP BY decision ORDER BY COUNT(*) DESC, decision
+"""
+
+_OVERRIDE_SQL = """
+SELECT COUNT(*), AVG(COALESCE(second_approval, 0)) FROM decision_logs {where}
+"""
+
+# Queue time of REVIEW cases: base row -> latest override of the same decision_id.
+# Returns the count, mean and the (at most two) order statistics around the quantile.
+_QUEUE_SQL = """
+WITH latest AS (
+    SELECT decision_id, ts_utc,
+           ROW_NUMBER() OVER (PARTITION BY decision_id ORDER BY ts_utc DESC, id DESC) AS rn
+    FROM decision_logs {override_where}
+), queue AS (
+    SELECT ROUND((julianday(o.ts_utc) - julianday(b.ts_utc)) * 86400.0, 3) / 60.0 AS minutes
+    FROM decision_logs AS b
+    -- CROSS JOIN pins b as the outer loop; otherwise the planner may rescan the REVIEW rows per override
+    CROSS JOIN latest AS o ON o.decision_id = b.decision_id AND o.rn = 1
+    {review_where}
+), ranked AS (
+    SELECT minutes,
+           ROW_NUMBER() OVER (ORDER BY minutes) - 1 AS k,
+           COUNT(*) OVER () AS n,
+           AVG(minutes) OVER () AS mean
+    FROM queue WHERE minutes IS NOT NULL
+)
+SELECT n, mean, k, minutes FROM ranked
+WHERE k = CAST(? * (n - 1) AS INTEGER) OR k = CAST(? * (n - 1) AS INTEGER) + 1
+ORDER BY k
+"""
+
+
+def connect(db_path: str | Path = DEFAULT_DB) -> sqlite3.Connection:
+    """Read-only connection; the audit table is never written from here."""
+    return sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def _where(*conditions: str, ts_from: str | None = None, ts_to: str | None = None,
+           column: str = "ts_utc") -> Tuple[str, List[Any]]:
+    clauses = list(conditions)
+    params: List[Any] = []
+    if ts_from:
+        clauses.append(f"{column} >= ?")
+        params.append(ts_from)
+    if ts_to:
+        clauses.append(f"{column} <= ?")
+        params.append(ts_to)
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def snapshot_counts(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None) -> Dict[str, Any]:
+    """Aggregates for the compute_metrics COLUMNS snapshot (see compute_metrics.format_snapshot).
+
+    The table stores no request latency, so p50/p95 are None.
+    """
+    where, params = _where(ts_from=ts_from, ts_to=ts_to)
+    (total, allow, review, block, override_total, second_approval_true,
+     checked, complete, coherence, edge_cnt) = con.execute(
+        _SNAPSHOT_SQL.format(
+            complete=COMPLETE_SQL, coherence=COHERENCE_VIOLATION_SQL, edge=EDGE_SQL,
+            rows=CHECKED_ROWS_SQL.format(thresholds=THRESHOLD_COLUMNS_SQL, where=where),
+        ), params
+    ).fetchone()
+    where, params = _where("COALESCE(overridden, 0) = 0", ts_from=ts_from, ts_to=ts_to)
+    (inconsistent,) = con.execute(_DETERMINISM_SQL.format(where=where), params).fetchone()
+    return {
+        "total": total,
+        "allow": allow,
+        "review": review,
+        "block": block,
+        "override_total": override_total,
+        "second_approval_true": second_approval_true,
+        "checked": checked,
+        "complete": complete,
+        "inconsistent": inconsistent,
+        "violations_threshold_coherence": coherence,
+        "edge_cnt": edge_cnt,
+        "p50_latency_ms": None,
+        "p95_latency_ms": None,
+    }
+
+
+def queue_time_minutes(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None,
+                       q: float = QUEUE_QUANTILE) -> Tuple[float | None, float | None]:
+    """Mean and ``q`` quantile (linear interpolation, as pandas) of REVIEW queue times."""
+    override_where, override_params = _where("COALESCE(overridden, 0) = 1", ts_from=ts_from, ts_to=ts_to)
+    review_where, review_params = _where(
+        "COALESCE(b.overridden, 0) = 0", "b.decision = 'REVIEW'", ts_from=ts_from, ts_to=ts_to, column="b.ts_utc",
+    )
+    rows = con.execute(
+        _QUEUE_SQL.format(override_where=override_where, review_where=review_where),
+        override_params + review_params + [q, q],
+    ).fetchall()
+    if not rows:
+        return None, None
+    n, mean = rows[0][0], rows[0][1]
+    pos = q * (n - 1)
+    lo = rows[0][3]
+    hi = rows[1][3] if len(rows) > 1 else lo
+    return float(mean), float(lo + (hi - lo) * (pos - int(pos)))
+
+
+def empty_overview() -> Dict[str, Any]:
+    return {
+        "mix_counts": {},
+        "mix_pct": {},
+        "base_total": 0,
+        "override_pct": 0.0,
+        "four_eyes_pct": 0.0,
+        "queue_mean_min": None,
+        "queue_p95_min": None,
+    }
+
+
+def governance_overview(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None) -> Dict[str, Any]:
+    """Decision mix, override rate, four-eyes share and REVIEW queue time (oversight UI KPIs)."""
+    where, params = _where("COALESCE(overridden, 0) = 0", ts_from=ts_from, ts_to=ts_to)
+    mix_counts = dict(con.execute(_MIX_SQL.format(where=where), params).fetchall())
+    total_base = sum(mix_counts.values())
+    mix_pct = {k: (v / total_base * 100.0) if total_base else 0.0 for k, v in mix_counts.items()}
+
+    where, params = _where("COALESCE(overridden, 0) = 1", ts_from=ts_from, ts_to=ts_to)
+    override_cnt, four_eyes = con.execute(_OVERRIDE_SQL.format(where=where), params).fetchone()
+    override_pct = (override_cnt / total_base * 100.0) if total_base else 0.0
+    four_eyes_pct = float(four_eyes) * 100.0 if override_cnt else 0.0
+
+    queue_mean_min, queue_p95_min = queue_time_minutes(con, ts_from, ts_to)
+    return {
+        "mix_counts": mix_counts,
+        "mix_pct": mix_pct,
+        "base_total": total_base,
+        "override_pct": override_pct,
+        "four_eyes_pct": four_eyes_pct,
+        "queue_mean_min": queue_mean_min,
+        "queue_p95_min": queue_p95_min,
+    }
@@ -0,0 +1,57 @@
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from backend.merkle import load_proof, verify_proof
+from tools.verify_audit import compute_row_hash
+
+
+def recompute_row_hash(proof: dict) -> str:
+    row = proof['row']
+    payload = {k: v for k, v in row.items() if k != 'id'}
+    return compute_row_hash(row.get('prev_hash') or '', payload, row.get('ts_utc'))
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Fetch and/or verify a Merkle inclusion proof for one decision')
+    ap.add_argument('--db', help='Path to governance.db (build proof locally)')
+    ap.add_argument('--decision-id', help='decision_id to prove (with --db)')
+    ap.add_argument('--overridden', action='store_true', help='Prove the first override row instead of the base row')
+    ap.add_argument('--proof', help='Proof JSON as returned by GET /v1/credit/decisions/{id}/proof')
+    ap.add_argument('--log-root', help='Trusted log root (hex) to pin the proof against')
+    ap.add_argument('--out', help='Write the proof JSON to this path')
+    args = ap.parse_args()
+
+    if args.proof:
+        proof = json.loads(Path(args.proof).read_text(encoding='utf-8'))
+    elif args.db and args.decision_id:
+        con = sqlite3.connect(str(args.db))
+        try:
+            proof = load_proof(con, args.decision_id, 1 if args.overridden else 0)
+        finally:
+            con.close()
+        if proof is None:
+            print('decision_id not found')
+            raise SystemExit(1)
+        if proof.get('pending'):
+            print(f"row id={proof['row_id']} not yet covered by a Merkle checkpoint")
+            raise SystemExit(1)
+    else:
+        print('Use --proof FILE or --db PATH --decision-id ID')
+        raise SystemExit(2)
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(proof, indent=2), encoding='utf-8')
+    ok, msg = verify_proof(proof, row_hash=recompute_row_hash(proof), log_root=args.log_root)
+    print(msg)
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""KPI rollups (hourly and daily) next to decision_logs: readers and CLI.
+
+The tables and their incremental maintenance live in backend/kpi_rollups.py:
+
+- kpi_rollup_hourly / kpi_rollup_daily: row counts per bucket, decision and
+  overridden flag, second approvals and the compute_metrics checks
+  (completeness, threshold coherence, edge band, determinism), and
+- kpi_queue_hourly / kpi_queue_daily: REVIEW queue time (count, sum and a
+  QuantileSketch as JSON).
+
+Queue time follows tools/governance_metrics.py: base row -> latest override of
+the same decision_id, attributed to the bucket of the base row. A later
+override replaces the earlier contribution; kpi_case_state remembers it per
+case. Determinism compares against the first base row of the same decision_id
+(the hash of input_json).
+
+Readers touch O(buckets) rows; time ranges are widened to whole buckets.
+The backend keeps the rollups current (backend/rollup_worker.py); readers such
+as the oversight UI only read them and check rollup_lag() for staleness.
+This CLI runs the same catch_up()/rebuild() as a job, verify() compares the
+rollups with the direct SQL of governance_metrics.
+
+    python tools/rollups.py --db backend/governance.db [--rebuild] [--verify]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from backend.kpi_rollups import (  # noqa: E402,F401 (re-exported)
+    BATCH_ROWS,
+    GRAINS,
+    catch_up,
+    ensure_schema,
+    has_rollups,
+    open_db,
+    rebuild,
+    rollup_lag,
+    watermark,
+)
+from backend.sketches import QuantileSketch  # noqa: E402
+from tools.governance_metrics import (  # noqa: E402
+    DEFAULT_DB,
+    QUEUE_QUANTILE,
+    empty_overview,
+    governance_overview,
+    snapshot_counts,
+)
+
+
+def _bucket_where(grain: str, ts_from: str | None, ts_to: str | None, *conditions: str) -> Tuple[str, List[Any]]:
+    width = GRAINS[grain]
+    clauses = list(conditions)
+    params: List[Any] = []
+    if ts_from:
+        clauses.append("bucket >= ?")
+        params.append(ts_from[:width])
+    if ts_to:
+        clauses.append("bucket <= ?")
+        params.append(ts_to[:width])
+    return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _grain(grain: str | None, ts_from: str | None, ts_to: str | None) -> str:
+    # unbounded queries read the smaller daily table, ranges are widened to whole hours
+    if grain:
+        return grain
+    return "day" if not (ts_from or ts_to) else "hour"
+
+
+def rollup_snapshot_counts(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None,
+                           grain: str | None = None) -> Dict[str, Any]:
+    """Same dict as governance_metrics.snapshot_counts, read from the rollups."""
+    grain = _grain(grain, ts_from, ts_to)
+    where, params = _bucket_where(grain, ts_from, ts_to)
+    row = con.execute(f"""
+        SELECT
+            COALESCE(SUM(CASE WHEN overridden = 0 THEN cnt END), 0),
+            COALESCE(SUM(CASE WHEN overridden = 0 AND decision = 'ALLOW' THEN cnt END), 0),
+            COALESCE(SUM(CASE WHEN overridden = 0 AND decision = 'REVIEW' THEN cnt END), 0),
+            COALESCE(SUM(CASE WHEN overridden = 0 AND decision = 'BLOCK' THEN cnt END), 0),
+            COALESCE(SUM(CASE WHEN overridden = 1 THEN cnt END), 0),
+            COALESCE(SUM(CASE WHEN overridden = 1 THEN second_approval END), 0),
+            COALESCE(SUM(CASE WHEN overridden IN (0, 1) THEN cnt END), 0),
+            COALESCE(SUM(complete), 0),
+            COALESCE(SUM(inconsistent), 0),
+            COALESCE(SUM(coherence_violations), 0),
+            COALESCE(SUM(edge), 0)
+        FROM kpi_rollup_{grain} {where}
+    """, params).fetchone()
+    keys = ("total", "allow", "review", "block", "override_total", "second_approval_true", "checked",
+            "complete", "inconsistent", "violations_threshold_coherence", "edge_cnt")
+    counts = dict(zip(keys, row))
+    counts["p50_latency_ms"] = None
+    counts["p95_latency_ms"] = None
+    return counts
+
+
+def queue_sketch(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None,
+                 grain: str | None = None) -> Tuple[int, float, QuantileSketch]:
+    grain = _grain(grain, ts_from, ts_to)
+    where, params = _bucket_where(grain, ts_from, ts_to)
+    n, total, merged = 0, 0.0, QuantileSketch()
+    for bn, bsum, sketch in con.execute(f"SELECT n, sum_min, sketch FROM kpi_queue_{grain} {where}", params):
+        n += bn
+        total += bsum
+        merged.merge(QuantileSketch.from_dict(json.loads(sketch)))
+    return n, total, merged
+
+
+def rollup_overview(con: sqlite3.Connection, ts_from: str | None = None, ts_to: str | None = None,
+                    grain: str | None = None) -> Dict[str, Any]:
+    """Same dict as governance_metrics.governance_overview; p95 within the sketch accuracy (1 %)."""
+    grain = _grain(grain, ts_from, ts_to)
+    result = empty_overview()
+    where, params = _bucket_where(grain, ts_from, ts_to, "overridden = 0")
+    mix_counts = dict(con.execute(
+        f"SELECT decision, SUM(cnt) FROM kpi_rollup_{grain} {where} GROUP BY decision ORDER BY SUM(cnt) DESC, decision",
+        params,
+    ).fetchall())
+    total_base = sum(mix_counts.values())
+    where, params = _bucket_where(grain, ts_from, ts_to, "overridden = 1")
+    override_cnt, four_eyes_cnt = con.execute(
+        f"SELECT COALESCE(SUM(cnt), 0), COALESCE(SUM(second_approval), 0) FROM kpi_rollup_{grain} {where}", params,
+    ).fetchone()
+    n, total, sketch = queue_sketch(con, ts_from, ts_to, grain)
+    result.update({
+        "mix_counts": mix_counts,
+        "mix_pct": {k: (v / total_base * 100.0) if total_base else 0.0 for k, v in mix_counts.items()},
+        "base_total": total_base,
+        "override_pct": (override_cnt / total_base * 100.0) if total_base else 0.0,
+        "four_eyes_pct": (four_eyes_cnt / override_cnt * 100.0) if override_cnt else 0.0,
+    })
+    if n:
+        result["queue_mean_min"] = total / n
+        result["queue_p95_min"] = sketch.quantile(QUEUE_QUANTILE, interpolation="linear")
+    return result
+
+
+def timeline(con: sqlite3.Connection, grain: str = "day", decisions: Iterable[str] | None = None,
+             ts_from: str | None = None, ts_to: str | None = None) -> List[Tuple[str, str, int]]:
+    """(bucket, decision, rows) over base and override rows, like the UI's per-day chart."""
+    conditions = []
+    decisions = list(decisions) if decisions is not None else None
+    if decisions is not None:
+        if not decisions:
+            return []
+        conditions.append(f"decision IN ({','.join('?' * len(decisions))})")
+    where, params = _bucket_where(grain, ts_from, ts_to, *conditions)
+    return con.execute(
+        f"SELECT bucket, decision, SUM(cnt) FROM kpi_rollup_{grain} {where} GROUP BY bucket, decision ORDER BY bucket, decision",
+        (decisions or []) + params,
+    ).fetchall()
+
+
+def verify(con: sqlite3.Connection) -> List[str]:
+    """Differences between the rollups (both grains) and a direct SQL recomputation."""
+    problems = []
+    direct = snapshot_counts(con)
+    direct_overview = governance_overview(con)
+    for grain in GRAINS:
+        counts = rollup_snapshot_counts(con, grain=grain)
+        for key, value in direct.items():
+            if counts[key] != value:
+                problems.append(f"{grain}: {key} rollup={counts[key]} direct={value}")
+        overview = rollup_overview(con, grain=grain)
+        for key in ("mix_counts", "base_total"):
+            if overview[key] != direct_overview[key]:
+                problems.append(f"{grain}: {key} rollup={overview[key]} direct={direct_overview[key]}")
+        for key, tolerance in (("override_pct", 1e-9), ("four_eyes_pct", 1e-9),
+                               ("queue_mean_min", 1e-6), ("queue_p95_min", 0.01)):
+            a, b = overview[key], direct_overview[key]
+            if (a is None) != (b is None) or (a is not None and abs(a - b) > tolerance * max(1.0, abs(b))):
+                problems.append(f"{grain}: {key} rollup={a} direct={b}")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Maintain KPI rollup tables for decision_logs")
+    ap.add_argument("--db", default=str(DEFAULT_DB), help="Path to governance.db")
+    ap.add_argument("--rebuild", action="store_true", help="Recompute all rollups from the first row")
+    ap.add_argument("--verify", action="store_true", help="Compare rollups with a full SQL recomputation")
+    ap.add_argument("--batch-rows", type=int, default=BATCH_ROWS, help="Ids per catch-up transaction")
+    args = ap.parse_args()
+
+    con = open_db(args.db)
+    try:
+        covered = rebuild(con, args.batch_rows) if args.rebuild else catch_up(con, args.batch_rows)
+        print(f"Rollups up to id {watermark(con)} ({covered} new ids)")
+        if args.verify:
+            problems = verify(con)
+            for p in problems:
+                print(f"MISMATCH {p}")
+            if problems:
+                sys.exit(1)
+            print("Rollups match decision_logs")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,245 @@
 import argparse
 import csv
-import hashlib
+import gzip
+import io
 import json
+import os
 import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
 
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
 
-def canonical_json(d: dict) -> str:
-    return json.dumps(d, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+from backend.canonical import dumps as canonical_json, row_hash as compute_row_hash  # same encoder as the API
 
 
-def compute_row_hash(prev_hash: str, payload: dict, ts_utc: str) -> str:
-    h = hashlib.sha256()
-    h.update((prev_hash or '').encode('utf-8'))
-    payload_json = canonical_json({k: v for k, v in payload.items() if k not in ('prev_hash', 'row_hash')})
-    h.update(payload_json.encode('utf-8'))
-    h.update((ts_utc or '').encode('utf-8'))
-    return h.hexdigest()
+DB_COLUMNS = (
+    "id, ts_utc, decision_id, order_id, customer_id, input_json, score, thresholds_json, "
+    "decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval, prev_hash, row_hash"
+)
 
 
-def verify_db(db_path: Path) -> tuple[bool, str, int]:
-    con = sqlite3.connect(str(db_path))
-    cur = con.cursor()
-    q = (
-        "SELECT id, ts_utc, decision_id, order_id, customer_id, input_json, score, thresholds_json, "
-        "decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval, prev_hash, row_hash "
-        "FROM decision_logs ORDER BY id"
-    )
-    rows = list(cur.execute(q))
-    con.close()
-    prev = ''
-    count = 0
+def _payload_from_db_row(r) -> dict:
+    (id_, ts_utc, decision_id, order_id, customer_id, input_json, score, thresholds_json,
+     decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval, prev_hash, row_hash) = r
+    return {
+        'decision_id': decision_id,
+        'ts_utc': ts_utc,
+        'order_id': order_id,
+        'customer_id': customer_id,
+        'input_json': input_json,
+        'score': score,
+        'thresholds_json': thresholds_json,
+        'decision': decision,
+        'rule_version': rule_version,
+        'data_version': data_version,
+        'actor_sys': actor_sys,
+        'actor_ux': actor_ux,
+        'overridden': overridden,
+        'override_reason': override_reason,
+        'second_approval': second_approval,
+    }
+
+
+def _db_entries(rows):
     for r in rows:
-        (id_, ts_utc, decision_id, order_id, customer_id, input_json, score, thresholds_json,
-         decision, rule_version, data_version, actor_sys, actor_ux, overridden, override_reason, second_approval, prev_hash, row_hash) = r
-        payload = {
-            'decision_id': decision_id,
-            'ts_utc': ts_utc,
-            'order_id': order_id,
-            'customer_id': customer_id,
-            'input_json': input_json,
-            'score': score,
-            'thresholds_json': thresholds_json,
-            'decision': decision,
-            'rule_version': rule_version,
-            'data_version': data_version,
-            'actor_sys': actor_sys,
-            'actor_ux': actor_ux,
-            'overridden': overridden,
-            'override_reason': override_reason,
-            'second_approval': second_approval,
-        }
+        yield r[0], r[1], _payload_from_db_row(r), r[16], r[17]
+
+
+def _payload_from_csv_row(row: dict) -> dict:
+    return {
+        'decision_id': row['decision_id'],
+        'ts_utc': row['ts_utc'],
+        'order_id': row['order_id'],
+        'customer_id': row['customer_id'],
+        'input_json': row['input_json'],
+        'score': int(row['score']) if row['score'] else 0,
+        'thresholds_json': row['thresholds_json'],
+        'decision': row['decision'],
+        'rule_version': row['rule_version'],
+        'data_version': row['data_version'],
+        'actor_sys': row['actor_sys'],
+        'actor_ux': row['actor_ux'] or None,  # NULL is exported as an empty field
+        'overridden': int(row['overridden']) if row['overridden'] else 0,
+        'override_reason': row['override_reason'] or None,
+        'second_approval': int(row['second_approval']) if row['second_approval'] else 0,
+    }
+
+
+def _csv_entries(rows):
+    for row in rows:
+        yield row['id'], row['ts_utc'], _payload_from_csv_row(row), row['prev_hash'], row['row_hash']
+
+
+def check_chain(entries, prev: str, label: str):
+    """Verify consecutive entries (id, ts_utc, payload, prev_hash, row_hash) starting after ``prev``.
+
+    Each row_hash is recomputed from the row's own prev_hash (falling back to
+    the previous row's hash) and stored prev_hash values must link to the
+    previous row. Returns (ok, msg, verified_count, last_id, last_row_hash).
+    """
+    count = 0
+    last_id = None
+    for id_, ts_utc, payload, prev_hash, row_hash in entries:
+        if prev_hash and prev and prev_hash != prev:
+            return False, f"Chain break at {label} id={id_} prev_hash {prev_hash} != previous row_hash {prev}", count, last_id, prev
         calc = compute_row_hash(prev_hash or prev, payload, ts_utc)
         if calc != row_hash:
-            return False, f"Mismatch at row id={id_} expected {row_hash} got {calc}", count
+            return False, f"Mismatch at {label} id={id_} expected {row_hash} got {calc}", count, last_id, prev
         prev = row_hash
+        last_id = id_
         count += 1
+    return True, '', count, last_id, prev
+
+
+def default_state_path(db_path: Path) -> Path:
+    return db_path.with_name(db_path.name + '.verify.json')
+
+
+def load_watermark(state_path: Path) -> dict | None:
+    try:
+        return json.loads(state_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def save_watermark(state_path: Path, last_id: int, row_hash: str, total: int) -> None:
+    state = {
+        'last_id': last_id,
+        'row_hash': row_hash,
+        'verified_rows': total,
+        'verified_utc': datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z'),
+    }
+    tmp = state_path.with_name(state_path.name + '.tmp')
+    tmp.write_text(json.dumps(state), encoding='utf-8')
+    os.replace(tmp, state_path)
+
+
+class _Progress:
+    def __init__(self, every_s: float):
+        self.every_s = every_s
+        self.t0 = self.last = time.monotonic()
+
+    def tick(self, count: int, last_id, force: bool = False) -> None:
+        now = time.monotonic()
+        if self.every_s <= 0 or (not force and now - self.last < self.every_s):
+            return
+        self.last = now
+        rate = count / max(now - self.t0, 1e-9)
+        print(f"verified {count} rows (id<={last_id}) at {rate:,.0f} rows/s", file=sys.stderr)
+
+
+def _verify_db_chunk(db_path: str, lo_id: int, hi_id: int):
+    """Worker: verify rows lo_id < id <= hi_id, anchored on the row preceding the chunk."""
+    con = sqlite3.connect(db_path)
+    try:
+        cur = con.cursor()
+        cur.execute("SELECT row_hash FROM decision_logs WHERE id <= ? ORDER BY id DESC LIMIT 1", (lo_id,))
+        anchor = cur.fetchone()
+        prev = (anchor[0] or '') if anchor else ''
+        cur.execute(f"SELECT {DB_COLUMNS} FROM decision_logs WHERE id > ? AND id <= ? ORDER BY id", (lo_id, hi_id))
+        return check_chain(_db_entries(_iter_fetchmany(cur)), prev, 'row')
+    finally:
+        con.close()
+
+
+def _iter_fetchmany(cur, size: int = 5000):
+    while True:
+        rows = cur.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def _verify_csv_chunk(rows: list, prev: str):
+    """Worker: verify a block of parsed CSV rows following a row with hash ``prev``."""
+    return check_chain(_csv_entries(rows), prev, 'CSV row')
+
+
+def _stitch(results, after_id, prev, state_path=None, total=0, ticker=None):
+    """Combine ordered chunk results; the first failing chunk reports the first mismatch."""
+    count = 0
+    last_id = after_id
+    ok, msg = True, ''
+    for ok, msg, n, chunk_last_id, chunk_last_hash in results:
+        count += n
+        if n:
+            last_id, prev = chunk_last_id, chunk_last_hash
+        if state_path is not None and count:
+            save_watermark(state_path, last_id, prev, total + count)
+        if not ok:
+            break
+        if ticker is not None:
+            ticker.tick(count, last_id)
+    if ticker is not None:
+        ticker.tick(count, last_id, force=True)  # same closing line as the serial run
+    return ok, msg, count
+
+
+def verify_db(db_path: Path, state_path: Path | None = None, full: bool = False,
+              batch_size: int = 5000, progress_every: float = 0.0,
+              workers: int = 1, chunk_size: int = 200000) -> tuple[bool, str, int]:
+    """Verify the chain, resuming after the watermark in ``state_path`` unless ``full``.
+
+    Rows are streamed with fetchmany (constant memory); the watermark (last id +
+    row_hash) is advanced after every verified batch, so an interrupted run
+    resumes where it stopped and a nightly run only touches new rows. With
+    ``workers > 1`` the id range is split into chunks verified in a process
+    pool; each chunk is anchored on its predecessor row, so the reported first
+    mismatch is identical to the serial run.
+    """
+    con = sqlite3.connect(str(db_path))
+    cur = con.cursor()
+    after_id, prev, total = 0, '', 0
+    watermark = None if (full or state_path is None) else load_watermark(state_path)
+    try:
+        if watermark:
+            cur.execute("SELECT row_hash FROM decision_logs WHERE id=?", (watermark['last_id'],))
+            anchor = cur.fetchone()
+            if anchor is None or anchor[0] != watermark['row_hash']:
+                return False, f"Watermark row id={watermark['last_id']} changed since last run (use --full)", 0
+            after_id, prev, total = watermark['last_id'], watermark['row_hash'] or '', watermark.get('verified_rows', 0)
+
+        if workers > 1:
+            cur.execute("SELECT MAX(id) FROM decision_logs")
+            max_id = cur.fetchone()[0] or 0
+            bounds = [(lo, min(lo + chunk_size, max_id)) for lo in range(after_id, max_id, chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(_verify_db_chunk, [str(db_path)] * len(bounds),
+                                   [b[0] for b in bounds], [b[1] for b in bounds])
+                ok, msg, count = _stitch(results, after_id, prev, state_path, total, _Progress(progress_every))
+        else:
+            cur.execute(f"SELECT {DB_COLUMNS} FROM decision_logs WHERE id > ? ORDER BY id", (after_id,))
+            ticker = _Progress(progress_every)
+            count = 0
+            ok, msg = True, ''
+            last_id = after_id
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                ok, msg, n, chunk_last_id, chunk_last_hash = check_chain(_db_entries(rows), prev, 'row')
+                count += n
+                if n:
+                    last_id, prev = chunk_last_id, chunk_last_hash
+                if state_path is not None and count:
+                    save_watermark(state_path, last_id, prev, total + count)
+                if not ok:
+                    break
+                ticker.tick(count, last_id)
+            ticker.tick(count, last_id, force=True)
+        if not ok:
+            return False, msg, count
+    finally:
+        con.close()
+    if watermark:
+        return True, f"OK ({count} new rows after id={after_id}, {total + count} verified in total)", count
     return True, f"OK ({count} rows)", count
 
 
@@ -63,63 +247,92 @@ essential_fields = [
     'id','ts_utc','decision_id','order_id','customer_id','input_json','score','thresholds_json','decision','rule_version','data_version','overridden','second_approval','actor_sys','actor_ux','override_reason','prev_hash','row_hash'
 ]
 
-def verify_csv(csv_path: Path) -> tuple[bool, str, int]:
-    # Read all lines; ignore trailing hash footer starting with '# SHA256='
-    text = csv_path.read_text(encoding='utf-8').splitlines()
-    data_lines = [ln for ln in text if not ln.startswith('# SHA256=')]
-    from io import StringIO
-    sio = StringIO('\n'.join(data_lines) + '\n')
-    rdr = csv.DictReader(sio)
-    prev = ''
-    count = 0
-    for row in rdr:
+
+def _open_csv(csv_path: Path):
+    # compressed exports (tools/export_log.py --compress) are read transparently
+    if csv_path.suffix == '.gz':
+        return gzip.open(csv_path, 'rt', encoding='utf-8', newline='')
+    if csv_path.suffix == '.zst':
+        import zstandard
+        raw = zstandard.ZstdDecompressor().stream_reader(csv_path.open('rb'), closefd=True)
+        return io.TextIOWrapper(raw, encoding='utf-8', newline='')
+    return csv_path.open('r', encoding='utf-8', newline='')
+
+
+def _csv_rows(handle):
+    # ignore trailing hash footer starting with '# SHA256='
+    return csv.DictReader(ln for ln in handle if not ln.startswith('# SHA256='))
+
+
+def verify_csv(csv_path: Path, workers: int = 1, chunk_size: int = 50000) -> tuple[bool, str, int]:
+    """Verify an exported CSV in one streaming pass.
+
+    With ``workers > 1`` parsed blocks of ``chunk_size`` rows are hashed in a
+    process pool (at most ``2 * workers`` blocks in flight); each block carries
+    the last row_hash of its predecessor for stitching.
+    """
+    with _open_csv(csv_path) as handle:
+        rdr = _csv_rows(handle)
         for f in essential_fields:
-            if f not in row:
-                return False, f"CSV missing field {f}", count
-        ts_utc = row['ts_utc']
-        payload = {
-            'decision_id': row['decision_id'],
-            'ts_utc': ts_utc,
-            'order_id': row['order_id'],
-            'customer_id': row['customer_id'],
-            'input_json': row['input_json'],
-            'score': int(row['score']) if row['score'] else 0,
-            'thresholds_json': row['thresholds_json'],
-            'decision': row['decision'],
-            'rule_version': row['rule_version'],
-            'data_version': row['data_version'],
-            'actor_sys': row['actor_sys'],
-            'actor_ux': row['actor_ux'],
-            'overridden': int(row['overridden']) if row['overridden'] else 0,
-            'override_reason': row['override_reason'],
-            'second_approval': int(row['second_approval']) if row['second_approval'] else 0,
-        }
-        prev_hash = row['prev_hash']
-        row_hash = row['row_hash']
-        calc = compute_row_hash(prev_hash or prev, payload, ts_utc)
-        if calc != row_hash:
-            return False, f"Mismatch at CSV row id={row['id']} expected {row_hash} got {calc}", count
-        prev = row_hash
-        count += 1
+            if f not in (rdr.fieldnames or []):
+                return False, f"CSV missing field {f}", 0
+        if workers <= 1:
+            ok, msg, count, _, _ = check_chain(_csv_entries(rdr), '', 'CSV row')
+        else:
+            ok, msg, count = _verify_csv_parallel(rdr, workers, chunk_size)
+    if not ok:
+        return False, msg, count
     return True, f"OK ({count} rows)", count
 
 
+def _verify_csv_parallel(rdr, workers: int, chunk_size: int):
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        prev = ''
+        while True:
+            block = list(islice(rdr, chunk_size))
+            if block:
+                pending.append(pool.submit(_verify_csv_chunk, block, prev))
+                prev = block[-1]['row_hash']
+            if pending and (not block or len(pending) >= 2 * workers):
+                ok, msg, n, _, _ = pending.pop(0).result()
+                count += n
+                if not ok:
+                    for fut in pending:
+                        fut.cancel()
+                    return False, msg, count
+            if not block and not pending:
+                return True, '', count
+
+
 def main():
     ap = argparse.ArgumentParser(description='Verify audit log hash chain (db or csv)')
     ap.add_argument('--source', choices=['db','csv'], required=True)
     ap.add_argument('--db')
     ap.add_argument('--csv')
+    ap.add_argument('--state', help='Watermark file for incremental db runs (default: <db>.verify.json)')
+    ap.add_argument('--full', action='store_true', help='Ignore the watermark and re-verify from row 1')
+    ap.add_argument('--batch-size', type=int, default=5000, help='Rows per fetchmany batch')
+    ap.add_argument('--progress', type=float, default=10.0, help='Progress report interval in seconds (0 = off)')
+    ap.add_argument('--workers', type=int, default=1, help='Verify chunks in N processes (0 = all CPU cores)')
+    ap.add_argument('--chunk-size', type=int, default=None, help='Rows per parallel chunk')
     args = ap.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
     if args.source == 'db':
         if not args.db:
             print('Missing --db path')
             raise SystemExit(2)
-        ok, msg, _ = verify_db(Path(args.db))
+        db_path = Path(args.db)
+        state_path = Path(args.state) if args.state else default_state_path(db_path)
+        ok, msg, _ = verify_db(db_path, state_path, full=args.full,
+                               batch_size=args.batch_size, progress_every=args.progress,
+                               workers=workers, chunk_size=args.chunk_size or 200000)
     else:
         if not args.csv:
             print('Missing --csv path')
             raise SystemExit(2)
-        ok, msg, _ = verify_csv(Path(args.csv))
+        ok, msg, _ = verify_csv(Path(args.csv), workers=workers, chunk_size=args.chunk_size or 50000)
     print(msg)
     raise SystemExit(0 if ok else 1)
 